@@ -0,0 +1,145 @@
+import random
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+import markus
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+PATH_PARAMETER_RE = re.compile(r"^(\d+|[^/]*@[^/]*)$")
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    pass
+
+
+class CircuitBreaker(object):
+    """
+    Stops calling an upstream that keeps failing. After failure_threshold
+    consecutive failures the circuit opens and requests are refused until
+    reset_timeout seconds have passed, after which a single trial request is
+    let through to decide whether to close it again.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def allow_request(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._opened_at = time.monotonic()
+                return True
+
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def get_endpoint_name(url):
+    path = urlparse(url).path
+    return "/".join(
+        ":id" if PATH_PARAMETER_RE.match(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+class HTTPClient(object):
+    """
+    A pooled requests session for one upstream service, with a timeout on
+    every call, bounded retries with jittered exponential backoff for
+    idempotent methods, a circuit breaker, and per endpoint latency metrics.
+    Errors surface as requests exceptions so callers keep handling them as
+    they would for plain requests calls.
+    """
+
+    def __init__(
+        self,
+        service,
+        timeout,
+        max_retries=2,
+        backoff_factor=0.5,
+        pool_maxsize=10,
+        failure_threshold=5,
+        reset_timeout=60,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.circuit_breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.metrics = markus.get_metrics(f"{service}.http")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, params=None, **kwargs):
+        return self.request("GET", url, params=params, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request("PUT", url, data=data, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request("POST", url, data=data, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        endpoint = get_endpoint_name(url)
+        tags = [f"endpoint:{endpoint}", f"method:{method}"]
+        retries = self.max_retries if method in RETRY_METHODS else 0
+        kwargs.setdefault("timeout", self.timeout)
+
+        for attempt in range(retries + 1):
+            if not self.circuit_breaker.allow_request():
+                self.metrics.incr("circuit.rejected", tags=tags)
+                raise CircuitOpenError(f"Circuit open for {method} {endpoint}")
+
+            start = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ):
+                self.circuit_breaker.record_failure()
+                if attempt == retries:
+                    raise
+            else:
+                self.metrics.histogram(
+                    "request.timing",
+                    value=(time.monotonic() - start) * 1000,
+                    tags=[*tags, f"status:{response.status_code}"],
+                )
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    return response
+
+            self.metrics.incr("request.retried", tags=tags)
+            time.sleep(random.uniform(0, self.backoff_factor * 2 ** attempt))
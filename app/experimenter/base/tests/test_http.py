@@ -0,0 +1,169 @@
+import mock
+from django.test import TestCase
+from parameterized import parameterized
+from requests.exceptions import ConnectionError, Timeout
+
+from experimenter.base.http import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HTTPClient,
+    get_endpoint_name,
+)
+
+
+class TestGetEndpointName(TestCase):
+    @parameterized.expand(
+        [
+            ("https://normandy/api/v3/recipe/", "/api/v3/recipe/"),
+            ("https://normandy/api/v3/recipe/1234/", "/api/v3/recipe/:id/"),
+            (
+                "https://bugzilla/rest/bug/1234/comment?api_key=key",
+                "/rest/bug/:id/comment",
+            ),
+            ("https://bugzilla/rest/user/dev@example.com?api_key=key", "/rest/user/:id"),
+        ]
+    )
+    def test_endpoint_name_hides_ids_and_query(self, url, endpoint):
+        self.assertEqual(get_endpoint_name(url), endpoint)
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self):
+        mock_monotonic_patcher = mock.patch("experimenter.base.http.time.monotonic")
+        self.mock_monotonic = mock_monotonic_patcher.start()
+        self.addCleanup(mock_monotonic_patcher.stop)
+        self.mock_monotonic.return_value = 100
+
+        self.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    def test_opens_after_consecutive_failures(self):
+        self.circuit_breaker.record_failure()
+        self.assertTrue(self.circuit_breaker.allow_request())
+
+        self.circuit_breaker.record_failure()
+        self.assertTrue(self.circuit_breaker.is_open)
+        self.assertFalse(self.circuit_breaker.allow_request())
+
+    def test_success_resets_failures(self):
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_success()
+        self.circuit_breaker.record_failure()
+        self.assertFalse(self.circuit_breaker.is_open)
+
+    def test_allows_one_trial_request_after_reset_timeout(self):
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+
+        self.mock_monotonic.return_value = 160
+        self.assertTrue(self.circuit_breaker.allow_request())
+        self.assertFalse(self.circuit_breaker.allow_request())
+
+        self.circuit_breaker.record_success()
+        self.assertFalse(self.circuit_breaker.is_open)
+        self.assertTrue(self.circuit_breaker.allow_request())
+
+
+class TestHTTPClient(TestCase):
+    def setUp(self):
+        self.client = HTTPClient(
+            "test", timeout=5, max_retries=2, failure_threshold=3, reset_timeout=60
+        )
+
+        mock_request_patcher = mock.patch.object(self.client.session, "request")
+        self.mock_request = mock_request_patcher.start()
+        self.addCleanup(mock_request_patcher.stop)
+
+        mock_sleep_patcher = mock.patch("experimenter.base.http.time.sleep")
+        self.mock_sleep = mock_sleep_patcher.start()
+        self.addCleanup(mock_sleep_patcher.stop)
+
+    def build_response(self, status_code):
+        mock_response = mock.Mock()
+        mock_response.status_code = status_code
+        return mock_response
+
+    def test_request_uses_timeout(self):
+        response = self.build_response(200)
+        self.mock_request.return_value = response
+
+        self.assertEqual(self.client.get("https://host/path/", params={"a": 1}), response)
+        self.mock_request.assert_called_once_with(
+            "GET", "https://host/path/", params={"a": 1}, timeout=5
+        )
+
+    def test_request_records_latency_per_endpoint(self):
+        self.mock_request.return_value = self.build_response(200)
+
+        with mock.patch.object(self.client.metrics, "histogram") as mock_histogram:
+            self.client.put("https://host/bug/1234/", data={})
+
+        mock_histogram.assert_called_once_with(
+            "request.timing",
+            value=mock.ANY,
+            tags=["endpoint:/bug/:id/", "method:PUT", "status:200"],
+        )
+
+    def test_retries_idempotent_request_on_connection_error(self):
+        response = self.build_response(200)
+        self.mock_request.side_effect = [ConnectionError(), Timeout(), response]
+
+        self.assertEqual(self.client.get("https://host/path/"), response)
+        self.assertEqual(self.mock_request.call_count, 3)
+        self.assertEqual(self.mock_sleep.call_count, 2)
+
+    def test_retries_idempotent_request_on_unavailable_response(self):
+        response = self.build_response(200)
+        self.mock_request.side_effect = [self.build_response(503), response]
+
+        self.assertEqual(self.client.put("https://host/path/"), response)
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    def test_returns_last_response_when_retries_are_exhausted(self):
+        self.mock_request.return_value = self.build_response(503)
+
+        self.assertEqual(self.client.get("https://host/path/").status_code, 503)
+        self.assertEqual(self.mock_request.call_count, 3)
+
+    def test_raises_when_retries_are_exhausted(self):
+        self.mock_request.side_effect = ConnectionError()
+
+        with self.assertRaises(ConnectionError):
+            self.client.get("https://host/path/")
+        self.assertEqual(self.mock_request.call_count, 3)
+
+    def test_does_not_retry_post(self):
+        self.mock_request.side_effect = Timeout()
+
+        with self.assertRaises(Timeout):
+            self.client.post("https://host/path/", data={})
+        self.assertEqual(self.mock_request.call_count, 1)
+        self.mock_sleep.assert_not_called()
+
+    def test_backoff_is_jittered_and_bounded(self):
+        self.mock_request.side_effect = ConnectionError()
+
+        with mock.patch("experimenter.base.http.random.uniform") as mock_uniform:
+            mock_uniform.return_value = 0
+            with self.assertRaises(ConnectionError):
+                self.client.get("https://host/path/")
+
+        mock_uniform.assert_has_calls([mock.call(0, 0.5), mock.call(0, 1.0)])
+
+    def test_open_circuit_refuses_requests(self):
+        self.mock_request.side_effect = ConnectionError()
+
+        with self.assertRaises(ConnectionError):
+            self.client.get("https://host/path/")
+
+        self.mock_request.reset_mock()
+        with self.assertRaises(CircuitOpenError):
+            self.client.get("https://host/path/")
+        self.mock_request.assert_not_called()
+
+    def test_client_errors_do_not_open_circuit(self):
+        self.mock_request.return_value = self.build_response(404)
+
+        for _ in range(5):
+            self.client.get("https://host/path/")
+
+        self.assertFalse(self.client.circuit_breaker.is_open)
@@ -3,64 +3,69 @@ from urllib.parse import parse_qs, urlparse
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+
+from experimenter.base.http import HTTPClient
 
 INVALID_USER_ERROR_CODE = 51
 INVALID_PARAMETER_ERROR_CODE = 53
+INVALID_BUG_ERROR_CODE = 101
 
 EXPERIMENT_NAME_MAX_LEN = 150
 
+USER_EXISTS_CACHE_KEY = "bugzilla-user-exists:{email}"
+BUG_EXISTS_CACHE_KEY = "bugzilla-bug-exists:{bug_id}"
+
+# The relations format_bug_body reads, changes backing the experiment dates
+BUG_BODY_RELATIONS = ("analysis_owner", "changes", "countries", "locales", "variants")
+
+http_client = HTTPClient(
+    "bugzilla",
+    timeout=settings.BUGZILLA_API_TIMEOUT,
+    max_retries=settings.BUGZILLA_API_MAX_RETRIES,
+)
+
 
 class BugzillaError(Exception):
     pass
 
 
-def format_bug_body(experiment):
-    bug_body = ""
-    countries = "all"
-    locales = "all"
-    if experiment.countries.count():
-        countries = "".join(
-            [
-                "{name} ({code}) ".format(name=country.name, code=country.code)
-                for country in list(experiment.countries.all())
-            ]
-        )
-    if experiment.locales.count():
-        locales = "".join(
-            [
-                "{name} ({code}) ".format(name=locale.name, code=locale.code)
-                for locale in list(experiment.locales.all())
-            ]
-        )
+def format_codes(objects):
+    return "".join(f"{obj.name} ({obj.code}) " for obj in objects) or "all"
 
+
+def format_bug_body(experiment):
+    # Every relation is read through .all() once, so with the relations in
+    # BUG_BODY_RELATIONS prefetched this doesn't query at all.
     if experiment.is_addon_experiment:
-        variants_body = "\n".join(
-            [
-                experiment.BUGZILLA_VARIANT_ADDON_TEMPLATE.format(variant=variant)
-                for variant in experiment.variants.all()
-            ]
-        )
-        bug_body = experiment.BUGZILLA_ADDON_TEMPLATE.format(
-            experiment=experiment,
-            variants=variants_body,
-            countries=countries,
-            locales=locales,
-        )
+        template = experiment.BUGZILLA_ADDON_TEMPLATE
+        variant_template = experiment.BUGZILLA_VARIANT_ADDON_TEMPLATE
     elif experiment.is_pref_experiment:
-        variants_body = "\n".join(
-            [
-                experiment.BUGZILLA_VARIANT_PREF_TEMPLATE.format(variant=variant)
-                for variant in experiment.variants.all()
-            ]
-        )
-        bug_body = experiment.BUGZILLA_PREF_TEMPLATE.format(
-            experiment=experiment,
-            variants=variants_body,
-            countries=countries,
-            locales=locales,
-        )
+        template = experiment.BUGZILLA_PREF_TEMPLATE
+        variant_template = experiment.BUGZILLA_VARIANT_PREF_TEMPLATE
+    else:
+        return ""
+
+    return template.format(
+        experiment=experiment,
+        variants="\n".join(
+            variant_template.format(variant=variant)
+            for variant in experiment.variants.all()
+        ),
+        countries=format_codes(experiment.countries.all()),
+        locales=format_codes(experiment.locales.all()),
+    )
 
-    return bug_body
+
+def format_bug_bodies(experiments):
+    """
+    Renders the bug bodies of many experiments keyed by experiment id, with
+    one query per relation for the whole batch.
+    """
+    experiments = list(experiments)
+    prefetch_related_objects(experiments, *BUG_BODY_RELATIONS)
+    return {experiment.id: format_bug_body(experiment) for experiment in experiments}
 
 
 def format_update_body(experiment):
@@ -73,23 +78,22 @@ def format_update_body(experiment):
 
 
 def update_experiment_bug(experiment):
-    body = format_update_body(experiment)
-    make_bugzilla_call(
-        settings.BUGZILLA_UPDATE_URL.format(id=experiment.bugzilla_id),
-        requests.put,
-        data=body,
+    update_bug(experiment.bugzilla_id, format_update_body(experiment))
+
+
+def update_bug(bugzilla_id, data):
+    return make_bugzilla_call(
+        settings.BUGZILLA_UPDATE_URL.format(id=bugzilla_id), http_client.put, data=data
     )
 
 
 def user_exists(user):
-    try:
-        response = make_bugzilla_call(
-            settings.BUGZILLA_USER_URL.format(email=user), requests.get
-        )
-        users = response["users"]
-        return len(users) == 1
-    except (BugzillaError, KeyError):
-        return False
+    return cached_exists(
+        USER_EXISTS_CACHE_KEY.format(email=user),
+        settings.BUGZILLA_USER_URL.format(email=user),
+        "users",
+        missing_error_code=INVALID_USER_ERROR_CODE,
+    )
 
 
 def format_resolution_body(experiment):
@@ -102,15 +106,44 @@ def format_resolution_body(experiment):
 
 
 def bug_exists(bug_id):
+    return cached_exists(
+        BUG_EXISTS_CACHE_KEY.format(bug_id=bug_id),
+        settings.BUGZILLA_BUG_URL.format(bug_id=bug_id),
+        "bugs",
+        missing_error_code=INVALID_BUG_ERROR_CODE,
+    )
+
+
+def cached_exists(cache_key, url, results_key, missing_error_code=None):
+    """
+    Looks up whether Bugzilla has exactly one matching result, caching a
+    definite answer either way. Errors aren't cached and count as missing.
+    """
+    exists = cache.get(cache_key)
+    if exists is not None:
+        return exists
+
     try:
-        response = make_bugzilla_call(
-            settings.BUGZILLA_BUG_URL.format(bug_id=bug_id), requests.get
-        )
-        bugs = response["bugs"]
-        return len(bugs) == 1
-    except (BugzillaError, KeyError):
+        response = make_bugzilla_call(url, http_client.get)
+    except BugzillaError:
+        return False
+
+    if results_key in response:
+        exists = len(response[results_key]) == 1
+    elif missing_error_code is not None and response.get("code") == missing_error_code:
+        exists = False
+    else:
         return False
 
+    cache.set(
+        cache_key,
+        exists,
+        settings.BUGZILLA_EXISTS_CACHE_TIMEOUT
+        if exists
+        else settings.BUGZILLA_MISSING_CACHE_TIMEOUT,
+    )
+    return exists
+
 
 def update_bug_resolution(experiment):
     if experiment.bugzilla_id:
@@ -118,7 +151,7 @@ def update_bug_resolution(experiment):
         status_body = format_resolution_body(experiment)
         make_bugzilla_call(
             settings.BUGZILLA_UPDATE_URL.format(id=experiment.bugzilla_id),
-            requests.put,
+            http_client.put,
             status_body,
         )
 
@@ -170,7 +203,7 @@ def create_experiment_bug(experiment):
     bug_data = format_normandy_experiment_request(experiment)
 
     response_data = make_bugzilla_call(
-        settings.BUGZILLA_CREATE_URL, requests.post, data=bug_data
+        settings.BUGZILLA_CREATE_URL, http_client.post, data=bug_data
     )
 
     if "id" not in response_data:
@@ -209,7 +242,9 @@ def set_bugzilla_id_value(bug_url):
 def add_experiment_comment(bugzilla_id, comment):
     comment_data = {"comment": comment}
     response_data = make_bugzilla_call(
-        settings.BUGZILLA_COMMENT_URL.format(id=bugzilla_id), requests.post, comment_data
+        settings.BUGZILLA_COMMENT_URL.format(id=bugzilla_id),
+        http_client.post,
+        comment_data,
     )
 
     return response_data["id"]
@@ -0,0 +1,51 @@
+# Generated by Django 3.1.7 on 2026-10-19 09:19
+
+import django.contrib.postgres.fields
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="BugzillaUpdate",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bugzilla_id", models.CharField(max_length=255, unique=True)),
+                ("data", models.JSONField(default=dict)),
+                (
+                    "comments",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.TextField(), default=list, size=None
+                    ),
+                ),
+                ("notifications", models.JSONField(default=list)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "next_attempt_on",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Bugzilla Update",
+                "verbose_name_plural": "Bugzilla Updates",
+                "ordering": ("next_attempt_on",),
+            },
+        ),
+    ]
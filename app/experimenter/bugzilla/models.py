@@ -0,0 +1,72 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.db import models, transaction
+from django.utils import timezone
+
+# A bug's resolution is only valid for the status it was sent with
+BUG_STATUS_FIELDS = ("status", "resolution")
+
+
+class BugzillaUpdateManager(models.Manager):
+    def enqueue(self, bugzilla_id, data=None, comment=None, notification=None):
+        """
+        Adds changes to the pending update of a bug, so everything queued for
+        the same bug before the next send goes out together. A new status
+        replaces the queued status and resolution rather than merging with
+        them.
+        """
+        with transaction.atomic():
+            update, _ = self.select_for_update().get_or_create(
+                bugzilla_id=str(bugzilla_id)
+            )
+            data = data or {}
+            if "status" in data:
+                for field in BUG_STATUS_FIELDS:
+                    update.data.pop(field, None)
+            update.data.update(data)
+            if comment:
+                update.comments.append(comment)
+            if notification:
+                update.notifications.append(notification)
+            update.save()
+        return update
+
+    def due(self):
+        return self.filter(next_attempt_on__lte=timezone.now())
+
+    def claim(self):
+        """
+        Locks the next due update just long enough to push its next attempt
+        BUGZILLA_OUTBOX_CLAIM_TIMEOUT seconds ahead, so it can be sent outside
+        of a transaction without other runs picking it up meanwhile.
+        """
+        with transaction.atomic():
+            update = self.due().select_for_update(skip_locked=True).first()
+            if update is not None:
+                update.next_attempt_on = timezone.now() + datetime.timedelta(
+                    seconds=settings.BUGZILLA_OUTBOX_CLAIM_TIMEOUT
+                )
+                update.save(update_fields=["next_attempt_on"])
+        return update
+
+
+class BugzillaUpdate(models.Model):
+    bugzilla_id = models.CharField(max_length=255, unique=True)
+    data = models.JSONField(default=dict)
+    comments = ArrayField(models.TextField(), default=list)
+    notifications = models.JSONField(default=list)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_on = models.DateTimeField(default=timezone.now, db_index=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    objects = BugzillaUpdateManager()
+
+    class Meta:
+        verbose_name = "Bugzilla Update"
+        verbose_name_plural = "Bugzilla Updates"
+        ordering = ("next_attempt_on",)
+
+    def __str__(self):
+        return f"Bugzilla Update {self.bugzilla_id}"
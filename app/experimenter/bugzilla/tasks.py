@@ -1,7 +1,15 @@
+import datetime
+import time
+
 import markus
 from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from experimenter.bugzilla import client as bugzilla
+from experimenter.bugzilla.models import BugzillaUpdate
 from experimenter.celery import app
 from experimenter.experiments.models import Experiment
 from experimenter.notifications.models import Notification
@@ -77,32 +85,29 @@ def create_experiment_bug_task(user_id, experiment_id):
 def update_experiment_bug_task(user_id, experiment_id):
     metrics.incr("update_experiment_bug.started")
 
-    experiment = Experiment.objects.get(id=experiment_id)
+    experiment = Experiment.objects.prefetch_related(*bugzilla.BUG_BODY_RELATIONS).get(
+        id=experiment_id
+    )
 
     if experiment.risk_confidential:
         logger.info("Skipping Bugzilla update for internal only experiment")
         return
 
-    logger.info("Updating Bugzilla Ticket")
+    if not experiment.bugzilla_id:
+        logger.info("Skipping Bugzilla update for experiment without a ticket")
+        return
 
-    try:
-        bugzilla.update_experiment_bug(experiment)
-        logger.info("Bugzilla Ticket updated")
-        Notification.objects.create(
-            user_id=user_id,
-            message=NOTIFICATION_MESSAGE_UPDATE_BUG.format(
-                bug_url=experiment.bugzilla_url
-            ),
-        )
-        metrics.incr("update_experiment_bug.completed")
-        logger.info("Bugzilla Update notification sent")
-    except bugzilla.BugzillaError as e:
-        Notification.objects.create(
-            user_id=user_id, message=NOTIFICATION_MESSAGE_UPDATE_BUG_FAILED
-        )
-        metrics.incr("update_experiment_bug.failed")
-        logger.info("Failed bugzilla update")
-        raise e
+    logger.info("Queueing Bugzilla Ticket update")
+    BugzillaUpdate.objects.enqueue(
+        experiment.bugzilla_id,
+        data=bugzilla.format_update_body(experiment),
+        notification=format_notification(
+            user_id,
+            NOTIFICATION_MESSAGE_UPDATE_BUG.format(bug_url=experiment.bugzilla_url),
+            NOTIFICATION_MESSAGE_UPDATE_BUG_FAILED,
+        ),
+    )
+    metrics.incr("update_experiment_bug.completed")
 
 
 @app.task
@@ -110,15 +115,13 @@ def update_experiment_bug_task(user_id, experiment_id):
 def comp_experiment_update_res_task(experiment_id):
     experiment = Experiment.objects.get(id=experiment_id)
     metrics.incr("comp_experiment_update_res_task.started")
-    logger.info("Updating Bugzilla Resolution")
-    try:
-        bugzilla.update_bug_resolution(experiment)
-        logger.info("Bugzilla Resolution Updated")
-        metrics.incr("comp_experiment_update_res_task.completed")
-    except bugzilla.BugzillaError as e:
-        metrics.incr("comp_experiment_update_res_task.failed")
-        logger.info("update bug resolution failed")
-        raise e
+
+    if experiment.bugzilla_id:
+        logger.info("Queueing Bugzilla Resolution update")
+        BugzillaUpdate.objects.enqueue(
+            experiment.bugzilla_id, data=bugzilla.format_resolution_body(experiment)
+        )
+    metrics.incr("comp_experiment_update_res_task.completed")
 
 
 @app.task
@@ -126,19 +129,14 @@ def comp_experiment_update_res_task(experiment_id):
 def add_start_date_comment_task(experiment_id):
     experiment = Experiment.objects.get(id=experiment_id)
     metrics.incr("add_start_data_comment.started")
-    logger.info("Adding Bugzilla Start Date Comment")
-    comment = "Start Date: {} End Date: {}".format(
-        experiment.start_date, experiment.end_date
-    )
-    try:
-        bugzilla_id = experiment.bugzilla_id
-        bugzilla.add_experiment_comment(bugzilla_id, comment)
-        logger.info("Bugzilla Comment Added")
-        metrics.incr("add_start_date_comment.completed")
-    except bugzilla.BugzillaError as e:
-        logger.info("Comment start date failed to be added")
-        metrics.incr("add_start_date_comment.failed")
-        raise e
+
+    if experiment.bugzilla_id:
+        logger.info("Queueing Bugzilla Start Date Comment")
+        comment = "Start Date: {} End Date: {}".format(
+            experiment.start_date, experiment.end_date
+        )
+        BugzillaUpdate.objects.enqueue(experiment.bugzilla_id, comment=comment)
+    metrics.incr("add_start_date_comment.completed")
 
 
 @app.task
@@ -147,30 +145,144 @@ def update_bug_resolution_task(user_id, experiment_id):
     metrics.incr("update_bug_resolution.started")
     experiment = Experiment.objects.get(id=experiment_id)
 
-    if experiment.status == experiment.STATUS_COMPLETE or experiment.bugzilla_id is None:
+    if experiment.status == experiment.STATUS_COMPLETE or not experiment.bugzilla_id:
         logger.info("Skipping update either experiment complete or no bugzilla ticket")
         return
 
-    logger.info("Updating Bugzilla Resolution")
-
-    try:
-        bugzilla.update_bug_resolution(experiment)
-        logger.info("Bugzilla resolution updated")
-        Notification.objects.create(
-            user_id=user_id,
-            message=NOTIFICATION_MESSAGE_ARCHIVE_COMMENT.format(
-                bug_url=experiment.bugzilla_url
-            ),
-        )
-        metrics.incr("update_bug_resolution.completed")
-        logger.info("Bugzilla resolution update sent")
-    except bugzilla.BugzillaError as e:
-        metrics.incr("update_bug_resolution.failed")
-        logger.info("Failed to update resolution of bugzilla ticket")
-        Notification.objects.create(
-            user_id=user_id,
-            message=NOTIFICATION_MESSAGE_ARCHIVE_ERROR_MESSAGE.format(
+    logger.info("Queueing Bugzilla Resolution update")
+    BugzillaUpdate.objects.enqueue(
+        experiment.bugzilla_id,
+        data=bugzilla.format_resolution_body(experiment),
+        notification=format_notification(
+            user_id,
+            NOTIFICATION_MESSAGE_ARCHIVE_COMMENT.format(bug_url=experiment.bugzilla_url),
+            NOTIFICATION_MESSAGE_ARCHIVE_ERROR_MESSAGE.format(
                 bug_url=experiment.bugzilla_url
             ),
+        ),
+    )
+    metrics.incr("update_bug_resolution.completed")
+
+
+def format_notification(user_id, message, error_message):
+    return {"user_id": user_id, "message": message, "error_message": error_message}
+
+
+@app.task
+@metrics.timer_decorator("send_bugzilla_updates.timing")
+def send_bugzilla_updates():
+    """
+    Sends the queued bug updates that are due, at most
+    BUGZILLA_OUTBOX_RATE a second for the length of one
+    BUGZILLA_OUTBOX_INTERVAL. Each update is claimed in its own short
+    transaction and sent after it commits, so neither the requests nor the
+    pauses between them hold a lock that enqueue would wait on.
+    """
+    metrics.incr("send_bugzilla_updates.started")
+    batch_size = max(
+        1, int(settings.BUGZILLA_OUTBOX_INTERVAL * settings.BUGZILLA_OUTBOX_RATE)
+    )
+
+    for i in range(batch_size):
+        update = BugzillaUpdate.objects.claim()
+        if update is None:
+            break
+
+        if i:
+            time.sleep(1 / settings.BUGZILLA_OUTBOX_RATE)
+        send_bugzilla_update(update)
+
+    metrics.incr("send_bugzilla_updates.completed")
+
+
+def send_bugzilla_update(update):
+    logger.info(f"Sending {update}")
+    data_sent = comments_sent = False
+    try:
+        if update.data:
+            bugzilla.update_bug(update.bugzilla_id, update.data)
+            data_sent = True
+        if update.comments:
+            bugzilla.add_experiment_comment(
+                update.bugzilla_id, "\n\n".join(update.comments)
+            )
+            comments_sent = True
+    except (bugzilla.BugzillaError, KeyError) as e:
+        attempts = update.attempts + 1
+        if attempts < settings.BUGZILLA_OUTBOX_MAX_ATTEMPTS:
+            metrics.incr("send_bugzilla_updates.retried")
+            logger.info(f"Retrying {update} after attempt {attempts}: {e}")
+            finish_bugzilla_update(update, data_sent, comments_sent, attempts=attempts)
+            return
+
+        metrics.incr("send_bugzilla_updates.failed")
+        logger.error(f"Failed {update} after {attempts} attempts: {e}")
+        finish_bugzilla_update(update, True, True, message_key="error_message")
+    else:
+        metrics.incr("send_bugzilla_updates.sent")
+        finish_bugzilla_update(update, True, True, message_key="message")
+
+
+def finish_bugzilla_update(
+    update, data_sent, comments_sent, attempts=0, message_key=None
+):
+    """
+    Removes what was sent, or given up on, from the queued update.  Changes
+    that were enqueued for the bug while it was being sent are kept and go
+    out on the next send.
+    """
+    with transaction.atomic():
+        queued = BugzillaUpdate.objects.select_for_update().filter(id=update.id).first()
+        if queued is None:
+            return
+
+        if data_sent:
+            for key, value in update.data.items():
+                if queued.data.get(key) == value:
+                    del queued.data[key]
+        if comments_sent:
+            queued.comments = queued.comments[len(update.comments) :]
+        if message_key:
+            Notification.objects.bulk_create(
+                Notification(
+                    user_id=notification["user_id"], message=notification[message_key]
+                )
+                for notification in update.notifications
+            )
+            queued.notifications = queued.notifications[len(update.notifications) :]
+
+        if attempts:
+            queued.next_attempt_on = timezone.now() + datetime.timedelta(
+                minutes=2 ** attempts
+            )
+        elif queued.data or queued.comments or queued.notifications:
+            queued.next_attempt_on = timezone.now()
+        else:
+            queued.delete()
+            return
+
+        queued.attempts = attempts
+        queued.save()
+
+
+@app.task
+@metrics.timer_decorator("prewarm_bugzilla_user_cache.timing")
+def prewarm_bugzilla_user_cache():
+    """
+    Looks up the owners of experiments that are yet to have a bug, so their
+    Bugzilla accounts are already cached by the time the bug is created.
+    """
+    metrics.incr("prewarm_bugzilla_user_cache.started")
+    emails = (
+        Experiment.objects.filter(
+            Q(bugzilla_id__isnull=True) | Q(bugzilla_id=""),
+            status__in=(Experiment.STATUS_DRAFT, Experiment.STATUS_REVIEW),
+            archived=False,
+            owner__isnull=False,
         )
-        raise e
+        .values_list("owner__email", flat=True)
+        .distinct()
+    )
+    for email in emails:
+        bugzilla.user_exists(email)
+    metrics.incr("prewarm_bugzilla_user_cache.completed")
@@ -1,4 +1,5 @@
 import mock
+from django.core.cache import cache
 
 from experimenter import bugzilla
 
@@ -6,16 +7,17 @@ from experimenter import bugzilla
 class MockBugzillaMixin(object):
     def setUp(self):
         super().setUp()
+        cache.clear()
 
         mock_bugzilla_requests_post_patcher = mock.patch(
-            "experimenter.bugzilla.client.requests.post"
+            "experimenter.bugzilla.client.http_client.post"
         )
         self.mock_bugzilla_requests_post = mock_bugzilla_requests_post_patcher.start()
         self.addCleanup(mock_bugzilla_requests_post_patcher.stop)
         self.bugzilla_id = "12345"
         self.mock_bugzilla_requests_post.return_value = self.buildMockSuccessResponse()
         mock_bugzilla_requests_put_patcher = mock.patch(
-            "experimenter.bugzilla.client.requests.put"
+            "experimenter.bugzilla.client.http_client.put"
         )
 
         self.mock_bugzilla_requests_put = mock_bugzilla_requests_put_patcher.start()
@@ -23,7 +25,7 @@ class MockBugzillaMixin(object):
         self.mock_bugzilla_requests_put.return_value = self.buildMockSuccessResponse()
 
         mock_bugzilla_requests_get_patcher = mock.patch(
-            "experimenter.bugzilla.client.requests.get"
+            "experimenter.bugzilla.client.http_client.get"
         )
 
         self.mock_bugzilla_requests_get = mock_bugzilla_requests_get_patcher.start()
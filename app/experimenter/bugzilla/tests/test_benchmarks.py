@@ -0,0 +1,63 @@
+import logging
+import time
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from experimenter.base.tests.factories import CountryFactory, LocaleFactory
+from experimenter.bugzilla import format_bug_bodies, format_bug_body
+from experimenter.experiments.models import Experiment
+from experimenter.experiments.tests.factories import ExperimentFactory
+
+logger = logging.getLogger()
+
+
+def measure(render):
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        render()
+        elapsed = time.perf_counter() - started
+    return elapsed * 1000, len(queries)
+
+
+class TestBugBodiesBenchmark(TestCase):
+    """
+    Compares rendering Bugzilla bug bodies one by one and in a batch, run with
+    pytest's --log-cli-level=INFO to see the timings.
+    """
+
+    experiments = 20
+
+    def test_batch_renders_with_fewer_queries(self):
+        countries = CountryFactory.create_batch(5)
+        locales = LocaleFactory.create_batch(5)
+        ids = [
+            ExperimentFactory.create_with_status(
+                Experiment.STATUS_LIVE, countries=countries, locales=locales
+            ).id
+            for _ in range(self.experiments)
+        ]
+
+        single_ms, single_queries = measure(
+            lambda: [
+                format_bug_body(experiment)
+                for experiment in Experiment.objects.filter(id__in=ids)
+            ]
+        )
+        batch_ms, batch_queries = measure(
+            lambda: format_bug_bodies(Experiment.objects.filter(id__in=ids))
+        )
+
+        logger.info(
+            "Rendered {count} bug bodies one by one in {single_ms:.1f}ms with "
+            "{single_queries} queries, in a batch in {batch_ms:.1f}ms with "
+            "{batch_queries} queries".format(
+                count=len(ids),
+                single_ms=single_ms,
+                single_queries=single_queries,
+                batch_ms=batch_ms,
+                batch_queries=batch_queries,
+            )
+        )
+        self.assertLess(batch_queries, single_queries)
@@ -1,20 +1,26 @@
 import mock
-import requests
 from django.conf import settings
 from django.test import TestCase
+from requests.exceptions import ConnectionError
 
 from experimenter.base.tests.factories import CountryFactory, LocaleFactory
 from experimenter.bugzilla import (
+    BUG_BODY_RELATIONS,
+    INVALID_BUG_ERROR_CODE,
     BugzillaError,
     add_experiment_comment,
+    bug_exists,
     create_experiment_bug,
+    format_bug_bodies,
     format_bug_body,
     format_summary,
     get_bugzilla_id,
+    http_client,
     make_bugzilla_call,
     set_bugzilla_id_value,
     update_bug_resolution,
     update_experiment_bug,
+    user_exists,
 )
 from experimenter.bugzilla.tests.mixins import MockBugzillaMixin
 from experimenter.experiments.models import Experiment
@@ -166,6 +172,49 @@ class TestFormatBugBody(TestCase):
         self.assertIn("Countries: Canada (CA)", body)
         self.assertIn("Locales: Danish (da)", body)
 
+    def test_format_bug_body_with_prefetched_relations_does_not_query(self):
+        experiment = ExperimentFactory.create_with_status(
+            Experiment.STATUS_LIVE,
+            countries=[CountryFactory(code="CA", name="Canada")],
+            locales=[LocaleFactory(code="da", name="Danish")],
+        )
+        experiment = Experiment.objects.prefetch_related(*BUG_BODY_RELATIONS).get(
+            id=experiment.id
+        )
+
+        with self.assertNumQueries(0):
+            body = format_bug_body(experiment)
+
+        self.assertIn("Countries: Canada (CA)", body)
+        self.assertIn(experiment.dates, body)
+
+    def test_format_bug_bodies_renders_batch_with_one_query_per_relation(self):
+        country = CountryFactory(code="CA", name="Canada")
+        locale = LocaleFactory(code="da", name="Danish")
+        experiments = [
+            ExperimentFactory.create_with_status(
+                Experiment.STATUS_LIVE,
+                type=experiment_type,
+                countries=[country],
+                locales=[locale],
+            )
+            for experiment_type in (Experiment.TYPE_PREF, Experiment.TYPE_ADDON)
+        ]
+
+        # The experiments and then one query for each of BUG_BODY_RELATIONS
+        with self.assertNumQueries(1 + len(BUG_BODY_RELATIONS)):
+            bodies = format_bug_bodies(
+                Experiment.objects.filter(id__in=[e.id for e in experiments])
+            )
+
+        self.assertEqual(
+            bodies,
+            {
+                experiment.id: format_bug_body(Experiment.objects.get(id=experiment.id))
+                for experiment in experiments
+            },
+        )
+
 
 class TestUpdateExperimentBug(MockBugzillaMixin, TestCase):
     def test_update_bugzilla_pref_experiment(self):
@@ -302,14 +351,14 @@ class TestMakeBugzillaCall(MockBugzillaMixin, TestCase):
         mock_response.status_code = 400
         self.mock_bugzilla_requests_post.return_value = mock_response
 
-        response_data = make_bugzilla_call("/url/", requests.post, data={})
+        response_data = make_bugzilla_call("/url/", http_client.post, data={})
         self.assertEqual(response_data, mock_response_data)
 
     def test_json_parse_error_raises_bugzilla_error(self):
         self.mock_bugzilla_requests_post.side_effect = ValueError()
 
         with self.assertRaises(BugzillaError):
-            make_bugzilla_call("/url/", requests.post, data={})
+            make_bugzilla_call("/url/", http_client.post, data={})
 
 
 class TestMakePutBugzillaCall(MockBugzillaMixin, TestCase):
@@ -321,10 +370,95 @@ class TestMakePutBugzillaCall(MockBugzillaMixin, TestCase):
         mock_response.status_code = 400
         self.mock_bugzilla_requests_put.return_value = mock_response
 
-        response_data = make_bugzilla_call("/url/", requests.put, data={})
+        response_data = make_bugzilla_call("/url/", http_client.put, data={})
         self.assertEqual(response_data, mock_response_data)
 
     def test_json_parse_error_raises_bugzilla_error(self):
         self.mock_bugzilla_requests_put.side_effect = ValueError()
         with self.assertRaises(BugzillaError):
-            make_bugzilla_call("/url/", requests.put, data={})
+            make_bugzilla_call("/url/", http_client.put, data={})
+
+
+class TestExistsChecks(MockBugzillaMixin, TestCase):
+    def test_user_exists_is_cached(self):
+        self.assertTrue(user_exists("dev@example.com"))
+        self.assertTrue(user_exists("dev@example.com"))
+        self.mock_bugzilla_requests_get.assert_called_once_with(
+            settings.BUGZILLA_USER_URL.format(email="dev@example.com"), None
+        )
+
+    def test_missing_user_is_cached(self):
+        self.mock_bugzilla_requests_get.side_effect = None
+        self.mock_bugzilla_requests_get.return_value = self.buildMockFailureResponse()
+
+        self.assertFalse(user_exists("dev@example.com"))
+        self.assertFalse(user_exists("dev@example.com"))
+        self.mock_bugzilla_requests_get.assert_called_once()
+
+    def test_bug_exists_is_cached(self):
+        self.mock_bugzilla_requests_get.side_effect = None
+        self.mock_bugzilla_requests_get.return_value = self.buildMockSuccessBugResponse()
+
+        self.assertTrue(bug_exists(1234))
+        self.assertTrue(bug_exists(1234))
+        self.assertTrue(bug_exists(5678))
+        self.assertEqual(self.mock_bugzilla_requests_get.call_count, 2)
+
+    def test_missing_bug_is_cached(self):
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {
+            "error": True,
+            "code": INVALID_BUG_ERROR_CODE,
+        }
+        mock_response.status_code = 404
+        self.mock_bugzilla_requests_get.side_effect = None
+        self.mock_bugzilla_requests_get.return_value = mock_response
+
+        self.assertFalse(bug_exists(1234))
+        self.assertFalse(bug_exists(1234))
+        self.mock_bugzilla_requests_get.assert_called_once_with(
+            settings.BUGZILLA_BUG_URL.format(bug_id=1234), None
+        )
+
+    def test_unexpected_bug_response_is_not_cached(self):
+        self.mock_bugzilla_requests_get.side_effect = [
+            self.buildMockFailureResponse(),
+            self.buildMockSuccessBugResponse(),
+        ]
+
+        self.assertFalse(bug_exists(1234))
+        self.assertTrue(bug_exists(1234))
+
+    def test_request_error_is_not_cached(self):
+        self.mock_bugzilla_requests_get.side_effect = [
+            ConnectionError(),
+            self.buildMockSuccessUserResponse(),
+        ]
+
+        self.assertFalse(user_exists("dev@example.com"))
+        self.assertTrue(user_exists("dev@example.com"))
+
+    def test_found_and_missing_results_use_their_own_timeouts(self):
+        self.mock_bugzilla_requests_get.side_effect = [
+            self.buildMockSuccessUserResponse(),
+            self.buildMockFailureResponse(),
+        ]
+
+        with mock.patch("experimenter.bugzilla.client.cache.set") as mock_cache_set:
+            user_exists("dev@example.com")
+            user_exists("missing@example.com")
+
+        mock_cache_set.assert_has_calls(
+            [
+                mock.call(
+                    "bugzilla-user-exists:dev@example.com",
+                    True,
+                    settings.BUGZILLA_EXISTS_CACHE_TIMEOUT,
+                ),
+                mock.call(
+                    "bugzilla-user-exists:missing@example.com",
+                    False,
+                    settings.BUGZILLA_MISSING_CACHE_TIMEOUT,
+                ),
+            ]
+        )
@@ -0,0 +1,42 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from experimenter.bugzilla.models import BugzillaUpdate
+
+
+class TestBugzillaUpdateManager(TestCase):
+    def test_enqueue_coalesces_updates_for_the_same_bug(self):
+        BugzillaUpdate.objects.enqueue(
+            123,
+            data={"status": "REOPENED", "summary": "Summary"},
+            notification={"user_id": 1},
+        )
+        BugzillaUpdate.objects.enqueue(
+            "123", data={"status": "RESOLVED"}, comment="Comment"
+        )
+        BugzillaUpdate.objects.enqueue("456", comment="Other")
+
+        update = BugzillaUpdate.objects.get(bugzilla_id="123")
+        self.assertEqual(update.data, {"status": "RESOLVED", "summary": "Summary"})
+        self.assertEqual(update.comments, ["Comment"])
+        self.assertEqual(update.notifications, [{"user_id": 1}])
+        self.assertEqual(BugzillaUpdate.objects.count(), 2)
+
+    def test_enqueue_replaces_queued_status_and_resolution(self):
+        BugzillaUpdate.objects.enqueue(
+            "123", data={"status": "RESOLVED", "resolution": "WONTFIX"}
+        )
+        BugzillaUpdate.objects.enqueue("123", data={"status": "REOPENED"})
+
+        update = BugzillaUpdate.objects.get(bugzilla_id="123")
+        self.assertEqual(update.data, {"status": "REOPENED"})
+
+    def test_due_excludes_updates_waiting_to_be_retried(self):
+        due_update = BugzillaUpdate.objects.enqueue("123", comment="Comment")
+        retried_update = BugzillaUpdate.objects.enqueue("456", comment="Comment")
+        retried_update.next_attempt_on = timezone.now() + datetime.timedelta(minutes=2)
+        retried_update.save()
+
+        self.assertEqual(list(BugzillaUpdate.objects.due()), [due_update])
@@ -1,17 +1,22 @@
 import markus
+import mock
 from django.conf import settings
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from markus.testing import MetricsMock
+from parameterized import parameterized
 from requests import RequestException
 
 from experimenter.base.tests.mixins import MockRequestMixin
 from experimenter.bugzilla import client as bugzilla
 from experimenter.bugzilla import tasks
+from experimenter.bugzilla.models import BugzillaUpdate
 from experimenter.bugzilla.tests.mixins import MockBugzillaMixin
 from experimenter.experiments.models import Experiment
 from experimenter.experiments.tests.factories import ExperimentFactory
 from experimenter.normandy.tests.mixins import MockNormandyMixin
 from experimenter.notifications.models import Notification
+from experimenter.openidc.tests.factories import UserFactory
 
 
 class TestCreateBugTask(MockRequestMixin, MockBugzillaMixin, TestCase):
@@ -127,8 +132,14 @@ class TestUpdateResolutionTask(MockRequestMixin, MockBugzillaMixin, TestCase):
         self.assertEqual(Notification.objects.count(), 0)
 
         tasks.update_bug_resolution_task(self.user.id, self.experiment.id)
+        self.mock_bugzilla_requests_put.assert_not_called()
 
-        self.mock_bugzilla_requests_put.assert_called()
+        tasks.send_bugzilla_updates()
+
+        self.mock_bugzilla_requests_put.assert_called_with(
+            settings.BUGZILLA_UPDATE_URL.format(id=self.bugzilla_id),
+            {"status": "REOPENED"},
+        )
 
         notification = Notification.objects.get()
         self.assertEqual(notification.user, self.user)
@@ -139,35 +150,40 @@ class TestUpdateResolutionTask(MockRequestMixin, MockBugzillaMixin, TestCase):
             ),
         )
 
-    def test_no_request_call_when_no_bug_id(self):
+    @parameterized.expand([[None], [""]])
+    def test_no_request_call_when_no_bug_id(self, bugzilla_id):
         experiment = ExperimentFactory.create_with_status(
             Experiment.STATUS_SHIP, risk_confidential=True
         )
-        experiment.bugzilla_id = None
+        experiment.bugzilla_id = bugzilla_id
         experiment.save()
 
         tasks.update_bug_resolution_task(self.user.id, experiment.id)
+        tasks.send_bugzilla_updates()
 
         self.mock_bugzilla_requests_put.assert_not_called()
 
         self.assertEqual(Notification.objects.count(), 0)
 
+    @override_settings(BUGZILLA_OUTBOX_MAX_ATTEMPTS=1)
     def test_bugzilla_error_create_notifications(self):
         self.assertEqual(Notification.objects.count(), 0)
 
         self.mock_bugzilla_requests_put.side_effect = RequestException()
 
-        with self.assertRaises(bugzilla.BugzillaError):
-
-            tasks.update_bug_resolution_task(self.user.id, self.experiment.id)
+        tasks.update_bug_resolution_task(self.user.id, self.experiment.id)
+        tasks.send_bugzilla_updates()
 
-            self.mock_bugzilla_requests_put.side_effect = RequestException()
-            self.mock_bugzilla_requests_put.assert_called()
-            self.assertEqual(Notification.objects.count(), 1)
-            message = tasks.NOTIFICATION_MESSAGE_ARCHIVE_ERROR_MESSAGE.format(
+        self.mock_bugzilla_requests_put.assert_called()
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.user)
+        self.assertEqual(
+            notification.message,
+            tasks.NOTIFICATION_MESSAGE_ARCHIVE_ERROR_MESSAGE.format(
                 bug_url=self.experiment.bugzilla_url
-            )
-            self.assertEqual(Notification.objects.filters(message=message).exists())
+            ),
+        )
+        self.assertFalse(BugzillaUpdate.objects.exists())
 
 
 class TestUpdateTask(MockRequestMixin, MockBugzillaMixin, TestCase):
@@ -210,7 +226,12 @@ class TestUpdateTask(MockRequestMixin, MockBugzillaMixin, TestCase):
                 )
             )
 
-        self.mock_bugzilla_requests_put.assert_called()
+        tasks.send_bugzilla_updates()
+
+        self.mock_bugzilla_requests_put.assert_called_with(
+            settings.BUGZILLA_UPDATE_URL.format(id=self.bugzilla_id),
+            bugzilla.format_update_body(self.experiment),
+        )
 
         notification = Notification.objects.get()
         self.assertEqual(notification.user, self.user)
@@ -221,34 +242,25 @@ class TestUpdateTask(MockRequestMixin, MockBugzillaMixin, TestCase):
             ),
         )
 
+    @override_settings(BUGZILLA_OUTBOX_MAX_ATTEMPTS=1)
     def test_bugzilla_error_creates_notifications(self):
         self.assertEqual(Notification.objects.count(), 0)
 
         self.mock_bugzilla_requests_put.side_effect = RequestException()
 
-        with self.assertRaises(bugzilla.BugzillaError):
-            with MetricsMock() as mm:
-                tasks.update_experiment_bug_task(self.user.id, self.experiment.id)
+        tasks.update_experiment_bug_task(self.user.id, self.experiment.id)
 
-                self.assertTrue(
-                    mm.has_record(
-                        markus.INCR,
-                        "experiments.tasks.update_experiment_bug.started",
-                        value=1,
-                    )
-                )
-                # Failures should abort timing metrics.
-                self.assertFalse(
-                    mm.has_record(
-                        markus.INCR, "experiments.tasks.update_experiment_bug.timing"
-                    )
-                )
-                # Completed metric should not be sent.
-                self.assertFalse(
-                    mm.has_record(
-                        markus.INCR, "experiments.tasks.update_experiment_bug.completed"
-                    )
+        with MetricsMock() as mm:
+            tasks.send_bugzilla_updates()
+
+            self.assertTrue(
+                mm.has_record(
+                    markus.INCR, "experiments.tasks.send_bugzilla_updates.failed"
                 )
+            )
+            self.assertFalse(
+                mm.has_record(markus.INCR, "experiments.tasks.send_bugzilla_updates.sent")
+            )
 
         self.mock_bugzilla_requests_put.assert_called()
         self.assertEqual(Notification.objects.count(), 1)
@@ -259,6 +271,15 @@ class TestUpdateTask(MockRequestMixin, MockBugzillaMixin, TestCase):
             notification.message, tasks.NOTIFICATION_MESSAGE_UPDATE_BUG_FAILED
         )
 
+    @parameterized.expand([[None], [""]])
+    def test_experiment_without_bug_is_not_queued(self, bugzilla_id):
+        self.experiment.bugzilla_id = bugzilla_id
+        self.experiment.save()
+
+        tasks.update_experiment_bug_task(self.user.id, self.experiment.id)
+
+        self.assertFalse(BugzillaUpdate.objects.exists())
+
     def test_confidential_only_does_not_update_bugzilla(self):
         experiment = ExperimentFactory.create_with_status(
             Experiment.STATUS_SHIP, risk_confidential=True
@@ -291,6 +312,8 @@ class TestUpdateTask(MockRequestMixin, MockBugzillaMixin, TestCase):
                 )
             )
 
+        tasks.send_bugzilla_updates()
+
         self.mock_bugzilla_requests_put.assert_not_called()
 
         self.assertEqual(Notification.objects.count(), 0)
@@ -305,17 +328,24 @@ class TestUpdateExperimentSubTask(MockNormandyMixin, MockBugzillaMixin, TestCase
         expected_call_data = {"comment": comment}
 
         tasks.add_start_date_comment_task(experiment.id)
+        tasks.send_bugzilla_updates()
 
         self.mock_bugzilla_requests_post.assert_called_with(
-            settings.BUGZILLA_COMMENT_URL.format(id=12345), expected_call_data
+            settings.BUGZILLA_COMMENT_URL.format(id=experiment.bugzilla_id),
+            expected_call_data,
         )
+        self.mock_bugzilla_requests_put.assert_not_called()
 
-    def test_add_start_date_comment_task_failure(self):
+    def test_add_start_date_comment_task_failure_is_retried(self):
         experiment = ExperimentFactory.create(normandy_id=12345)
 
         self.mock_bugzilla_requests_post.side_effect = RequestException
-        with self.assertRaises(bugzilla.BugzillaError):
-            tasks.add_start_date_comment_task(experiment.id)
+        tasks.add_start_date_comment_task(experiment.id)
+        tasks.send_bugzilla_updates()
+
+        update = BugzillaUpdate.objects.get(bugzilla_id=experiment.bugzilla_id)
+        self.assertEqual(update.attempts, 1)
+        self.assertGreater(update.next_attempt_on, timezone.now())
 
     def test_comp_experiment_update_res_task(self):
         experiment = ExperimentFactory.create_with_status(
@@ -325,17 +355,176 @@ class TestUpdateExperimentSubTask(MockNormandyMixin, MockBugzillaMixin, TestCase
         expected_call_data = {"status": "RESOLVED", "resolution": "FIXED"}
 
         tasks.comp_experiment_update_res_task(experiment.id)
+        tasks.send_bugzilla_updates()
 
         self.mock_bugzilla_requests_put.assert_called_with(
             settings.BUGZILLA_UPDATE_URL.format(id=experiment.bugzilla_id),
             expected_call_data,
         )
 
-    def test_comp_experiment_update_res_task_with_bug_error(self):
+    def test_comp_experiment_update_res_task_with_bug_error_is_retried(self):
         self.mock_bugzilla_requests_put.side_effect = RequestException()
         experiment = ExperimentFactory.create_with_status(
             target_status=Experiment.STATUS_COMPLETE, normandy_id=12345
         )
 
-        with self.assertRaises(bugzilla.BugzillaError):
-            tasks.comp_experiment_update_res_task(experiment.id)
+        tasks.comp_experiment_update_res_task(experiment.id)
+        tasks.send_bugzilla_updates()
+
+        update = BugzillaUpdate.objects.get(bugzilla_id=experiment.bugzilla_id)
+        self.assertEqual(update.attempts, 1)
+        self.assertEqual(update.data, {"status": "RESOLVED", "resolution": "FIXED"})
+
+
+class TestSendBugzillaUpdates(MockBugzillaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        mock_sleep_patcher = mock.patch("experimenter.bugzilla.tasks.time.sleep")
+        self.mock_sleep = mock_sleep_patcher.start()
+        self.addCleanup(mock_sleep_patcher.stop)
+
+    def test_coalesced_updates_are_sent_together(self):
+        BugzillaUpdate.objects.enqueue("123", data={"status": "REOPENED"})
+        BugzillaUpdate.objects.enqueue("123", comment="First")
+        BugzillaUpdate.objects.enqueue(
+            "123", data={"status": "RESOLVED", "resolution": "FIXED"}, comment="Second"
+        )
+
+        tasks.send_bugzilla_updates()
+
+        self.mock_bugzilla_requests_put.assert_called_once_with(
+            settings.BUGZILLA_UPDATE_URL.format(id="123"),
+            {"status": "RESOLVED", "resolution": "FIXED"},
+        )
+        self.mock_bugzilla_requests_post.assert_called_once_with(
+            settings.BUGZILLA_COMMENT_URL.format(id="123"),
+            {"comment": "First\n\nSecond"},
+        )
+        self.assertFalse(BugzillaUpdate.objects.exists())
+
+    @override_settings(BUGZILLA_OUTBOX_INTERVAL=2, BUGZILLA_OUTBOX_RATE=1)
+    def test_sends_at_configured_rate(self):
+        for bugzilla_id in ("1", "2", "3"):
+            BugzillaUpdate.objects.enqueue(bugzilla_id, data={"status": "REOPENED"})
+
+        tasks.send_bugzilla_updates()
+
+        self.assertEqual(self.mock_bugzilla_requests_put.call_count, 2)
+        self.mock_sleep.assert_called_once_with(1)
+        self.assertEqual(BugzillaUpdate.objects.count(), 1)
+
+    def test_retried_update_is_not_due_until_backoff_passes(self):
+        self.mock_bugzilla_requests_put.side_effect = RequestException()
+        BugzillaUpdate.objects.enqueue("123", data={"status": "REOPENED"})
+
+        tasks.send_bugzilla_updates()
+        tasks.send_bugzilla_updates()
+
+        self.assertEqual(self.mock_bugzilla_requests_put.call_count, 1)
+        self.assertEqual(BugzillaUpdate.objects.get().attempts, 1)
+
+    def test_sent_fields_are_not_resent_when_comment_fails(self):
+        self.mock_bugzilla_requests_post.side_effect = RequestException()
+        BugzillaUpdate.objects.enqueue("123", data={"status": "REOPENED"}, comment="Hi")
+
+        tasks.send_bugzilla_updates()
+
+        update = BugzillaUpdate.objects.get()
+        self.assertEqual(update.data, {})
+        self.assertEqual(update.comments, ["Hi"])
+
+    def test_update_is_claimed_before_it_is_sent(self):
+        BugzillaUpdate.objects.enqueue("123", data={"status": "REOPENED"})
+
+        def update_bug(*args, **kwargs):
+            self.assertFalse(BugzillaUpdate.objects.due().exists())
+            return mock.DEFAULT
+
+        self.mock_bugzilla_requests_put.side_effect = update_bug
+
+        tasks.send_bugzilla_updates()
+
+        self.mock_bugzilla_requests_put.assert_called_once()
+        self.assertFalse(BugzillaUpdate.objects.exists())
+
+    def test_changes_enqueued_while_sending_are_kept(self):
+        user = UserFactory.create()
+        BugzillaUpdate.objects.enqueue(
+            "123",
+            data={"status": "REOPENED"},
+            comment="First",
+            notification=tasks.format_notification(user.id, "Sent", "Failed"),
+        )
+
+        def update_bug(*args, **kwargs):
+            BugzillaUpdate.objects.enqueue(
+                "123", data={"status": "RESOLVED"}, comment="Second"
+            )
+            return mock.DEFAULT
+
+        self.mock_bugzilla_requests_put.side_effect = update_bug
+
+        with override_settings(BUGZILLA_OUTBOX_INTERVAL=1):
+            tasks.send_bugzilla_updates()
+
+        update = BugzillaUpdate.objects.get()
+        self.assertEqual(update.data, {"status": "RESOLVED"})
+        self.assertEqual(update.comments, ["Second"])
+        self.assertEqual(update.notifications, [])
+        self.assertEqual(update.attempts, 0)
+        self.assertEqual(Notification.objects.get(user=user).message, "Sent")
+        self.assertLessEqual(update.next_attempt_on, timezone.now())
+
+    def test_failed_update_keeps_changes_enqueued_while_sending(self):
+        BugzillaUpdate.objects.enqueue("123", comment="First")
+        BugzillaUpdate.objects.filter(bugzilla_id="123").update(
+            attempts=settings.BUGZILLA_OUTBOX_MAX_ATTEMPTS - 1
+        )
+
+        def add_comment(*args, **kwargs):
+            BugzillaUpdate.objects.enqueue("123", comment="Second")
+            raise RequestException()
+
+        self.mock_bugzilla_requests_post.side_effect = add_comment
+
+        with override_settings(BUGZILLA_OUTBOX_INTERVAL=1):
+            tasks.send_bugzilla_updates()
+
+        update = BugzillaUpdate.objects.get()
+        self.assertEqual(update.comments, ["Second"])
+        self.assertEqual(update.attempts, 0)
+
+
+class TestPrewarmBugzillaUserCache(MockBugzillaMixin, TestCase):
+    def test_looks_up_owners_of_experiments_without_bugs_once(self):
+        draft = ExperimentFactory.create_with_status(
+            Experiment.STATUS_DRAFT, bugzilla_id=None
+        )
+        ExperimentFactory.create_with_status(
+            Experiment.STATUS_REVIEW, owner=draft.owner, bugzilla_id=""
+        )
+        ExperimentFactory.create_with_status(Experiment.STATUS_DRAFT)
+        ExperimentFactory.create_with_status(
+            Experiment.STATUS_DRAFT, bugzilla_id=None, archived=True
+        )
+        ExperimentFactory.create_with_status(Experiment.STATUS_COMPLETE)
+        ExperimentFactory.create_with_status(
+            Experiment.STATUS_DRAFT, bugzilla_id=None, owner=None
+        )
+
+        tasks.prewarm_bugzilla_user_cache()
+
+        self.mock_bugzilla_requests_get.assert_called_once_with(
+            settings.BUGZILLA_USER_URL.format(email=draft.owner.email), None
+        )
+
+    def test_prewarmed_owner_is_not_looked_up_again(self):
+        experiment = ExperimentFactory.create_with_status(
+            Experiment.STATUS_DRAFT, bugzilla_id=None
+        )
+
+        tasks.prewarm_bugzilla_user_cache()
+        self.assertTrue(bugzilla.user_exists(experiment.owner.email))
+
+        self.mock_bugzilla_requests_get.assert_called_once()
@@ -62,7 +62,7 @@ class NimbusExperimentAdminForm(forms.ModelForm):
 
     class Meta:
         model = NimbusExperiment
-        exclude = ("id",)
+        exclude = ("id", "results_data", "results_fingerprint")
 
 
 class NimbusExperimentAdmin(admin.ModelAdmin):
@@ -6,7 +6,11 @@ from experimenter.experiments.api.v5.types import (
     NimbusLabelValueType,
     NimbusOutcomeType,
 )
-from experimenter.experiments.models.nimbus import NimbusExperiment, NimbusFeatureConfig
+from experimenter.experiments.models.nimbus import (
+    NimbusChangeLog,
+    NimbusExperiment,
+    NimbusFeatureConfig,
+)
 from experimenter.outcomes import Outcomes
 
 
@@ -80,7 +84,11 @@ class Query(graphene.ObjectType):
     )
 
     def resolve_experiments(root, info):
-        return NimbusExperiment.objects.all()
+        experiments = list(NimbusExperiment.objects.all())
+        latest_review_changes = NimbusChangeLog.objects.latest_review_changes(experiments)
+        for experiment in experiments:
+            experiment.latest_review_changes = latest_review_changes[experiment.id]
+        return experiments
 
     def resolve_experiment_by_slug(root, info, slug):
         try:
@@ -497,7 +497,7 @@ class NimbusReadyForReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = NimbusExperiment
-        exclude = ("id",)
+        exclude = ("id", "results_data", "results_fingerprint")
 
     def validate_reference_branch(self, value):
         if value["description"] == "":
@@ -149,7 +149,7 @@ class NimbusExperimentType(DjangoObjectType):
 
     class Meta:
         model = NimbusExperiment
-        exclude = ("branches",)
+        exclude = ("branches", "results_data", "results_fingerprint")
 
     def resolve_reference_branch(self, info):
         if self.reference_branch:
@@ -182,10 +182,10 @@ class NimbusExperimentType(DjangoObjectType):
         return self.can_review(info.context.user)
 
     def resolve_review_request(self, info):
-        return self.changes.latest_review_request()
+        return self.latest_review_changes[NimbusChangeLog.objects.REVIEW_REQUEST]
 
     def resolve_rejection(self, info):
-        return self.changes.latest_rejection()
+        return self.latest_review_changes[NimbusChangeLog.objects.REJECTION]
 
     def resolve_timeout(self, info):
-        return self.changes.latest_timeout()
+        return self.latest_review_changes[NimbusChangeLog.objects.TIMEOUT]
@@ -35,7 +35,7 @@ class NimbusExperimentChangeLogSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = NimbusExperiment
-        exclude = ("id",)
+        exclude = ("id", "results_data", "results_fingerprint")
 
 
 def generate_nimbus_changelog(experiment, changed_by, message=None):
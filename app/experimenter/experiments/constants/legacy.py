@@ -7,6 +7,33 @@ class ExperimentConstants(object):
     # Model Constants
     MAX_DURATION = 1000
 
+    # Fields that make up search_vector, from most to least important
+    SEARCH_FIELDS = (
+        ("A", ("name", "slug", "recipe_slug")),
+        (
+            "B",
+            (
+                "short_description",
+                "public_description",
+                "owner__email",
+                "analysis_owner__email",
+                "bugzilla_id",
+            ),
+        ),
+        (
+            "C",
+            (
+                "addon_experiment_id",
+                "pref_name",
+                "objectives",
+                "analysis",
+                "related_work",
+                "engineering_owner",
+            ),
+        ),
+        ("D", ("data_science_issue_url", "feature_bugzilla_url")),
+    )
+
     # Type stuff
     TYPE_PREF = "pref"
     TYPE_ADDON = "addon"
@@ -249,6 +249,12 @@ class NimbusConstants(object):
 
     # Bucket stuff
     BUCKET_TOTAL = 10000
+    # Bucket ranges held by experiments in these statuses can be reused
+    BUCKET_RECLAIMABLE_STATUSES = (Status.COMPLETE,)
+    # Bucket ranges held by experiments in these statuses have not been
+    # published and can be moved to another isolation group instance
+    BUCKET_RELOCATABLE_STATUSES = (Status.DRAFT, Status.REVIEW)
+    BUCKET_RELOCATABLE_PUBLISH_STATUSES = (PublishStatus.IDLE, PublishStatus.REVIEW)
 
     HYPOTHESIS_DEFAULT = """If we <do this/build this/create this change in the experiment> for <these users>, then we will see <this outcome>.
 We believe this because we have observed <this> via <data source, UR, survey>.
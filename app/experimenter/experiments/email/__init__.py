@@ -6,7 +6,7 @@ from experimenter.experiments.email.legacy import (  # noqa: F401
     send_experiment_ending_email,
     send_experiment_launch_email,
     send_intent_to_ship_email,
-    send_period_ending_emails_task,
+    send_period_ending_emails,
 )
 from experimenter.experiments.email.nimbus import (  # noqa: F401
     nimbus_send_experiment_ending_email,
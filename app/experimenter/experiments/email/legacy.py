@@ -1,11 +1,13 @@
+import datetime
 import logging
 
 from django.conf import settings
-from django.core.mail.message import EmailMessage
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
 from django.template.loader import render_to_string
 
 from experimenter.experiments.constants import ExperimentConstants
-from experimenter.experiments.models import Experiment, ExperimentEmail
+from experimenter.experiments.models import Experiment, ExperimentEmail, QueuedEmail
 
 
 def send_intent_to_ship_email(experiment_id):
@@ -117,36 +119,62 @@ def format_and_send_html_email(
     )
 
     if experiment.analysis_owner:
-        recipients.append(experiment.analysis_owner)
-
-    email = EmailMessage(
-        subject.format(name=experiment.name, version=version, channel=channel),
-        content,
-        settings.EMAIL_SENDER,
-        recipients,
-        cc=cc_recipients,
+        recipients.append(experiment.analysis_owner.email)
+
+    with transaction.atomic():
+        QueuedEmail.objects.enqueue(
+            subject.format(name=experiment.name, version=version, channel=channel),
+            content,
+            recipients,
+            cc_recipients=cc_recipients,
+        )
+        ExperimentEmail.objects.create(experiment=experiment, type=email_type)
+
+
+def send_period_ending_emails(experiment_ids):
+    """
+    Sends the ending and enrollment pause emails that are due within the
+    next five days and haven't been sent yet, working out which ones those
+    are for all of the experiments in a single query.
+    """
+    cutoff = datetime.date.today() + datetime.timedelta(days=5)
+    experiments = (
+        Experiment.objects.annotate_dates()
+        .annotate(
+            ending_email_sent=Exists(
+                ExperimentEmail.objects.filter(
+                    experiment=OuterRef("pk"), type=ExperimentConstants.EXPERIMENT_ENDS
+                )
+            ),
+            pause_email_sent=Exists(
+                ExperimentEmail.objects.filter(
+                    experiment=OuterRef("pk"),
+                    type=ExperimentConstants.EXPERIMENT_PAUSES,
+                )
+            ),
+        )
+        .filter(
+            Q(computed_end_date__lte=cutoff, ending_email_sent=False)
+            | Q(computed_enrollment_end_date__lte=cutoff, pause_email_sent=False),
+            id__in=experiment_ids,
+        )
+        .select_related("owner", "analysis_owner")
     )
-    email.content_subtype = "html"
-
-    email.send(fail_silently=False)
 
-    ExperimentEmail.objects.create(experiment=experiment, type=email_type)
-
-
-def send_period_ending_emails_task(experiment):
-    # send experiment ending soon emails if end date is 5 days out
-    if experiment.ending_soon:
-        if not ExperimentEmail.objects.filter(
-            experiment=experiment, type=ExperimentConstants.EXPERIMENT_ENDS
-        ).exists():
+    for experiment in experiments:
+        if (
+            experiment.computed_end_date
+            and experiment.computed_end_date <= cutoff
+            and not experiment.ending_email_sent
+        ):
             send_experiment_ending_email(experiment)
             logging.info("Sent ending email for Experiment: {}".format(experiment))
-    # send enrollment ending emails if enrollment end
-    # date is 5 days out
-    if experiment.enrollment_end_date and experiment.enrollment_ending_soon:
-        if not ExperimentEmail.objects.filter(
-            experiment=experiment, type=ExperimentConstants.EXPERIMENT_PAUSES
-        ).exists():
+
+        if (
+            experiment.computed_enrollment_end_date
+            and experiment.computed_enrollment_end_date <= cutoff
+            and not experiment.pause_email_sent
+        ):
             send_enrollment_pause_email(experiment)
             logging.info(
                 "Sent enrollment pause email for Experiment: {}".format(experiment)
@@ -1,8 +1,7 @@
-from django.conf import settings
-from django.core.mail.message import EmailMessage
+from django.db import transaction
 from django.template.loader import render_to_string
 
-from experimenter.experiments.models import NimbusEmail, NimbusExperiment
+from experimenter.experiments.models import NimbusEmail, NimbusExperiment, QueuedEmail
 
 
 def nimbus_send_experiment_ending_email(experiment):
@@ -22,14 +21,11 @@ def nimbus_format_and_send_html_email(
 ):
     content = render_to_string(file_string, template_vars)
 
-    email = EmailMessage(
-        subject.format(name=experiment.name),
-        content,
-        settings.EMAIL_SENDER,
-        [experiment.owner.email],
-        cc=cc_recipients,
-    )
-    email.content_subtype = "html"
-    email.send(fail_silently=False)
-
-    NimbusEmail.objects.create(experiment=experiment, type=email_type)
+    with transaction.atomic():
+        QueuedEmail.objects.enqueue(
+            subject.format(name=experiment.name),
+            content,
+            [experiment.owner.email],
+            cc_recipients=cc_recipients,
+        )
+        NimbusEmail.objects.create(experiment=experiment, type=email_type)
@@ -2,7 +2,7 @@ import django_filters as filters
 import django_filters.widgets as widgets
 from django import forms
 from django.contrib.auth import get_user_model
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.db.models import F, IntegerField, Q
 from django.db.models.expressions import Func, Value
 from django.db.models.functions import Cast
@@ -154,30 +154,11 @@ class ExperimentFilterset(filters.FilterSet):
         )
 
     def filter_search(self, queryset, name, value):
-        vector = SearchVector(
-            "name",
-            "short_description",
-            "owner__email",
-            "analysis_owner__email",
-            "slug",
-            "related_work",
-            "addon_experiment_id",
-            "pref_name",
-            "public_description",
-            "objectives",
-            "analysis",
-            "engineering_owner",
-            "bugzilla_id",
-            "recipe_slug",
-            "data_science_issue_url",
-            "feature_bugzilla_url",
-        )
-
         query = SearchQuery(value)
 
         return (
-            queryset.annotate(rank=SearchRank(vector, query), search=vector)
-            .filter(search=value)
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
             .order_by("-rank")
         )
 
@@ -202,26 +183,26 @@ class ExperimentFilterset(filters.FilterSet):
         date_type = self.form.cleaned_data["experiment_date_field"]
         if date_type:
             experiment_date_field = {
-                Experiment.EXPERIMENT_STARTS: "start_date",
-                Experiment.EXPERIMENT_PAUSES: "enrollment_end_date",
-                Experiment.EXPERIMENT_ENDS: "end_date",
+                Experiment.EXPERIMENT_STARTS: "computed_start_date",
+                Experiment.EXPERIMENT_PAUSES: "computed_enrollment_end_date",
+                Experiment.EXPERIMENT_ENDS: "computed_end_date",
             }[date_type]
 
-            results = []
-
-            for experiment in queryset.all():
-                date = getattr(experiment, experiment_date_field)
-
-                # enrollment end dates are optional, so there won't always
-                # be a pause date for an experiment
-                if date:
-                    if value.start and date < value.start.date():
-                        continue
-                    if value.stop and date > value.stop.date():
-                        continue
-                    results.append(experiment.id)
+            # enrollment end dates are optional, so there won't always
+            # be a pause date for an experiment
+            queryset = queryset.annotate_dates().filter(
+                **{f"{experiment_date_field}__isnull": False}
+            )
+            if value.start:
+                queryset = queryset.filter(
+                    **{f"{experiment_date_field}__gte": value.start.date()}
+                )
+            if value.stop:
+                queryset = queryset.filter(
+                    **{f"{experiment_date_field}__lte": value.stop.date()}
+                )
 
-            return queryset.filter(pk__in=results)
+            return queryset
         return queryset
 
     def in_qa_filter(self, queryset, name, value):
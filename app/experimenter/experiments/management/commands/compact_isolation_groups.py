@@ -0,0 +1,92 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from experimenter.experiments.models import NimbusExperiment, NimbusIsolationGroup
+
+logger = logging.getLogger()
+
+
+class Command(BaseCommand):
+    help = "Reports bucket usage per isolation group and compacts isolation groups"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Only report bucket usage, do not move or delete anything",
+        )
+
+    def handle(self, *args, **options):
+        for isolation_group in NimbusIsolationGroup.objects.all():
+            self.report(isolation_group)
+
+        if not options["dry_run"]:
+            self.compact()
+
+    @staticmethod
+    def report(isolation_group):
+        gaps = isolation_group.free_gaps()
+        active = sum(r.count for r in isolation_group.active_bucket_ranges)
+        reclaimable = sum(r.count for r in isolation_group.reclaimable_bucket_ranges)
+        logger.info(
+            "{application} {namespace}: {active} active, {reclaimable} reclaimable, "
+            "{free} free of {total}, largest gap {largest}".format(
+                application=isolation_group.application,
+                namespace=isolation_group.namespace,
+                active=active,
+                reclaimable=reclaimable,
+                free=sum(count for _, count in gaps),
+                total=isolation_group.total,
+                largest=max([count for _, count in gaps], default=0),
+            )
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def compact():
+        """
+        Moves bucket ranges of unpublished experiments out of later isolation group
+        instances into gaps in earlier instances, and deletes instances that no
+        longer hold any bucket ranges.  Ranges of published experiments never move.
+        """
+        groups = {}
+        for isolation_group in NimbusIsolationGroup.objects.order_by("instance"):
+            groups.setdefault(
+                (isolation_group.application, isolation_group.name), []
+            ).append(isolation_group)
+
+        for isolation_groups in groups.values():
+            for index, isolation_group in enumerate(isolation_groups[1:], start=1):
+                relocatable_ranges = isolation_group.bucket_ranges.filter(
+                    experiment__status__in=NimbusExperiment.BUCKET_RELOCATABLE_STATUSES,
+                    experiment__publish_status__in=(
+                        NimbusExperiment.BUCKET_RELOCATABLE_PUBLISH_STATUSES
+                    ),
+                ).order_by("-count")
+
+                for bucket_range in relocatable_ranges:
+                    for earlier_group in isolation_groups[:index]:
+                        gap = earlier_group.best_fit_gap(bucket_range.count)
+                        if gap is not None:
+                            logger.info(
+                                "Moving {experiment} from {old} to {new}".format(
+                                    experiment=bucket_range.experiment,
+                                    old=isolation_group.namespace,
+                                    new=earlier_group.namespace,
+                                )
+                            )
+                            bucket_range.isolation_group = earlier_group
+                            bucket_range.start = gap[0]
+                            bucket_range.save()
+                            break
+
+                if not isolation_group.bucket_ranges.exists():
+                    logger.info(
+                        "Deleting empty {namespace}".format(
+                            namespace=isolation_group.namespace
+                        )
+                    )
+                    isolation_group.delete()
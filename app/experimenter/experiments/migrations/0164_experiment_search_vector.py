@@ -0,0 +1,76 @@
+# Generated by Django 3.1.7 on 2026-10-19 08:26
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+SEARCH_FIELDS = (
+    ("A", ("name", "slug", "recipe_slug")),
+    (
+        "B",
+        (
+            "short_description",
+            "public_description",
+            "owner__email",
+            "analysis_owner__email",
+            "bugzilla_id",
+        ),
+    ),
+    (
+        "C",
+        (
+            "addon_experiment_id",
+            "pref_name",
+            "objectives",
+            "analysis",
+            "related_work",
+            "engineering_owner",
+        ),
+    ),
+    ("D", ("data_science_issue_url", "feature_bugzilla_url")),
+)
+
+
+def populate_search_vector(apps, schema_editor):
+    Experiment = apps.get_model("experiments", "Experiment")
+    db_alias = schema_editor.connection.alias
+
+    vector = None
+    for weight, fields in SEARCH_FIELDS:
+        weighted = SearchVector(*fields, weight=weight)
+        vector = weighted if vector is None else vector + weighted
+
+    Experiment.objects.using(db_alias).update(
+        search_vector=Subquery(
+            Experiment.objects.using(db_alias)
+            .filter(id=OuterRef("id"))
+            .annotate(vector=vector)
+            .values("vector")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0163_nimbusexperiment_results_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experiment",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="experiment",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="experiments_search__e9a3c8_gin"
+            ),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.1.7 on 2026-10-19 08:33
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_latest_change(apps, schema_editor):
+    Experiment = apps.get_model("experiments", "Experiment")
+    ExperimentChangeLog = apps.get_model("experiments", "ExperimentChangeLog")
+    db_alias = schema_editor.connection.alias
+
+    Experiment.objects.using(db_alias).update(
+        latest_change=Subquery(
+            ExperimentChangeLog.objects.using(db_alias)
+            .filter(experiment=OuterRef("id"))
+            .order_by("-changed_on")
+            .values("changed_on")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0164_experiment_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experiment",
+            name="latest_change",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(populate_latest_change, migrations.RunPython.noop),
+    ]
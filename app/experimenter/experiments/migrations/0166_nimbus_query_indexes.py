@@ -0,0 +1,60 @@
+# Generated by Django 3.1.7 on 2026-10-19 08:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0165_experiment_latest_change"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="nimbuschangelog",
+            index=models.Index(
+                fields=["experiment", "-changed_on"], name="nimbus_changelog_latest_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nimbuschangelog",
+            index=models.Index(
+                fields=["experiment", "old_status", "new_status"],
+                name="nimbus_changelog_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nimbuschangelog",
+            index=models.Index(
+                fields=[
+                    "experiment",
+                    "new_publish_status",
+                    "old_publish_status",
+                    "-changed_on",
+                ],
+                name="nimbus_changelog_publish_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nimbusexperiment",
+            index=models.Index(
+                fields=["status", "application"], name="nimbus_exp_status_app_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nimbusexperiment",
+            index=models.Index(
+                condition=models.Q(("is_paused", False), ("status", "Live")),
+                fields=["application"],
+                name="nimbus_exp_live_unpaused_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nimbusexperiment",
+            index=models.Index(
+                condition=models.Q(("is_end_requested", True), ("status", "Live")),
+                fields=["application"],
+                name="nimbus_exp_end_requested_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.7 on 2026-10-19 09:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0167_queued_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="nimbusexperiment",
+            name="results_fingerprint",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
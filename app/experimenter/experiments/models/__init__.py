@@ -1,3 +1,7 @@
+from experimenter.experiments.models.email import (  # noqa: F401
+    QueuedEmail,
+    QueuedEmailManager,
+)
 from experimenter.experiments.models.legacy import (  # noqa: F401
     Experiment,
     ExperimentBucketNamespace,
@@ -9,6 +13,7 @@ from experimenter.experiments.models.legacy import (  # noqa: F401
     ExperimentConstants,
     ExperimentEmail,
     ExperimentManager,
+    ExperimentQuerySet,
     ExperimentVariant,
     Preference,
     RolloutPreference,
@@ -0,0 +1,69 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.core.mail.message import EmailMessage
+from django.db import models, transaction
+from django.utils import timezone
+
+
+class QueuedEmailManager(models.Manager):
+    def enqueue(self, subject, body, recipients, cc_recipients=None):
+        return self.create(
+            subject=subject,
+            body=body,
+            from_email=settings.EMAIL_SENDER,
+            to=list(recipients),
+            cc=list(cc_recipients or []),
+        )
+
+    def due(self):
+        return self.filter(next_attempt_on__lte=timezone.now())
+
+    def claim(self, count):
+        """
+        Locks up to count due emails just long enough to push their next
+        attempt EMAIL_OUTBOX_CLAIM_TIMEOUT seconds ahead, so they can be sent
+        outside of a transaction without other runs picking them up meanwhile.
+        The returned emails keep the next attempt they were claimed with.
+        """
+        with transaction.atomic():
+            emails = list(self.due().select_for_update(skip_locked=True)[:count])
+            self.filter(id__in=[email.id for email in emails]).update(
+                next_attempt_on=timezone.now()
+                + datetime.timedelta(seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT)
+            )
+        return emails
+
+
+class QueuedEmail(models.Model):
+    subject = models.TextField()
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = ArrayField(models.CharField(max_length=255))
+    cc = ArrayField(models.CharField(max_length=255), default=list)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_on = models.DateTimeField(default=timezone.now, db_index=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    objects = QueuedEmailManager()
+
+    class Meta:
+        verbose_name = "Queued Email"
+        verbose_name_plural = "Queued Emails"
+        ordering = ("next_attempt_on",)
+
+    def __str__(self):
+        return f"Queued Email: {self.subject}"
+
+    def as_message(self, connection=None):
+        message = EmailMessage(
+            self.subject,
+            self.body,
+            self.from_email,
+            self.to,
+            cc=self.cc,
+            connection=connection,
+        )
+        message.content_subtype = "html"
+        return message
@@ -8,10 +8,24 @@ from urllib.parse import urljoin
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxValueValidator
 from django.db import models
-from django.db.models import JSONField, Max
+from django.db.models import (
+    Case,
+    DateField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    JSONField,
+    OuterRef,
+    Q,
+    Subquery,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, TruncDate
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -26,10 +40,65 @@ def default_all_platforms():
     return ExperimentConstants.PLATFORMS_LIST
 
 
-class ExperimentManager(models.Manager):
-    def get_queryset(self):
-        return super().get_queryset().annotate(latest_change=Max("changes__changed_on"))
+class ExperimentQuerySet(models.QuerySet):
+    def _change_date(self, **filters):
+        return Subquery(
+            ExperimentChangeLog.objects.filter(experiment=OuterRef("pk"), **filters)
+            .order_by("changed_on")
+            .values(date=TruncDate("changed_on"))[:1],
+            output_field=DateField(),
+        )
+
+    def _offset_date(self, date, duration):
+        # Mirrors Experiment._compute_end_date
+        return Case(
+            When(
+                **{
+                    f"{duration}__gt": 0,
+                    f"{duration}__lte": Experiment.MAX_DURATION,
+                },
+                then=Cast(
+                    F(date)
+                    + ExpressionWrapper(
+                        F(duration) * datetime.timedelta(days=1),
+                        output_field=DurationField(),
+                    ),
+                    output_field=DateField(),
+                ),
+            ),
+            output_field=DateField(),
+        )
+
+    def annotate_dates(self):
+        """
+        Annotates the start, enrollment end and end dates that the
+        Experiment properties of the same names compute in Python, so they
+        can be filtered and ordered on in the database.
+        """
+        return self.annotate(
+            computed_start_date=Coalesce(
+                self._change_date(
+                    old_status=Experiment.STATUS_ACCEPTED,
+                    new_status=Experiment.STATUS_LIVE,
+                ),
+                "proposed_start_date",
+            )
+        ).annotate(
+            computed_enrollment_end_date=Coalesce(
+                self._change_date(message="Enrollment Complete"),
+                self._offset_date("computed_start_date", "proposed_enrollment"),
+            ),
+            computed_end_date=Coalesce(
+                self._change_date(
+                    old_status=Experiment.STATUS_LIVE,
+                    new_status=Experiment.STATUS_COMPLETE,
+                ),
+                self._offset_date("computed_start_date", "proposed_duration"),
+            ),
+        )
 
+
+class ExperimentManager(models.Manager.from_queryset(ExperimentQuerySet)):
     def get_prefetched(self):
         return self.get_queryset().prefetch_related(
             "changes__changed_by",
@@ -262,6 +331,11 @@ class Experiment(ExperimentConstants, models.Model):
     is_paused = models.BooleanField(default=False)
     is_high_population = models.BooleanField(default=False)
 
+    # Denormalized from the changelog so lists can be ordered without a join
+    latest_change = models.DateTimeField(
+        blank=True, null=True, editable=False, db_index=True
+    )
+
     # results fields
     results_url = models.URLField(blank=True, null=True)
     results_initial = models.TextField(blank=True, null=True)
@@ -281,11 +355,41 @@ class Experiment(ExperimentConstants, models.Model):
     results_measure_impact = models.BooleanField(default=None, blank=True, null=True)
     results_impact_notes = models.TextField(blank=True, null=True)
 
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+
     objects = ExperimentManager()
 
     class Meta:
         verbose_name = "Experiment"
         verbose_name_plural = "Experiments"
+        indexes = [GinIndex(fields=["search_vector"])]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.clear_change_dates()
+        self.update_denormalized_fields()
+
+    def update_denormalized_fields(self):
+        # The owner emails and changes live on other tables, so these are
+        # computed in subqueries rather than from the instance.  This also
+        # undoes a stale latest_change written by the save above.
+        vector = None
+        for weight, fields in self.SEARCH_FIELDS:
+            weighted = SearchVector(*fields, weight=weight)
+            vector = weighted if vector is None else vector + weighted
+
+        Experiment.objects.filter(id=self.id).update(
+            search_vector=Subquery(
+                Experiment.objects.filter(id=OuterRef("id"))
+                .annotate(vector=vector)
+                .values("vector")[:1]
+            ),
+            latest_change=Subquery(
+                ExperimentChangeLog.objects.filter(experiment=OuterRef("id"))
+                .order_by("-changed_on")
+                .values("changed_on")[:1]
+            ),
+        )
 
     def get_absolute_url(self):
         return reverse("experiments-detail", kwargs={"slug": self.slug})
@@ -426,10 +530,33 @@ class Experiment(ExperimentConstants, models.Model):
             or self.feature_bugzilla_url
         )
 
-    def _transition_date(self, old_status, new_status):
+    @cached_property
+    def _change_dates(self):
+        # A single pass over the changelog serves every date property, and
+        # with get_prefetched() it doesn't query at all.
+        transitions = {}
+        messages = {}
         for change in self.changes.all():
-            if change.old_status == old_status and change.new_status == new_status:
-                return change.changed_on.date()
+            changed_on = change.changed_on.date()
+            transitions.setdefault((change.old_status, change.new_status), changed_on)
+            messages.setdefault(change.message, changed_on)
+        return transitions, messages
+
+    def clear_change_dates(self):
+        # The dates are read from the changelog, so they are computed again
+        # the next time they are used after it, or the experiment, changes.
+        # The prefetched objects are replaced rather than changed in place,
+        # as a clone still shares them with the experiment it was copied from.
+        self.__dict__.pop("_change_dates", None)
+        prefetched = getattr(self, "_prefetched_objects_cache", {})
+        if "changes" in prefetched:
+            self._prefetched_objects_cache = {
+                name: objects for name, objects in prefetched.items() if name != "changes"
+            }
+
+    def _transition_date(self, old_status, new_status):
+        transitions, _ = self._change_dates
+        return transitions.get((old_status, new_status))
 
     @property
     def start_date(self):
@@ -464,9 +591,9 @@ class Experiment(ExperimentConstants, models.Model):
 
     @property
     def enrollment_end_date(self):
-        changes = self.changes.filter(message="Enrollment Complete")
-        if changes:
-            return changes[0].changed_on.date()
+        _, messages = self._change_dates
+        if "Enrollment Complete" in messages:
+            return messages["Enrollment Complete"]
         if self.proposed_enrollment:
             return self._compute_end_date(self.proposed_enrollment)
 
@@ -958,6 +1085,7 @@ class Experiment(ExperimentConstants, models.Model):
     def clone(self, name, user):
 
         cloned = copy.copy(self)
+        cloned.clear_change_dates()
         variants = ExperimentVariant.objects.filter(experiment=self)
 
         set_to_none_fields = [
@@ -1206,6 +1334,18 @@ class ExperimentChangeLog(models.Model):
         verbose_name_plural = "Experiment Change Logs"
         ordering = ("changed_on",)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        Experiment.objects.filter(
+            Q(latest_change__isnull=True) | Q(latest_change__lt=self.changed_on),
+            id=self.experiment_id,
+        ).update(latest_change=self.changed_on)
+
+        if ExperimentChangeLog.experiment.is_cached(self):
+            self.experiment.refresh_from_db(fields=["latest_change"])
+            self.experiment.clear_change_dates()
+
     def __str__(self):
         if self.message:
             return self.message
@@ -1,4 +1,5 @@
 import datetime
+import functools
 import time
 from decimal import Decimal
 from urllib.parse import urljoin
@@ -9,9 +10,20 @@ from django.contrib.postgres.fields import ArrayField
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxValueValidator
 from django.db import models
-from django.db.models import Q
+from django.db.models import (
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import TruncDate
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import cached_property
 
 from experimenter.experiments.constants import NimbusConstants
 from experimenter.projects.models import Project
@@ -38,6 +50,44 @@ class NimbusExperimentManager(models.Manager):
             is_end_requested=True,
         )
 
+    def ending_email_queue(self, application):
+        """
+        Live experiments that are past their proposed end date, worked out
+        in the database the way should_end does, and haven't been sent an
+        ending email yet.
+        """
+        start_date = Subquery(
+            NimbusChangeLog.objects.filter(
+                experiment=OuterRef("pk"),
+                old_status=NimbusExperiment.Status.ACCEPTED,
+                new_status=NimbusExperiment.Status.LIVE,
+            )
+            .order_by("changed_on")
+            .values("changed_on")[:1],
+            output_field=DateTimeField(),
+        )
+        return (
+            self.annotate(
+                computed_proposed_end_date=TruncDate(
+                    ExpressionWrapper(
+                        start_date
+                        + ExpressionWrapper(
+                            F("proposed_duration") * datetime.timedelta(days=1),
+                            output_field=DurationField(),
+                        ),
+                        output_field=DateTimeField(),
+                    )
+                )
+            )
+            .filter(
+                status=NimbusExperiment.Status.LIVE,
+                application=application,
+                proposed_duration__gt=0,
+                computed_proposed_end_date__lte=datetime.date.today(),
+            )
+            .exclude(emails__type=NimbusExperiment.EmailType.EXPERIMENT_END)
+        )
+
 
 class NimbusExperiment(NimbusConstants, models.Model):
     owner = models.ForeignKey(
@@ -100,12 +150,32 @@ class NimbusExperiment(NimbusConstants, models.Model):
     reference_branch = models.OneToOneField(
         "NimbusBranch", blank=True, null=True, on_delete=models.CASCADE
     )
+    results_data = models.JSONField(encoder=DjangoJSONEncoder, blank=True, null=True)
+    results_fingerprint = models.CharField(max_length=64, blank=True, null=True)
 
     objects = NimbusExperimentManager()
 
     class Meta:
         verbose_name = "Nimbus Experiment"
         verbose_name_plural = "Nimbus Experiments"
+        indexes = [
+            # launch_queue and the kinto status checks
+            models.Index(
+                name="nimbus_exp_status_app_idx", fields=["status", "application"]
+            ),
+            # pause_queue
+            models.Index(
+                name="nimbus_exp_live_unpaused_idx",
+                fields=["application"],
+                condition=Q(status=NimbusConstants.Status.LIVE, is_paused=False),
+            ),
+            # end_queue
+            models.Index(
+                name="nimbus_exp_end_requested_idx",
+                fields=["application"],
+                condition=Q(status=NimbusConstants.Status.LIVE, is_end_requested=True),
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -260,9 +330,15 @@ class NimbusExperiment(NimbusConstants, models.Model):
             ),
         )
 
+    @cached_property
+    def latest_review_changes(self):
+        return NimbusChangeLog.objects.latest_review_changes([self])[self.id]
+
     def can_review(self, reviewer):
         if self.publish_status == NimbusExperiment.PublishStatus.REVIEW:
-            review_request = self.changes.latest_review_request()
+            review_request = self.latest_review_changes[
+                NimbusChangeLog.objects.REVIEW_REQUEST
+            ]
             return review_request and review_request.changed_by != reviewer
         return False
 
@@ -339,30 +415,46 @@ class NimbusIsolationGroup(models.Model):
 
     @classmethod
     def request_isolation_group_buckets(cls, name, experiment, count):
-        query = cls.objects.filter(name=name, application=experiment.application)
-        if query.exists():
-            isolation_group = query.order_by("-instance").first()
-        else:
-            isolation_group = cls.objects.create(
-                name=name, application=experiment.application
+        isolation_groups = list(
+            cls.objects.filter(name=name, application=experiment.application).order_by(
+                "instance"
             )
+        )
+        if not isolation_groups:
+            isolation_groups = [
+                cls.objects.create(name=name, application=experiment.application)
+            ]
 
-        return isolation_group.request_buckets(experiment, count)
+        best_fit = None
+        for isolation_group in isolation_groups:
+            gap = isolation_group.best_fit_gap(count)
+            if gap is not None and (best_fit is None or gap[1] < best_fit[2]):
+                best_fit = (isolation_group, *gap)
+
+        if best_fit is None:
+            return isolation_groups[-1].request_buckets(experiment, count)
+
+        isolation_group, start, _ = best_fit
+        return NimbusBucketRange.objects.create(
+            experiment=experiment,
+            isolation_group=isolation_group,
+            start=start,
+            count=count,
+        )
 
     def request_buckets(self, experiment, count):
         isolation_group = self
         start = 0
 
-        if self.bucket_ranges.exists():
-            highest_bucket = self.bucket_ranges.all().order_by("-start").first()
-            if highest_bucket.end + count > self.total:
-                isolation_group = NimbusIsolationGroup.objects.create(
-                    name=self.name,
-                    application=experiment.application,
-                    instance=self.instance + 1,
-                )
-            else:
-                start = highest_bucket.end + 1
+        gap = self.best_fit_gap(count)
+        if gap is None:
+            isolation_group = NimbusIsolationGroup.objects.create(
+                name=self.name,
+                application=experiment.application,
+                instance=self.instance + 1,
+            )
+        else:
+            start, _ = gap
 
         return NimbusBucketRange.objects.create(
             experiment=experiment,
@@ -371,6 +463,47 @@ class NimbusIsolationGroup(models.Model):
             count=count,
         )
 
+    @property
+    def active_bucket_ranges(self):
+        return self.bucket_ranges.exclude(
+            experiment__status__in=NimbusExperiment.BUCKET_RECLAIMABLE_STATUSES
+        ).order_by("start")
+
+    @property
+    def reclaimable_bucket_ranges(self):
+        return self.bucket_ranges.filter(
+            experiment__status__in=NimbusExperiment.BUCKET_RECLAIMABLE_STATUSES
+        ).order_by("start")
+
+    def free_gaps(self):
+        """
+        Returns the (start, count) of every contiguous run of buckets that is not
+        held by an active bucket range, in bucket order.  Ranges held by
+        experiments that have completed are considered free.
+        """
+        gaps = []
+        cursor = 0
+        for start, count in self.active_bucket_ranges.values_list("start", "count"):
+            if start > cursor:
+                gaps.append((cursor, start - cursor))
+            cursor = max(cursor, start + count)
+
+        if cursor < self.total:
+            gaps.append((cursor, self.total - cursor))
+
+        return gaps
+
+    def best_fit_gap(self, count):
+        """
+        Returns the smallest free gap that can hold count buckets,
+        or None if the isolation group can not hold them.
+        """
+        best_fit = None
+        for gap in self.free_gaps():
+            if gap[1] >= count and (best_fit is None or gap[1] < best_fit[1]):
+                best_fit = gap
+        return best_fit
+
 
 class NimbusBucketRange(models.Model):
     experiment = models.OneToOneField(
@@ -423,37 +556,29 @@ class NimbusFeatureConfig(models.Model):
 
 
 class NimbusChangeLogManager(models.Manager):
-    def latest_review_request(self):
-        return (
-            self.all()
-            .filter(
+    REVIEW_REQUEST = "review_request"
+    REJECTION = "rejection"
+    TIMEOUT = "timeout"
+
+    @staticmethod
+    def _review_conditions():
+        return {
+            NimbusChangeLogManager.REVIEW_REQUEST: Q(
                 old_status=NimbusExperiment.Status.DRAFT,
                 old_publish_status=NimbusExperiment.PublishStatus.IDLE,
                 new_status=NimbusExperiment.Status.DRAFT,
                 new_publish_status=NimbusExperiment.PublishStatus.REVIEW,
-            )
-            .order_by("-changed_on")
-        ).first()
-
-    def latest_rejection(self):
-        return (
-            self.all()
-            .filter(
+            ),
+            NimbusChangeLogManager.REJECTION: (
                 Q(old_publish_status=NimbusExperiment.PublishStatus.REVIEW)
-                | Q(old_publish_status=NimbusExperiment.PublishStatus.WAITING),
+                | Q(old_publish_status=NimbusExperiment.PublishStatus.WAITING)
             )
-            .filter(
+            & Q(
                 old_status=NimbusExperiment.Status.DRAFT,
                 new_status=NimbusExperiment.Status.DRAFT,
                 new_publish_status=NimbusExperiment.PublishStatus.IDLE,
-            )
-            .order_by("-changed_on")
-        ).first()
-
-    def latest_timeout(self):
-        return (
-            self.all()
-            .filter(
+            ),
+            NimbusChangeLogManager.TIMEOUT: (
                 Q(
                     old_status=NimbusExperiment.Status.DRAFT,
                     new_status=NimbusExperiment.Status.DRAFT,
@@ -463,13 +588,54 @@ class NimbusChangeLogManager(models.Manager):
                     new_status=NimbusExperiment.Status.LIVE,
                 )
             )
-            .filter(
+            & Q(
                 old_publish_status=NimbusExperiment.PublishStatus.WAITING,
                 new_publish_status=NimbusExperiment.PublishStatus.REVIEW,
-            )
-            .order_by("-changed_on")
+            ),
+        }
+
+    def _latest(self, kind):
+        return (
+            self.all().filter(self._review_conditions()[kind]).order_by("-changed_on")
         ).first()
 
+    def latest_review_request(self):
+        return self._latest(self.REVIEW_REQUEST)
+
+    def latest_rejection(self):
+        return self._latest(self.REJECTION)
+
+    def latest_timeout(self):
+        return self._latest(self.TIMEOUT)
+
+    def latest_review_changes(self, experiments):
+        """
+        The latest review request, rejection and timeout of every experiment,
+        keyed by experiment id, in a single query.
+        """
+        conditions = self._review_conditions()
+        latest_changes = {
+            experiment.id: dict.fromkeys(conditions) for experiment in experiments
+        }
+
+        # One DISTINCT ON query per kind keeps the latest change of each
+        # experiment, each reading its own range of nimbus_changelog_publish_idx,
+        # and UNION ALL sends them as a single query.
+        changes = functools.reduce(
+            lambda combined, queryset: combined.union(queryset, all=True),
+            [
+                self.filter(condition, experiment__in=latest_changes.keys())
+                .annotate(kind=Value(kind, output_field=models.CharField()))
+                .order_by("experiment_id", "-changed_on")
+                .distinct("experiment_id")
+                for kind, condition in conditions.items()
+            ],
+        )
+        for change in changes:
+            latest_changes[change.experiment_id][change.kind] = change
+
+        return latest_changes
+
 
 class NimbusChangeLog(models.Model):
     def current_datetime():
@@ -504,6 +670,27 @@ class NimbusChangeLog(models.Model):
         verbose_name = "Nimbus Experiment Change Log"
         verbose_name_plural = "Nimbus Experiment Change Logs"
         ordering = ("changed_on",)
+        indexes = [
+            # latest_change
+            models.Index(
+                name="nimbus_changelog_latest_idx", fields=["experiment", "-changed_on"]
+            ),
+            # start_date and end_date
+            models.Index(
+                name="nimbus_changelog_status_idx",
+                fields=["experiment", "old_status", "new_status"],
+            ),
+            # latest_review_request, latest_rejection and latest_timeout
+            models.Index(
+                name="nimbus_changelog_publish_idx",
+                fields=[
+                    "experiment",
+                    "new_publish_status",
+                    "old_publish_status",
+                    "-changed_on",
+                ],
+            ),
+        ]
 
     def __str__(self):
         if self.message:
@@ -0,0 +1,73 @@
+import datetime
+import smtplib
+
+import markus
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.core.mail import get_connection
+from django.utils import timezone
+
+from experimenter.celery import app
+from experimenter.experiments.models import QueuedEmail
+
+logger = get_task_logger(__name__)
+metrics = markus.get_metrics("experiments.tasks")
+
+# Errors the mail server raises for a single message, anything else is taken
+# to be a problem with the connection that every remaining message would share
+MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+@app.task
+@metrics.timer_decorator("send_queued_emails.timing")
+def send_queued_emails():
+    """
+    Sends up to EMAIL_OUTBOX_BATCH_SIZE queued emails that are due over a
+    single mail server connection. The emails are claimed in a short
+    transaction and sent after it commits, and if the connection fails the
+    emails that were not sent stay due for the next run.
+    """
+    metrics.incr("send_queued_emails.started")
+
+    emails = QueuedEmail.objects.claim(settings.EMAIL_OUTBOX_BATCH_SIZE)
+    sent = 0
+    if emails:
+        try:
+            with get_connection(fail_silently=False) as connection:
+                for email in emails:
+                    send_queued_email(connection, email)
+                    sent += 1
+        except (smtplib.SMTPException, OSError) as e:
+            metrics.incr("send_queued_emails.connection_failed")
+            logger.error(f"Mail server connection failed: {e}")
+            # A connection error says nothing about the emails themselves, so
+            # the ones that were not sent get their next attempt back.
+            QueuedEmail.objects.bulk_update(emails[sent:], ["next_attempt_on"])
+
+    metrics.incr("send_queued_emails.completed")
+
+
+def send_queued_email(connection, email):
+    try:
+        email.as_message(connection).send()
+    except MESSAGE_ERRORS as e:
+        email.attempts += 1
+        if email.attempts < settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.next_attempt_on = timezone.now() + datetime.timedelta(
+                minutes=2 ** email.attempts
+            )
+            email.save(update_fields=["attempts", "next_attempt_on"])
+            metrics.incr("send_queued_emails.retried")
+            logger.info(f"Retrying {email} after attempt {email.attempts}: {e}")
+            return
+
+        metrics.incr("send_queued_emails.failed")
+        logger.error(f"Failed {email} after {email.attempts} attempts: {e}")
+    else:
+        metrics.incr("send_queued_emails.sent")
+
+    email.delete()
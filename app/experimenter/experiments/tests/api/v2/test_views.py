@@ -17,6 +17,7 @@ from experimenter.experiments.api.v2.serializers import (
 from experimenter.experiments.api.v2.views import ExperimentCSVRenderer
 from experimenter.experiments.constants import ExperimentConstants
 from experimenter.experiments.models import Experiment
+from experimenter.experiments.tasks import send_queued_emails
 from experimenter.experiments.tests.factories import (
     ExperimentFactory,
     ExperimentVariantFactory,
@@ -47,6 +48,7 @@ class TestExperimentSendIntentToShipEmailView(TestCase):
 
         experiment = Experiment.objects.get(pk=experiment.pk)
         self.assertEqual(experiment.review_intent_to_ship, True)
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), old_outbox_len + 1)
 
     def test_put_raises_409_if_email_already_sent(self):
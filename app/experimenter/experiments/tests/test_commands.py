@@ -0,0 +1,90 @@
+from django.core.management import call_command
+from django.test import TestCase
+
+from experimenter.experiments.models import NimbusExperiment, NimbusIsolationGroup
+from experimenter.experiments.tests.factories import (
+    NimbusBucketRangeFactory,
+    NimbusExperimentFactory,
+    NimbusIsolationGroupFactory,
+)
+
+
+class TestCompactIsolationGroups(TestCase):
+    def setUp(self):
+        self.first_group = NimbusIsolationGroupFactory.create(
+            name="group", instance=1, total=200
+        )
+        self.second_group = NimbusIsolationGroupFactory.create(
+            name="group", instance=2, total=200
+        )
+        NimbusBucketRangeFactory.create(
+            experiment=NimbusExperimentFactory.create(
+                status=NimbusExperiment.Status.COMPLETE
+            ),
+            isolation_group=self.first_group,
+            start=0,
+            count=100,
+        )
+        NimbusBucketRangeFactory.create(
+            experiment=NimbusExperimentFactory.create(
+                status=NimbusExperiment.Status.LIVE
+            ),
+            isolation_group=self.first_group,
+            start=100,
+            count=100,
+        )
+
+    def test_moves_unpublished_range_and_deletes_empty_instance(self):
+        bucket_range = NimbusBucketRangeFactory.create(
+            experiment=NimbusExperimentFactory.create(
+                status=NimbusExperiment.Status.DRAFT,
+                publish_status=NimbusExperiment.PublishStatus.IDLE,
+            ),
+            isolation_group=self.second_group,
+            start=0,
+            count=100,
+        )
+
+        call_command("compact_isolation_groups")
+
+        bucket_range.refresh_from_db()
+        self.assertEqual(bucket_range.isolation_group, self.first_group)
+        self.assertEqual(bucket_range.start, 0)
+        self.assertFalse(
+            NimbusIsolationGroup.objects.filter(id=self.second_group.id).exists()
+        )
+
+    def test_does_not_move_published_range(self):
+        bucket_range = NimbusBucketRangeFactory.create(
+            experiment=NimbusExperimentFactory.create(
+                status=NimbusExperiment.Status.LIVE
+            ),
+            isolation_group=self.second_group,
+            start=0,
+            count=100,
+        )
+
+        call_command("compact_isolation_groups")
+
+        bucket_range.refresh_from_db()
+        self.assertEqual(bucket_range.isolation_group, self.second_group)
+        self.assertTrue(
+            NimbusIsolationGroup.objects.filter(id=self.second_group.id).exists()
+        )
+
+    def test_dry_run_does_not_change_anything(self):
+        bucket_range = NimbusBucketRangeFactory.create(
+            experiment=NimbusExperimentFactory.create(
+                status=NimbusExperiment.Status.DRAFT,
+                publish_status=NimbusExperiment.PublishStatus.IDLE,
+            ),
+            isolation_group=self.second_group,
+            start=0,
+            count=100,
+        )
+
+        call_command("compact_isolation_groups", "--dry-run")
+
+        bucket_range.refresh_from_db()
+        self.assertEqual(bucket_range.isolation_group, self.second_group)
+        self.assertEqual(NimbusIsolationGroup.objects.count(), 2)
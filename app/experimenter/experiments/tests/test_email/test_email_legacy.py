@@ -12,7 +12,10 @@ from experimenter.experiments.email import (
     send_experiment_ending_email,
     send_experiment_launch_email,
     send_intent_to_ship_email,
+    send_period_ending_emails,
 )
+from experimenter.experiments.models import Experiment, ExperimentEmail
+from experimenter.experiments.tasks import send_queued_emails
 from experimenter.experiments.tests.factories import (
     ExperimentChangeLogFactory,
     ExperimentCommentFactory,
@@ -42,6 +45,7 @@ class TestIntentToShipEmail(TestCase):
 
         with self.settings(EMAIL_SENDER=sender, EMAIL_RELEASE_DRIVERS=release_drivers):
             send_intent_to_ship_email(experiment.id)
+            send_queued_emails()
 
         bug_url = settings.BUGZILLA_DETAIL_URL.format(id=experiment.bugzilla_id)
         expected_locales = self.format_locales(experiment)
@@ -59,7 +63,7 @@ class TestIntentToShipEmail(TestCase):
                 [
                     release_drivers,
                     experiment.owner.email,
-                    experiment.analysis_owner,
+                    experiment.analysis_owner.email,
                     "smith@example.com",
                 ]
             ),
@@ -97,6 +101,7 @@ class TestIntentToShipEmail(TestCase):
 
         with self.settings(EMAIL_SENDER=sender, EMAIL_RELEASE_DRIVERS=release_drivers):
             send_intent_to_ship_email(experiment.id)
+            send_queued_emails()
 
         bug_url = settings.BUGZILLA_DETAIL_URL.format(id=experiment.bugzilla_id)
         expected_locales = self.format_locales(experiment)
@@ -120,7 +125,7 @@ class TestIntentToShipEmail(TestCase):
                 [
                     release_drivers,
                     experiment.owner.email,
-                    experiment.analysis_owner,
+                    experiment.analysis_owner.email,
                     "smith@example.com",
                 ]
             ),
@@ -161,6 +166,7 @@ class TestStatusUpdateEmail(TestCase):
 
     def test_send_experiment_launch_email(self):
         send_experiment_launch_email(self.experiment)
+        send_queued_emails()
 
         sent_email = mail.outbox[-1]
 
@@ -179,7 +185,7 @@ class TestStatusUpdateEmail(TestCase):
             sent_email.recipients(),
             [
                 self.experiment.owner.email,
-                self.experiment.analysis_owner,
+                self.experiment.analysis_owner.email,
                 self.subscribing_user.email,
             ],
         )
@@ -191,6 +197,7 @@ class TestStatusUpdateEmail(TestCase):
         self.experiment.save()
 
         send_experiment_launch_email(self.experiment)
+        send_queued_emails()
 
         sent_email = mail.outbox[-1]
 
@@ -212,6 +219,7 @@ class TestStatusUpdateEmail(TestCase):
 
     def test_send_experiment_ending_email(self):
         send_experiment_ending_email(self.experiment)
+        send_queued_emails()
 
         sent_email = mail.outbox[-1]
 
@@ -229,7 +237,7 @@ class TestStatusUpdateEmail(TestCase):
             sent_email.recipients(),
             [
                 self.experiment.owner.email,
-                self.experiment.analysis_owner,
+                self.experiment.analysis_owner.email,
                 self.subscribing_user.email,
             ],
         )
@@ -237,6 +245,7 @@ class TestStatusUpdateEmail(TestCase):
 
     def test_send_experiment_pausing_email(self):
         send_enrollment_pause_email(self.experiment)
+        send_queued_emails()
 
         sent_email = mail.outbox[-1]
 
@@ -257,7 +266,7 @@ class TestStatusUpdateEmail(TestCase):
             sent_email.recipients(),
             [
                 self.experiment.owner.email,
-                self.experiment.analysis_owner,
+                self.experiment.analysis_owner.email,
                 self.subscribing_user.email,
             ],
         )
@@ -270,6 +279,7 @@ class TestStatusUpdateEmail(TestCase):
         user = UserFactory.create(email="u1@example.com")
         comment = ExperimentCommentFactory.create(experiment=experiment, created_by=user)
         send_experiment_comment_email(comment)
+        send_queued_emails()
         sent_email = mail.outbox[-1]
 
         expected_subject = (
@@ -289,6 +299,7 @@ class TestStatusUpdateEmail(TestCase):
         user = UserFactory.create(email="u1@example.com")
         change = ExperimentChangeLogFactory.create(experiment=experiment, changed_by=user)
         send_experiment_change_email(change)
+        send_queued_emails()
         sent_email = mail.outbox[-1]
 
         expected_subject = (
@@ -299,3 +310,69 @@ class TestStatusUpdateEmail(TestCase):
         self.assertTrue(
             experiment.emails.filter(type=ExperimentConstants.EXPERIMENT_EDIT).exists()
         )
+
+
+class TestSendPeriodEndingEmails(TestCase):
+    def create_experiment(self, proposed_duration, proposed_enrollment):
+        return ExperimentFactory.create(
+            status=Experiment.STATUS_LIVE,
+            proposed_start_date=date.today(),
+            proposed_duration=proposed_duration,
+            proposed_enrollment=proposed_enrollment,
+        )
+
+    def test_sends_due_emails_that_were_not_sent(self):
+        ending_and_pausing = self.create_experiment(4, 2)
+        pausing = self.create_experiment(30, 5)
+        later = self.create_experiment(30, 10)
+
+        send_period_ending_emails([ending_and_pausing.id, pausing.id, later.id])
+
+        self.assertEqual(
+            set(ending_and_pausing.emails.values_list("type", flat=True)),
+            {ExperimentConstants.EXPERIMENT_ENDS, ExperimentConstants.EXPERIMENT_PAUSES},
+        )
+        self.assertEqual(
+            list(pausing.emails.values_list("type", flat=True)),
+            [ExperimentConstants.EXPERIMENT_PAUSES],
+        )
+        self.assertFalse(later.emails.exists())
+
+    def test_does_not_resend_emails(self):
+        experiment = self.create_experiment(4, 2)
+        ExperimentEmail.objects.create(
+            experiment=experiment, type=ExperimentConstants.EXPERIMENT_ENDS
+        )
+
+        send_period_ending_emails([experiment.id])
+
+        self.assertEqual(
+            list(
+                experiment.emails.exclude(
+                    type=ExperimentConstants.EXPERIMENT_ENDS
+                ).values_list("type", flat=True)
+            ),
+            [ExperimentConstants.EXPERIMENT_PAUSES],
+        )
+        self.assertEqual(
+            experiment.emails.filter(type=ExperimentConstants.EXPERIMENT_ENDS).count(), 1
+        )
+
+    def test_only_sends_for_given_experiments(self):
+        experiment = self.create_experiment(4, 2)
+
+        send_period_ending_emails([])
+
+        self.assertFalse(experiment.emails.exists())
+
+    def test_finds_nothing_to_send_in_one_query(self):
+        experiments = [self.create_experiment(4, 2) for _ in range(5)]
+        for experiment in experiments:
+            for email_type in (
+                ExperimentConstants.EXPERIMENT_ENDS,
+                ExperimentConstants.EXPERIMENT_PAUSES,
+            ):
+                ExperimentEmail.objects.create(experiment=experiment, type=email_type)
+
+        with self.assertNumQueries(1):
+            send_period_ending_emails([experiment.id for experiment in experiments])
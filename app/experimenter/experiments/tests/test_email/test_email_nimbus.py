@@ -5,6 +5,7 @@ from django.test import TestCase
 
 from experimenter.experiments.email import nimbus_send_experiment_ending_email
 from experimenter.experiments.models import NimbusExperiment
+from experimenter.experiments.tasks import send_queued_emails
 from experimenter.experiments.tests.factories import NimbusExperimentFactory
 
 
@@ -20,6 +21,7 @@ class TestNimbusEmail(TestCase):
         ).update(changed_on=datetime.datetime.now() - datetime.timedelta(days=10))
 
         nimbus_send_experiment_ending_email(experiment)
+        send_queued_emails()
 
         sent_email = mail.outbox[-1]
 
@@ -222,6 +222,32 @@ class TestExperimentFilterset(MockRequestMixin, TestCase):
         self.assertEqual(set(first_response_context["experiments"]), set([exp_1, exp_2]))
         self.assertEqual(set(second_response_context["experiments"]), set([exp_3]))
 
+    def test_search_ranks_by_field_weight(self):
+        in_objectives = ExperimentFactory.create(
+            name="Experiment One", objectives="Learn about the toolbar"
+        )
+        in_name = ExperimentFactory.create(name="Toolbar Experiment", objectives="")
+        ExperimentFactory.create(name="Experiment Three", objectives="")
+
+        filter = ExperimentFilterset(
+            {"search": "toolbar"}, request=self.request, queryset=Experiment.objects.all()
+        )
+
+        self.assertEqual(list(filter.qs), [in_name, in_objectives])
+
+    def test_search_matches_owner_email(self):
+        owner = UserFactory.create(email="searchable-owner@example.com")
+        experiment = ExperimentFactory.create(owner=owner)
+        ExperimentFactory.create()
+
+        filter = ExperimentFilterset(
+            {"search": "searchable-owner@example.com"},
+            request=self.request,
+            queryset=Experiment.objects.all(),
+        )
+
+        self.assertEqual(list(filter.qs), [experiment])
+
     def test_filters_by_review_in_qa(self):
         exp_1 = ExperimentFactory.create_with_variants(
             review_qa_requested=True, review_qa=False
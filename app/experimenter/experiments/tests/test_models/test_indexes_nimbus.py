@@ -0,0 +1,143 @@
+import itertools
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from parameterized import parameterized
+
+from experimenter.experiments.models import NimbusChangeLog, NimbusExperiment
+from experimenter.experiments.tests.factories import NimbusExperimentFactory
+from experimenter.openidc.tests.factories import UserFactory
+
+
+class TestNimbusIndexes(TestCase):
+    """
+    Checks the query plans of the hot Nimbus queries against their indexes.
+    The seeded tables are small enough that Postgres would otherwise prefer a
+    sequential scan, so those are disabled for the duration of each test.
+    """
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        for status in (
+            NimbusExperiment.Status.DRAFT,
+            NimbusExperiment.Status.REVIEW,
+            NimbusExperiment.Status.LIVE,
+            NimbusExperiment.Status.COMPLETE,
+        ):
+            NimbusExperimentFactory.create_with_status(status)
+
+        # Shaped like a real changelog, most changes are publish status changes
+        # of a draft and a few are status transitions.
+        self.experiment = NimbusExperiment.objects.first()
+        user = UserFactory.create()
+        changes = [
+            (
+                NimbusExperiment.Status.DRAFT,
+                NimbusExperiment.Status.DRAFT,
+                old_publish_status,
+                new_publish_status,
+            )
+            for old_publish_status, new_publish_status in itertools.product(
+                NimbusExperiment.PublishStatus, repeat=2
+            )
+        ] * 10 + [
+            (
+                old_status,
+                new_status,
+                NimbusExperiment.PublishStatus.IDLE,
+                NimbusExperiment.PublishStatus.IDLE,
+            )
+            for old_status, new_status in itertools.product(
+                NimbusExperiment.Status, repeat=2
+            )
+        ]
+        NimbusChangeLog.objects.bulk_create(
+            NimbusChangeLog(
+                experiment=self.experiment,
+                changed_by=user,
+                old_status=old_status,
+                new_status=new_status,
+                old_publish_status=old_publish_status,
+                new_publish_status=new_publish_status,
+            )
+            for old_status, new_status, old_publish_status, new_publish_status in changes
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, index_name):
+        self.assertIn(index_name, queryset.explain())
+
+    def assertQueryUsesIndex(self, run_query, index_name):
+        # Explains the SQL the code under test actually issued
+        with CaptureQueriesContext(connection) as queries:
+            run_query()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {queries[-1]['sql']}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn(index_name, plan)
+
+    @parameterized.expand(
+        [
+            ("launch_queue", "nimbus_exp_status_app_idx"),
+            ("end_queue", "nimbus_exp_end_requested_idx"),
+        ]
+    )
+    def test_queue_uses_index(self, queue, index_name):
+        queryset = getattr(NimbusExperiment.objects, queue)(
+            NimbusExperiment.Application.DESKTOP
+        )
+        self.assertUsesIndex(queryset, index_name)
+
+    def test_live_experiments_use_status_index(self):
+        self.assertUsesIndex(
+            NimbusExperiment.objects.filter(
+                status=NimbusExperiment.Status.LIVE,
+                application=NimbusExperiment.Application.DESKTOP,
+            ),
+            "nimbus_exp_status_app_idx",
+        )
+
+    def test_live_unpaused_experiments_use_partial_index(self):
+        # pause_queue narrows these down further in Python
+        self.assertUsesIndex(
+            NimbusExperiment.objects.filter(
+                status=NimbusExperiment.Status.LIVE,
+                is_paused=False,
+                application=NimbusExperiment.Application.DESKTOP,
+            ),
+            "nimbus_exp_live_unpaused_idx",
+        )
+
+    def test_latest_change_uses_index(self):
+        self.assertUsesIndex(
+            self.experiment.changes.order_by("-changed_on")[:1],
+            "nimbus_changelog_latest_idx",
+        )
+
+    def test_status_transition_uses_index(self):
+        # start_date and end_date look these up unordered with exists() and get()
+        self.assertUsesIndex(
+            self.experiment.changes.filter(
+                old_status=NimbusExperiment.Status.ACCEPTED,
+                new_status=NimbusExperiment.Status.LIVE,
+            ).order_by(),
+            "nimbus_changelog_status_idx",
+        )
+
+    def test_latest_review_request_uses_index(self):
+        self.assertQueryUsesIndex(
+            self.experiment.changes.latest_review_request,
+            "nimbus_changelog_publish_idx",
+        )
+
+    def test_latest_review_changes_uses_index(self):
+        self.assertQueryUsesIndex(
+            lambda: NimbusChangeLog.objects.latest_review_changes([self.experiment]),
+            "nimbus_changelog_publish_idx",
+        )
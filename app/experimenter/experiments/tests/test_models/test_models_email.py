@@ -0,0 +1,34 @@
+import datetime
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from experimenter.experiments.models import QueuedEmail
+
+
+class TestQueuedEmail(TestCase):
+    @override_settings(EMAIL_SENDER="sender@example.com")
+    def test_enqueued_email_builds_html_message(self):
+        email = QueuedEmail.objects.enqueue(
+            "Subject",
+            "<p>Body</p>",
+            ("owner@example.com",),
+            cc_recipients=["cc@example.com"],
+        )
+
+        message = QueuedEmail.objects.get(id=email.id).as_message()
+        self.assertEqual(message.subject, "Subject")
+        self.assertEqual(message.body, "<p>Body</p>")
+        self.assertEqual(message.from_email, "sender@example.com")
+        self.assertEqual(message.recipients(), ["owner@example.com", "cc@example.com"])
+        self.assertEqual(message.content_subtype, "html")
+
+    def test_due_excludes_emails_waiting_to_be_retried(self):
+        due_email = QueuedEmail.objects.enqueue("Due", "Body", ["owner@example.com"])
+        retried_email = QueuedEmail.objects.enqueue(
+            "Retried", "Body", ["owner@example.com"]
+        )
+        retried_email.next_attempt_on = timezone.now() + datetime.timedelta(minutes=2)
+        retried_email.save()
+
+        self.assertEqual(list(QueuedEmail.objects.due()), [due_email])
@@ -64,6 +64,41 @@ class TestExperimentManager(TestCase):
             [experiment1, experiment2],
         )
 
+    def test_annotate_dates_matches_date_properties(self):
+        user = UserFactory.create()
+        today = datetime.date.today()
+        proposed = ExperimentFactory.create_with_variants(
+            proposed_start_date=today, proposed_duration=30, proposed_enrollment=10
+        )
+        without_enrollment = ExperimentFactory.create_with_variants(
+            proposed_start_date=today, proposed_duration=30, proposed_enrollment=None
+        )
+        launched = ExperimentFactory.create_with_variants(
+            proposed_start_date=today, proposed_duration=30, proposed_enrollment=10
+        )
+        for old_status, new_status, message, days_ago in (
+            (Experiment.STATUS_ACCEPTED, Experiment.STATUS_LIVE, None, 20),
+            (Experiment.STATUS_LIVE, Experiment.STATUS_LIVE, "Enrollment Complete", 12),
+            (Experiment.STATUS_LIVE, Experiment.STATUS_COMPLETE, None, 2),
+        ):
+            ExperimentChangeLogFactory.create(
+                experiment=launched,
+                old_status=old_status,
+                new_status=new_status,
+                message=message,
+                changed_by=user,
+                changed_on=timezone.now() - datetime.timedelta(days=days_ago),
+            )
+
+        for experiment in Experiment.objects.annotate_dates().filter(
+            id__in=[proposed.id, without_enrollment.id, launched.id]
+        ):
+            self.assertEqual(experiment.computed_start_date, experiment.start_date)
+            self.assertEqual(
+                experiment.computed_enrollment_end_date, experiment.enrollment_end_date
+            )
+            self.assertEqual(experiment.computed_end_date, experiment.end_date)
+
 
 class TestExperimentModel(TestCase):
     def test_get_absolute_url(self):
@@ -456,6 +491,78 @@ class TestExperimentModel(TestCase):
         )
         self.assertEqual(change.experiment.start_date, change.changed_on.date())
 
+    def test_save_updates_search_vector(self):
+        experiment = ExperimentFactory.create_with_variants(objectives="Original")
+        experiment.objectives = "Rewritten"
+        experiment.save()
+
+        self.assertTrue(
+            Experiment.objects.filter(
+                id=experiment.id, search_vector="rewritten"
+            ).exists()
+        )
+        self.assertFalse(
+            Experiment.objects.filter(id=experiment.id, search_vector="original").exists()
+        )
+
+    def test_date_properties_are_served_from_prefetched_changes(self):
+        experiment = ExperimentFactory.create_with_variants(
+            proposed_duration=20, proposed_enrollment=10
+        )
+        user = UserFactory.create()
+        today = datetime.date.today()
+        for old_status, new_status, message, days_ago in (
+            (Experiment.STATUS_ACCEPTED, Experiment.STATUS_LIVE, None, 10),
+            (Experiment.STATUS_LIVE, Experiment.STATUS_LIVE, "Enrollment Complete", 5),
+            (Experiment.STATUS_LIVE, Experiment.STATUS_COMPLETE, None, 1),
+        ):
+            ExperimentChangeLogFactory.create(
+                experiment=experiment,
+                old_status=old_status,
+                new_status=new_status,
+                message=message,
+                changed_by=user,
+                changed_on=today - datetime.timedelta(days=days_ago),
+            )
+
+        experiment = Experiment.objects.get_prefetched().get(id=experiment.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(experiment.start_date, today - datetime.timedelta(days=10))
+            self.assertEqual(
+                experiment.enrollment_end_date, today - datetime.timedelta(days=5)
+            )
+            self.assertEqual(experiment.end_date, today - datetime.timedelta(days=1))
+            self.assertEqual(experiment.total_duration, 9)
+            self.assertTrue(experiment.ending_soon)
+            self.assertTrue(experiment.enrollment_ending_soon)
+
+    def test_date_properties_follow_new_changes(self):
+        experiment = ExperimentFactory.create_with_variants()
+        prefetched = Experiment.objects.get_prefetched().get(id=experiment.id)
+        self.assertEqual(experiment.start_date, experiment.proposed_start_date)
+        self.assertEqual(prefetched.start_date, experiment.proposed_start_date)
+
+        for instance in (experiment, prefetched):
+            change = instance.changes.create(
+                old_status=Experiment.STATUS_ACCEPTED,
+                new_status=Experiment.STATUS_LIVE,
+                changed_by=UserFactory.create(),
+            )
+            self.assertEqual(instance.start_date, change.changed_on.date())
+
+    def test_date_properties_follow_saved_status(self):
+        change = ExperimentChangeLogFactory.create(
+            old_status=Experiment.STATUS_ACCEPTED, new_status=Experiment.STATUS_LIVE
+        )
+        experiment = Experiment.objects.get(id=change.experiment_id)
+        self.assertEqual(experiment.start_date, change.changed_on.date())
+
+        experiment.changes.all().delete()
+        experiment.save()
+
+        self.assertEqual(experiment.start_date, experiment.proposed_start_date)
+
     def test_observation_duration_returns_duration_minus_enrollment(self):
         experiment = ExperimentFactory.create_with_variants(
             proposed_duration=20, proposed_enrollment=10
@@ -1511,6 +1618,19 @@ class TestExperimentModel(TestCase):
         self.assertEqual(experiment_2.display_platforms_or_versions, "All Platforms")
         self.assertEqual(experiment_3.display_platforms_or_versions, "Windows 8")
 
+    def test_clone_does_not_keep_change_dates(self):
+        change = ExperimentChangeLogFactory.create(
+            old_status=Experiment.STATUS_ACCEPTED, new_status=Experiment.STATUS_LIVE
+        )
+        experiment = Experiment.objects.get_prefetched().get(id=change.experiment_id)
+        self.assertEqual(experiment.start_date, change.changed_on.date())
+
+        cloned = experiment.clone("cloned experiment", UserFactory.create())
+
+        self.assertIsNone(cloned.start_date)
+        self.assertEqual(experiment.start_date, change.changed_on.date())
+        self.assertEqual(list(experiment.changes.all()), [change])
+
     def test_clone(self):
         user_1 = UserFactory.create()
         user_2 = UserFactory.create()
@@ -1669,6 +1789,29 @@ class TestVariantPreferences(TestCase):
 
 
 class TestExperimentChangeLog(TestCase):
+    def test_save_updates_experiment_latest_change(self):
+        now = timezone.now()
+        experiment = ExperimentFactory.create_with_variants()
+        stale_experiment = Experiment.objects.get(id=experiment.id)
+
+        changelog = ExperimentChangeLogFactory.create(
+            experiment=experiment, changed_on=now
+        )
+        ExperimentChangeLogFactory.create(
+            experiment=experiment, changed_on=now - datetime.timedelta(days=1)
+        )
+
+        self.assertEqual(experiment.latest_change, changelog.changed_on)
+        self.assertEqual(
+            Experiment.objects.get(id=experiment.id).latest_change, changelog.changed_on
+        )
+
+        stale_experiment.save()
+
+        self.assertEqual(
+            Experiment.objects.get(id=experiment.id).latest_change, changelog.changed_on
+        )
+
     def test_latest_returns_most_recent_changelog(self):
         now = timezone.now()
         experiment = ExperimentFactory.create_with_variants()
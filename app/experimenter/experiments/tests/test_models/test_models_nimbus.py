@@ -8,7 +8,12 @@ from parameterized import parameterized_class
 from parameterized.parameterized import parameterized
 
 from experimenter.experiments.changelog_utils.nimbus import generate_nimbus_changelog
-from experimenter.experiments.models import NimbusExperiment, NimbusIsolationGroup
+from experimenter.experiments.models import (
+    NimbusChangeLog,
+    NimbusEmail,
+    NimbusExperiment,
+    NimbusIsolationGroup,
+)
 from experimenter.experiments.tests.factories import (
     NimbusBranchFactory,
     NimbusBucketRangeFactory,
@@ -118,6 +123,41 @@ class TestNimbusExperimentManager(TestCase):
             [experiment1],
         )
 
+    def test_ending_email_queue_returns_unemailed_experiments_that_should_end(self):
+        def create_launched(days_ago, **kwargs):
+            experiment = NimbusExperimentFactory.create_with_status(
+                NimbusExperiment.Status.LIVE, proposed_duration=10, **kwargs
+            )
+            experiment.changes.filter(
+                old_status=NimbusExperiment.Status.ACCEPTED,
+                new_status=NimbusExperiment.Status.LIVE,
+            ).update(
+                changed_on=datetime.datetime.now() - datetime.timedelta(days=days_ago)
+            )
+            return experiment
+
+        application = NimbusExperiment.Application.DESKTOP
+        # Should end, with the correct application
+        experiment1 = create_launched(10, application=application)
+        # Should end, but wrong application
+        create_launched(10, application=NimbusExperiment.Application.FENIX)
+        # Should end, but already emailed
+        experiment3 = create_launched(11, application=application)
+        NimbusEmail.objects.create(
+            experiment=experiment3, type=NimbusExperiment.EmailType.EXPERIMENT_END
+        )
+        # Correct application, but should not end yet
+        experiment4 = create_launched(9, application=application)
+
+        self.assertEqual(
+            list(NimbusExperiment.objects.ending_email_queue(application)),
+            [experiment1],
+        )
+        for experiment in (experiment1, experiment3, experiment4):
+            self.assertEqual(
+                experiment.should_end, experiment in (experiment1, experiment3)
+            )
+
 
 class TestNimbusExperiment(TestCase):
     def test_str(self):
@@ -592,7 +632,7 @@ class TestNimbusIsolationGroup(TestCase):
         isolation_group = NimbusIsolationGroupFactory.create(
             name=experiment.slug, application=self.application, total=100
         )
-        NimbusBucketRangeFactory(isolation_group=isolation_group, count=100)
+        NimbusBucketRangeFactory(isolation_group=isolation_group, start=0, count=100)
         bucket = NimbusIsolationGroup.request_isolation_group_buckets(
             experiment.slug, experiment, 100
         )
@@ -606,6 +646,71 @@ class TestNimbusIsolationGroup(TestCase):
             self.randomization_unit,
         )
 
+    def test_completed_experiment_bucket_range_is_reused(self):
+        """
+        An isolation group that is full except for the buckets of an experiment
+        that has completed reuses those buckets instead of creating a new instance.
+        """
+        experiment = NimbusExperimentFactory.create(application=self.application)
+        isolation_group = NimbusIsolationGroupFactory.create(
+            name=experiment.slug, application=self.application, total=300
+        )
+        NimbusBucketRangeFactory.create(
+            isolation_group=isolation_group, start=0, count=100
+        )
+        NimbusBucketRangeFactory.create(
+            experiment=NimbusExperimentFactory.create(
+                status=NimbusExperiment.Status.COMPLETE
+            ),
+            isolation_group=isolation_group,
+            start=100,
+            count=100,
+        )
+        NimbusBucketRangeFactory.create(
+            isolation_group=isolation_group, start=200, count=100
+        )
+        bucket = NimbusIsolationGroup.request_isolation_group_buckets(
+            experiment.slug, experiment, 100
+        )
+        self.assertEqual(bucket.start, 100)
+        self.assertEqual(bucket.end, 199)
+        self.assertEqual(bucket.isolation_group, isolation_group)
+
+    def test_smallest_fitting_gap_is_used(self):
+        experiment = NimbusExperimentFactory.create(application=self.application)
+        isolation_group = NimbusIsolationGroupFactory.create(
+            name=experiment.slug, application=self.application, total=1000
+        )
+        NimbusBucketRangeFactory.create(
+            isolation_group=isolation_group, start=300, count=100
+        )
+        NimbusBucketRangeFactory.create(
+            isolation_group=isolation_group, start=500, count=500
+        )
+        self.assertEqual(isolation_group.free_gaps(), [(0, 300), (400, 100)])
+        bucket = NimbusIsolationGroup.request_isolation_group_buckets(
+            experiment.slug, experiment, 100
+        )
+        self.assertEqual(bucket.start, 400)
+        self.assertEqual(bucket.isolation_group, isolation_group)
+
+    def test_gap_in_earlier_instance_is_used_before_creating_instance(self):
+        experiment = NimbusExperimentFactory.create(application=self.application)
+        first_group = NimbusIsolationGroupFactory.create(
+            name=experiment.slug, application=self.application, instance=1, total=200
+        )
+        second_group = NimbusIsolationGroupFactory.create(
+            name=experiment.slug, application=self.application, instance=2, total=200
+        )
+        NimbusBucketRangeFactory.create(isolation_group=first_group, start=100, count=100)
+        NimbusBucketRangeFactory.create(isolation_group=second_group, start=0, count=200)
+        bucket = NimbusIsolationGroup.request_isolation_group_buckets(
+            experiment.slug, experiment, 100
+        )
+        self.assertEqual(bucket.start, 0)
+        self.assertEqual(bucket.isolation_group, first_group)
+        self.assertEqual(NimbusIsolationGroup.objects.count(), 2)
+
     def test_existing_isolation_group_with_matching_name_but_not_application_is_filtered(
         self,
     ):
@@ -714,6 +819,50 @@ class TestNimbusChangeLogManager(TestCase):
 
         self.assertEqual(experiment.changes.latest_rejection(), rejection)
 
+    def test_latest_review_changes_for_many_experiments_in_one_query(self):
+        rejected = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.DRAFT,
+            publish_status=NimbusExperiment.PublishStatus.IDLE,
+        )
+        for publish_status in (
+            NimbusExperiment.PublishStatus.REVIEW,
+            NimbusExperiment.PublishStatus.APPROVED,
+            NimbusExperiment.PublishStatus.WAITING,
+            NimbusExperiment.PublishStatus.REVIEW,
+            NimbusExperiment.PublishStatus.IDLE,
+            NimbusExperiment.PublishStatus.REVIEW,
+        ):
+            rejected.publish_status = publish_status
+            rejected.save()
+            generate_nimbus_changelog(rejected, rejected.owner)
+        unreviewed = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.DRAFT,
+            publish_status=NimbusExperiment.PublishStatus.IDLE,
+        )
+
+        with self.assertNumQueries(1):
+            latest_changes = NimbusChangeLog.objects.latest_review_changes(
+                [rejected, unreviewed]
+            )
+
+        self.assertEqual(
+            latest_changes,
+            {
+                rejected.id: {
+                    "review_request": rejected.changes.latest_review_request(),
+                    "rejection": rejected.changes.latest_rejection(),
+                    "timeout": rejected.changes.latest_timeout(),
+                },
+                unreviewed.id: {
+                    "review_request": None,
+                    "rejection": None,
+                    "timeout": None,
+                },
+            },
+        )
+        self.assertIsNotNone(latest_changes[rejected.id]["timeout"])
+        self.assertEqual(rejected.latest_review_changes, latest_changes[rejected.id])
+
 
 class TestNimbusChangeLog(TestCase):
     def test_uses_message_if_set(self):
@@ -0,0 +1,116 @@
+import smtplib
+
+import mock
+from django.core import mail
+from django.core.mail import get_connection
+from django.test import TestCase, override_settings
+
+from experimenter.experiments import tasks
+from experimenter.experiments.models import QueuedEmail
+
+
+class TestSendQueuedEmails(TestCase):
+    def enqueue_emails(self, count):
+        for i in range(count):
+            QueuedEmail.objects.enqueue(f"Subject {i}", "Body", ["owner@example.com"])
+
+    def test_sends_batch_over_one_connection(self):
+        self.enqueue_emails(3)
+
+        with mock.patch(
+            "experimenter.experiments.tasks.get_connection", wraps=get_connection
+        ) as mock_get_connection:
+            tasks.send_queued_emails()
+
+        mock_get_connection.assert_called_once_with(fail_silently=False)
+        self.assertEqual(
+            [email.subject for email in mail.outbox],
+            ["Subject 0", "Subject 1", "Subject 2"],
+        )
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    @override_settings(EMAIL_OUTBOX_BATCH_SIZE=2)
+    def test_sends_at_most_batch_size(self):
+        self.enqueue_emails(3)
+
+        tasks.send_queued_emails()
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+
+    def test_does_not_connect_without_queued_emails(self):
+        with mock.patch(
+            "experimenter.experiments.tasks.get_connection"
+        ) as mock_get_connection:
+            tasks.send_queued_emails()
+
+        mock_get_connection.assert_not_called()
+
+    def test_failed_email_is_retried_after_backoff(self):
+        self.enqueue_emails(2)
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=[smtplib.SMTPRecipientsRefused({}), 1],
+        ):
+            tasks.send_queued_emails()
+            tasks.send_queued_emails()
+
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.subject, "Subject 0")
+        self.assertEqual(email.attempts, 1)
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=1)
+    def test_email_is_dropped_after_max_attempts(self):
+        self.enqueue_emails(1)
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=smtplib.SMTPRecipientsRefused({}),
+        ):
+            tasks.send_queued_emails()
+
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_emails_stay_due_when_connection_fails(self):
+        self.enqueue_emails(2)
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.open",
+            side_effect=ConnectionRefusedError(),
+        ):
+            tasks.send_queued_emails()
+
+        self.assertEqual(QueuedEmail.objects.due().count(), 2)
+        self.assertFalse(QueuedEmail.objects.filter(attempts__gt=0).exists())
+
+    def test_lost_connection_leaves_remaining_emails_untouched(self):
+        self.enqueue_emails(3)
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=[1, smtplib.SMTPServerDisconnected(), 1],
+        ) as mock_send_messages:
+            tasks.send_queued_emails()
+
+        self.assertEqual(mock_send_messages.call_count, 2)
+        self.assertEqual(
+            [email.subject for email in QueuedEmail.objects.due().order_by("id")],
+            ["Subject 1", "Subject 2"],
+        )
+        self.assertFalse(QueuedEmail.objects.filter(attempts__gt=0).exists())
+
+    def test_emails_are_claimed_before_sending(self):
+        self.enqueue_emails(2)
+
+        def send_messages(messages):
+            self.assertFalse(QueuedEmail.objects.due().exists())
+            return len(messages)
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=send_messages,
+        ):
+            tasks.send_queued_emails()
+
+        self.assertFalse(QueuedEmail.objects.exists())
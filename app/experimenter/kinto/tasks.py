@@ -288,15 +288,12 @@ def nimbus_check_experiments_are_complete():
         records = kinto_client.get_main_records()
         record_ids = [r.get("id") for r in records]
 
-        for experiment in live_experiments:
-            if (
-                experiment.should_end
-                and not experiment.emails.filter(
-                    type=NimbusExperiment.EmailType.EXPERIMENT_END
-                ).exists()
-            ):
-                nimbus_send_experiment_ending_email(experiment)
+        for experiment in NimbusExperiment.objects.ending_email_queue(
+            application
+        ).select_related("owner"):
+            nimbus_send_experiment_ending_email(experiment)
 
+        for experiment in live_experiments:
             if experiment.slug not in record_ids:
                 logger.info(
                     f"{experiment.slug} status is being updated to complete".format(
@@ -7,6 +7,7 @@ from django.test import TestCase
 
 from experimenter.experiments.api.v6.serializers import NimbusExperimentSerializer
 from experimenter.experiments.models import NimbusExperiment
+from experimenter.experiments.tasks import send_queued_emails
 from experimenter.experiments.tests.factories import NimbusExperimentFactory
 from experimenter.kinto import tasks
 from experimenter.kinto.client import (
@@ -566,6 +567,7 @@ class TestCheckExperimentIsComplete(MockKintoClientMixin, TestCase):
                 type=NimbusExperiment.EmailType.EXPERIMENT_END
             ).exists()
         )
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), 1)
 
     def test_only_completes_experiments_with_matching_application_collection(self):
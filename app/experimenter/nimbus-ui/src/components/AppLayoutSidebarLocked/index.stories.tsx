@@ -45,7 +45,7 @@ storiesOf("components/AppLayoutSidebarLocked", module)
         analysisError={undefined}
         analysis={{
           show_analysis: true,
-          daily: [],
+          daily: {},
           weekly: {},
           overall: {},
           other_metrics: mockAnalysis().other_metrics,
@@ -45,7 +45,7 @@ const Subject = ({
         analysis: withAnalysis
           ? {
               show_analysis: true,
-              daily: [],
+              daily: {},
               weekly: {},
               overall: mockAnalysis().overall,
               metadata: mockAnalysis().metadata,
@@ -63,7 +63,7 @@ const getBranchDescriptions = (
 
 const TableHighlights = ({
   results = {
-    daily: [],
+    daily: {},
     weekly: {},
     overall: {},
     metadata: { metrics: {}, outcomes: {} },
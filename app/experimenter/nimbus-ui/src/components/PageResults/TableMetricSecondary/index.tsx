@@ -43,7 +43,7 @@ const getStatistics = (slug: string): Array<SecondaryMetricStatistic> => {
 
 const TableMetricSecondary = ({
   results = {
-    daily: [],
+    daily: {},
     weekly: {},
     overall: {},
     metadata: { metrics: {}, outcomes: {} },
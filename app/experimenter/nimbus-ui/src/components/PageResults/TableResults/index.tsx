@@ -40,7 +40,7 @@ const getResultMetrics = (outcomes: OutcomesList) => {
 const TableResults = ({
   experiment,
   results = {
-    daily: [],
+    daily: {},
     weekly: {},
     overall: {},
     metadata: { metrics: {}, outcomes: {} },
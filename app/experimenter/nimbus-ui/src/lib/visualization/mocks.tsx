@@ -280,7 +280,7 @@ export const mockAnalysis = (modifications = {}) =>
       other_metrics: { feature_d: "Feature D" },
       metadata: MOCK_METADATA,
       show_analysis: true,
-      daily: [],
+      daily: {},
       weekly: weeklyMockAnalysis(),
       overall: {
         control: {
@@ -914,7 +914,7 @@ export const mockIncompleteAnalysis = (modifications = {}) =>
       other_metrics: { feature_d: "Feature D" },
       metadata: MOCK_METADATA,
       show_analysis: true,
-      daily: [],
+      daily: {},
       weekly: {},
       overall: {
         control: {
@@ -3,7 +3,7 @@
  * file, You can obtain one at http://mozilla.org/MPL/2.0/. */
 
 export interface AnalysisData {
-  daily: AnalysisPoint[] | null;
+  daily: { [branch: string]: BranchDescription } | null;
   weekly: { [branch: string]: BranchDescription } | null;
   overall: { [branch: string]: BranchDescription } | null;
   show_analysis: boolean;
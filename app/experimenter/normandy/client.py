@@ -1,8 +1,23 @@
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils.dateparse import parse_datetime
+
+from experimenter.base.http import HTTPClient
+
+MAX_CONCURRENT_RECIPE_REQUESTS = 8
+RECIPE_LIST_PAGE_SIZE = 100
+
+http_client = HTTPClient(
+    "normandy",
+    timeout=settings.NORMANDY_API_TIMEOUT,
+    max_retries=settings.NORMANDY_API_MAX_RETRIES,
+    pool_maxsize=MAX_CONCURRENT_RECIPE_REQUESTS,
+)
 
 
 class NormandyError(Exception):
@@ -23,7 +38,7 @@ class NormandyDecodeError(NormandyError):
 
 def make_normandy_call(url, params={}):
     try:
-        response = requests.get(url, verify=(not settings.DEBUG), params=params)
+        response = http_client.get(url, verify=(not settings.DEBUG), params=params)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as e:
@@ -45,12 +60,74 @@ def get_recipe(recipe_id):
     return recipe_data["approved_revision"]
 
 
-def get_recipe_list(experiment_slug):
+def get_recipes(recipe_ids):
+    """
+    Fetches the approved revisions of many recipes concurrently and returns
+    them keyed by id. A recipe that could not be fetched maps to the error
+    raised for it so that one failure does not stop the others.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_RECIPE_REQUESTS) as executor:
+        futures = {
+            recipe_id: executor.submit(get_recipe, recipe_id)
+            for recipe_id in set(recipe_ids)
+        }
+
+    recipes = {}
+    for recipe_id, future in futures.items():
+        try:
+            recipes[recipe_id] = future.result()
+        except (KeyError, NormandyError) as e:
+            recipes[recipe_id] = e
+    return recipes
+
+
+def get_recipe_revision(recipe):
+    return recipe.get("latest_revision") or recipe.get("approved_revision") or {}
+
+
+def get_recipe_experimenter_slug(recipe):
+    return get_recipe_revision(recipe).get("experimenter_slug")
+
+
+def get_recipe_date_created(recipe):
+    date_created = get_recipe_revision(recipe).get("date_created")
+    if date_created:
+        return parse_datetime(date_created)
+
+
+def get_recipe_lists_by_slug(experimenter_slugs, created_after=None):
+    """
+    Pages through the recipe listing newest first and groups the recipes
+    created for the given experiments by their experimenter_slug.  Paging
+    stops after the first page whose recipes were all last revised before
+    created_after, as the older pages can not hold recipes for experiments
+    created since.
+    """
+    experimenter_slugs = set(experimenter_slugs)
+    recipes_by_slug = defaultdict(list)
     recipe_url = settings.NORMANDY_API_RECIPES_LIST_URL
-    recipe_data = make_normandy_call(
-        recipe_url, params={"experimenter_slug": experiment_slug}
-    )
-    return recipe_data["results"]
+    params = {"ordering": "-id", "page_size": RECIPE_LIST_PAGE_SIZE}
+
+    while recipe_url:
+        recipe_data = make_normandy_call(recipe_url, params=params)
+        page_is_older = created_after is not None and bool(recipe_data["results"])
+        for recipe in recipe_data["results"]:
+            experimenter_slug = get_recipe_experimenter_slug(recipe)
+            if experimenter_slug in experimenter_slugs:
+                recipes_by_slug[experimenter_slug].append(recipe)
+
+            if page_is_older:
+                date_created = get_recipe_date_created(recipe)
+                page_is_older = date_created is not None and date_created < created_after
+
+        if page_is_older:
+            break
+
+        # The next page url already carries the query parameters
+        recipe_url = recipe_data.get("next")
+        params = {}
+
+    return recipes_by_slug
 
 
 def get_recipe_state_enabler(recipe_data):
@@ -1,10 +1,15 @@
 import decimal
+import hashlib
+import json
 
 import markus
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import IntegrityError, transaction
+from django.db.models import Min
+from django.utils import timezone
 
 from experimenter.bugzilla.tasks import (
     add_start_date_comment_task,
@@ -14,9 +19,9 @@ from experimenter.celery import app
 from experimenter.experiments.changelog_utils import update_experiment_with_change_log
 from experimenter.experiments.email import (
     send_experiment_launch_email,
-    send_period_ending_emails_task,
+    send_period_ending_emails,
 )
-from experimenter.experiments.models import Experiment
+from experimenter.experiments.models import Experiment, ExperimentChangeLog
 from experimenter.normandy import client as normandy
 
 STATUS_UPDATE_MAPPING = {
@@ -28,6 +33,7 @@ logger = get_task_logger(__name__)
 metrics = markus.get_metrics("experiments.tasks")
 
 QA_LAUNCH_MESSAGE = "Launched for QA"
+RECIPE_FINGERPRINT_CACHE_KEY = "normandy-recipe-fingerprint:{id}"
 
 
 @app.task
@@ -36,14 +42,35 @@ def update_recipe_ids_to_experiments():
     metrics.incr("update_ready_to_ship_experiments.started")
     logger.info("Update Recipes to Experiments")
 
-    ready_to_ship_experiments = Experiment.objects.filter(
-        status__in=[Experiment.STATUS_SHIP, Experiment.STATUS_ACCEPTED]
+    ready_to_ship_experiments = list(
+        Experiment.objects.filter(
+            status__in=[Experiment.STATUS_SHIP, Experiment.STATUS_ACCEPTED]
+        )
     )
 
+    if not ready_to_ship_experiments:
+        metrics.incr("update_ready_to_experiments.completed")
+        return
+
+    # Recipes are only created for an experiment once it exists, so the
+    # listing does not need to be read back further than the oldest first change.
+    created_after = ExperimentChangeLog.objects.filter(
+        experiment__in=ready_to_ship_experiments
+    ).aggregate(created_after=Min("changed_on"))["created_after"]
+
+    try:
+        recipes_by_slug = normandy.get_recipe_lists_by_slug(
+            [experiment.slug for experiment in ready_to_ship_experiments], created_after
+        )
+    except (KeyError, normandy.NormandyError) as e:
+        logger.info(f"Failed to list Normandy recipes: {e}")
+        metrics.incr("update_ready_to_experiments.failed")
+        return
+
     for experiment in ready_to_ship_experiments:
         try:
             logger.info("Updating Experiment: {}".format(experiment))
-            recipe_data = normandy.get_recipe_list(experiment.slug)
+            recipe_data = recipes_by_slug.get(experiment.slug, [])
 
             if len(recipe_data):
                 sorted_recipe_data = sorted(recipe_data, key=lambda x: x.get("id"))
@@ -74,31 +101,52 @@ def update_launched_experiments():
     metrics.incr("update_launched_experiments.started")
     logger.info("Updating launched experiments info")
 
-    launched_experiments = Experiment.objects.filter(
-        status__in=[Experiment.STATUS_ACCEPTED, Experiment.STATUS_LIVE]
+    launched_experiments = list(
+        Experiment.objects.filter(
+            status__in=[Experiment.STATUS_ACCEPTED, Experiment.STATUS_LIVE]
+        )
+    )
+    recipes = normandy.get_recipes(
+        experiment.normandy_id
+        for experiment in launched_experiments
+        if experiment.normandy_id
+    )
+
+    cached_fingerprints = cache.get_many(
+        [
+            RECIPE_FINGERPRINT_CACHE_KEY.format(id=experiment.id)
+            for experiment in launched_experiments
+        ]
     )
+    fingerprints = {}
+    paused_experiments = []
+    live_experiment_ids = []
 
     for experiment in launched_experiments:
         try:
             logger.info("Updating Experiment: {}".format(experiment))
             if experiment.normandy_id:
-                recipe_data = normandy.get_recipe(experiment.normandy_id)
-
-                if needs_to_be_updated(recipe_data, experiment.status):
-                    experiment = update_status_task(experiment, recipe_data)
-
-                    if experiment.status == Experiment.STATUS_LIVE:
-                        add_start_date_comment_task.delay(experiment.id)
-                        send_experiment_launch_email(experiment)
-
-                    elif experiment.status == Experiment.STATUS_COMPLETE:
-                        comp_experiment_update_res_task.delay(experiment.id)
+                recipe_data = recipes[experiment.normandy_id]
+                if isinstance(recipe_data, Exception):
+                    raise recipe_data
+
+                fingerprint_key = RECIPE_FINGERPRINT_CACHE_KEY.format(id=experiment.id)
+                if cached_fingerprints.get(fingerprint_key) == get_recipe_fingerprint(
+                    experiment, recipe_data
+                ):
+                    metrics.incr("update_launched_experiments.unchanged")
+                else:
+                    experiment = sync_recipe(experiment, recipe_data)
+                    if experiment.status == Experiment.STATUS_LIVE and set_is_paused(
+                        experiment, recipe_data
+                    ):
+                        paused_experiments.append(experiment)
+                    fingerprints[fingerprint_key] = get_recipe_fingerprint(
+                        experiment, recipe_data
+                    )
 
                 if experiment.status == Experiment.STATUS_LIVE:
-                    update_is_high_population(experiment, recipe_data)
-                    update_population_info(experiment, recipe_data)
-                    set_is_paused_value_task.delay(experiment.id, recipe_data)
-                    send_period_ending_emails_task(experiment)
+                    live_experiment_ids.append(experiment.id)
 
             else:
                 logger.info(
@@ -107,9 +155,50 @@ def update_launched_experiments():
         except (IntegrityError, KeyError, normandy.NormandyError) as e:
             logger.info(f"Failed to update Experiment {experiment}: {e}")
             metrics.incr("update_launched_experiments.failed")
+
+    save_is_paused_values(paused_experiments)
+    send_period_ending_emails(live_experiment_ids)
+    cache.set_many(fingerprints, settings.NORMANDY_RECIPE_CACHE_TIMEOUT)
     metrics.incr("update_launched_experiments.completed")
 
 
+def get_recipe_fingerprint(experiment, recipe_data):
+    # Covers the recipe and every experiment field that syncing it can change,
+    # so an edit on either side is picked up on the next tick.
+    content = json.dumps(
+        [
+            recipe_data,
+            experiment.status,
+            experiment.is_paused,
+            experiment.is_high_population,
+            experiment.population_percent,
+            experiment.firefox_min_version,
+            experiment.firefox_max_version,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def sync_recipe(experiment, recipe_data):
+    if needs_to_be_updated(recipe_data, experiment.status):
+        experiment = update_status_task(experiment, recipe_data)
+
+        if experiment.status == Experiment.STATUS_LIVE:
+            add_start_date_comment_task.delay(experiment.id)
+            send_experiment_launch_email(experiment)
+
+        elif experiment.status == Experiment.STATUS_COMPLETE:
+            comp_experiment_update_res_task.delay(experiment.id)
+
+    if experiment.status == Experiment.STATUS_LIVE:
+        update_is_high_population(experiment, recipe_data)
+        update_population_info(experiment, recipe_data)
+
+    return experiment
+
+
 def is_qaOnly(recipe_data):
     if "filter_object" in recipe_data:
         filter_objects = {f["type"]: f for f in recipe_data["filter_object"]}
@@ -156,27 +245,57 @@ def set_is_paused_value_task(experiment_id, recipe_data):
     experiment = Experiment.objects.get(id=experiment_id)
     metrics.incr("set_is_paused_value.started")
     logger.info("Updating Enrollment Value")
-    if recipe_data:
-        paused_val = is_paused(recipe_data)
-        if paused_val is not None and paused_val != experiment.is_paused:
-            with transaction.atomic():
-                experiment.is_paused = paused_val
-                experiment.save()
-            metrics.incr("set_is_paused_value.updated")
-            logger.info("Enrollment Value Updated")
-            message = (
-                "Enrollment Completed"
-                if experiment.is_paused
-                else "Enrollment Re-enabled"
-            )
-            normandy_user = settings.NORMANDY_DEFAULT_CHANGELOG_USER
-            default_user, _ = get_user_model().objects.get_or_create(
-                email=normandy_user, username=normandy_user
-            )
-            experiment.changes.create(message=message, changed_by=default_user)
+    if recipe_data and set_is_paused(experiment, recipe_data):
+        save_is_paused_values([experiment])
     metrics.incr("set_is_paused_value.completed")
 
 
+def set_is_paused(experiment, recipe_data):
+    paused_val = is_paused(recipe_data)
+    if paused_val is not None and paused_val != experiment.is_paused:
+        experiment.is_paused = paused_val
+        return True
+    return False
+
+
+def save_is_paused_values(experiments):
+    """
+    Writes the paused state of experiments changed by set_is_paused with one
+    update per value and a single changelog insert for all of them.
+    """
+    if not experiments:
+        return
+
+    normandy_user = settings.NORMANDY_DEFAULT_CHANGELOG_USER
+    default_user, _ = get_user_model().objects.get_or_create(
+        email=normandy_user, username=normandy_user
+    )
+    changed_on = timezone.now()
+
+    with transaction.atomic():
+        for paused_val in (True, False):
+            Experiment.objects.filter(
+                id__in=[e.id for e in experiments if e.is_paused == paused_val]
+            ).update(is_paused=paused_val, latest_change=changed_on)
+
+        ExperimentChangeLog.objects.bulk_create(
+            ExperimentChangeLog(
+                experiment=experiment,
+                changed_by=default_user,
+                changed_on=changed_on,
+                message=(
+                    "Enrollment Completed"
+                    if experiment.is_paused
+                    else "Enrollment Re-enabled"
+                ),
+            )
+            for experiment in experiments
+        )
+
+    metrics.incr("set_is_paused_value.updated", len(experiments))
+    logger.info("Enrollment Values Updated")
+
+
 def update_population_info(experiment, recipe_data):
     if recipe_data and "filter_object" in recipe_data:
         filter_objects = {f["type"]: f for f in recipe_data["filter_object"]}
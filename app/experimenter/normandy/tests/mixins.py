@@ -6,7 +6,7 @@ class MockNormandyMixin(object):
         super().setUp()
 
         mock_normandy_requests_get_patcher = mock.patch(
-            "experimenter.normandy.client.requests.get"
+            "experimenter.normandy.client.http_client.get"
         )
         self.mock_normandy_requests_get = mock_normandy_requests_get_patcher.start()
         self.addCleanup(mock_normandy_requests_get_patcher.stop)
@@ -85,14 +85,6 @@ class MockNormandyTasksMixin(object):
     def setUp(self):
         super().setUp()
 
-        mock_tasks_set_is_paused_value_patcher = mock.patch(
-            "experimenter.normandy.tasks.set_is_paused_value_task"
-        )
-        self.mock_tasks_set_is_paused_value = (
-            mock_tasks_set_is_paused_value_patcher.start()
-        )
-        self.addCleanup(mock_tasks_set_is_paused_value_patcher.stop)
-
         mock_tasks_add_start_date_comment_patcher = mock.patch(
             "experimenter.normandy.tasks.add_start_date_comment_task"
         )
@@ -1,5 +1,9 @@
+import datetime
+
 import mock
+from django.conf import settings
 from django.test import TestCase
+from django.utils import timezone
 from requests.exceptions import HTTPError, RequestException
 
 from experimenter.normandy import (
@@ -7,6 +11,8 @@ from experimenter.normandy import (
     NonsuccessfulNormandyCall,
     NormandyDecodeError,
     get_recipe,
+    get_recipe_lists_by_slug,
+    get_recipes,
     make_normandy_call,
 )
 from experimenter.normandy.tests.mixins import MockNormandyMixin
@@ -50,3 +56,103 @@ class TestMakeNormandyCall(MockNormandyMixin, TestCase):
     def test_successful_get_recipe_returns_recipe_data(self):
         response_data = get_recipe(1234)
         self.assertTrue(response_data["enabled"])
+
+    def test_get_recipes_returns_recipe_data_keyed_by_id(self):
+        recipes = get_recipes([1234, 1235, 1234])
+
+        self.assertEqual(set(recipes.keys()), {1234, 1235})
+        self.assertTrue(recipes[1234]["enabled"])
+        self.assertTrue(recipes[1235]["enabled"])
+        self.assertEqual(self.mock_normandy_requests_get.call_count, 2)
+
+    def test_get_recipes_maps_failed_recipe_to_its_error(self):
+        def determine_response(url, verify=None, params={}):
+            if "1234" in url:
+                raise RequestException()
+            return self.buildMockSuccessEnabledResponse()
+
+        self.mock_normandy_requests_get.side_effect = determine_response
+
+        recipes = get_recipes([1234, 1235])
+
+        self.assertIsInstance(recipes[1234], APINormandyError)
+        self.assertTrue(recipes[1235]["enabled"])
+
+
+class TestGetRecipeListsBySlug(MockNormandyMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.pages = {}
+
+        def determine_response(url, verify=None, params={}):
+            mock_response = mock.Mock()
+            mock_response.json.return_value = self.pages[url]
+            mock_response.status_code = 200
+            return mock_response
+
+        self.mock_normandy_requests_get.side_effect = determine_response
+
+    def build_recipe(self, recipe_id, slug, date_created):
+        return {
+            "id": recipe_id,
+            "latest_revision": {
+                "experimenter_slug": slug,
+                "date_created": date_created.isoformat(),
+            },
+        }
+
+    def test_groups_candidate_recipes_newest_first(self):
+        now = timezone.now()
+        self.pages = {
+            settings.NORMANDY_API_RECIPES_LIST_URL: {
+                "next": "/api/v3/recipe/?page=2",
+                "results": [
+                    self.build_recipe(3, "first", now),
+                    self.build_recipe(2, "other", now),
+                ],
+            },
+            "/api/v3/recipe/?page=2": {
+                "next": None,
+                "results": [self.build_recipe(1, "first", now)],
+            },
+        }
+
+        recipes_by_slug = get_recipe_lists_by_slug(["first", "second"])
+
+        self.assertEqual(
+            {
+                slug: [r["id"] for r in recipes]
+                for slug, recipes in recipes_by_slug.items()
+            },
+            {"first": [3, 1]},
+        )
+        self.mock_normandy_requests_get.assert_any_call(
+            settings.NORMANDY_API_RECIPES_LIST_URL,
+            verify=True,
+            params={"ordering": "-id", "page_size": 100},
+        )
+
+    def test_stops_paging_after_a_page_older_than_created_after(self):
+        created_after = timezone.now()
+        older = created_after - datetime.timedelta(days=1)
+        self.pages = {
+            settings.NORMANDY_API_RECIPES_LIST_URL: {
+                "next": "/api/v3/recipe/?page=2",
+                "results": [
+                    self.build_recipe(4, "first", created_after),
+                    self.build_recipe(3, "other", older),
+                ],
+            },
+            "/api/v3/recipe/?page=2": {
+                "next": "/api/v3/recipe/?page=3",
+                "results": [
+                    self.build_recipe(2, "first", older),
+                    self.build_recipe(1, "other", older),
+                ],
+            },
+        }
+
+        recipes_by_slug = get_recipe_lists_by_slug(["first"], created_after)
+
+        self.assertEqual([r["id"] for r in recipes_by_slug["first"]], [4, 2])
+        self.assertEqual(self.mock_normandy_requests_get.call_count, 2)
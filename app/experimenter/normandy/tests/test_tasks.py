@@ -4,11 +4,13 @@ from datetime import date
 import mock
 from django.conf import settings
 from django.core import mail
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 
 from experimenter.bugzilla.tests.mixins import MockBugzillaMixin
 from experimenter.experiments.constants import ExperimentConstants
 from experimenter.experiments.models import Experiment, ExperimentEmail
+from experimenter.experiments.tasks import send_queued_emails
 from experimenter.experiments.tests.factories import ExperimentFactory
 from experimenter.normandy import client as normandy
 from experimenter.normandy import tasks
@@ -17,15 +19,27 @@ from experimenter.normandy.tests.mixins import MockNormandyMixin, MockNormandyTa
 
 @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
 class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
     def test_update_ready_to_ship_experiment(self):
         experiment = ExperimentFactory.create_with_status(
             target_status=Experiment.STATUS_SHIP
         )
         mock_response_data = {
             "results": [
-                {"id": 1, "latest_revision": {"creator": {"email": "dev@example.com"}}},
-                {"id": 10},
-                {"id": 100},
+                {
+                    "id": 1,
+                    "latest_revision": {
+                        "experimenter_slug": experiment.slug,
+                        "creator": {"email": "dev@example.com"},
+                    },
+                },
+                {"id": 10, "latest_revision": {"experimenter_slug": experiment.slug}},
+                {"id": 100, "latest_revision": {"experimenter_slug": experiment.slug}},
+                {"id": 1000, "latest_revision": {"experimenter_slug": "other-slug"}},
+                {"id": 10000, "latest_revision": {"experimenter_slug": None}},
             ]
         }
         mock_response = mock.Mock()
@@ -56,7 +70,15 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
         experiment = ExperimentFactory.create_with_status(
             target_status=Experiment.STATUS_ACCEPTED, normandy_id=2
         )
-        mock_response_data = {"results": [{"id": 2}, {"id": 10}, {"id": 100}]}
+        mock_response_data = {
+            "results": [
+                {
+                    "id": recipe_id,
+                    "approved_revision": {"experimenter_slug": experiment.slug},
+                }
+                for recipe_id in (2, 10, 100)
+            ]
+        }
         mock_response = mock.Mock()
         mock_response.json = mock.Mock()
         mock_response.json.return_value = mock_response_data
@@ -80,6 +102,87 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
             ).exists()
         )
 
+    def test_update_ready_to_ship_experiments_from_paged_recipe_list(self):
+        experiment1 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_SHIP
+        )
+        experiment2 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_SHIP
+        )
+        experiment3 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_SHIP
+        )
+        pages = {
+            settings.NORMANDY_API_RECIPES_LIST_URL: {
+                "next": "/api/v3/recipe/?page=2",
+                "results": [
+                    {"id": 1, "latest_revision": {"experimenter_slug": experiment1.slug}},
+                    {"id": 3, "latest_revision": {"experimenter_slug": experiment2.slug}},
+                ],
+            },
+            "/api/v3/recipe/?page=2": {
+                "next": None,
+                "results": [
+                    {"id": 2, "latest_revision": {"experimenter_slug": experiment2.slug}},
+                ],
+            },
+        }
+
+        def determine_response(url, verify=None, params={}):
+            mock_response = mock.Mock()
+            mock_response.json.return_value = pages[url]
+            mock_response.status_code = 200
+            return mock_response
+
+        self.mock_normandy_requests_get.side_effect = determine_response
+
+        tasks.update_recipe_ids_to_experiments()
+
+        self.assertEqual(self.mock_normandy_requests_get.call_count, 2)
+
+        experiment1 = Experiment.objects.get(id=experiment1.id)
+        self.assertEqual(experiment1.status, Experiment.STATUS_ACCEPTED)
+        self.assertEqual(experiment1.normandy_id, 1)
+        self.assertEqual(experiment1.other_normandy_ids, [])
+
+        experiment2 = Experiment.objects.get(id=experiment2.id)
+        self.assertEqual(experiment2.status, Experiment.STATUS_ACCEPTED)
+        self.assertEqual(experiment2.normandy_id, 2)
+        self.assertEqual(experiment2.other_normandy_ids, [3])
+
+        experiment3 = Experiment.objects.get(id=experiment3.id)
+        self.assertEqual(experiment3.status, Experiment.STATUS_SHIP)
+        self.assertIsNone(experiment3.normandy_id)
+
+    @mock.patch("experimenter.normandy.tasks.normandy.get_recipe_lists_by_slug")
+    def test_update_recipe_ids_lists_recipes_since_oldest_experiment(
+        self, mock_get_recipe_lists_by_slug
+    ):
+        mock_get_recipe_lists_by_slug.return_value = {}
+        experiment1 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_SHIP
+        )
+        experiment2 = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_ACCEPTED
+        )
+
+        tasks.update_recipe_ids_to_experiments()
+
+        slugs, created_after = mock_get_recipe_lists_by_slug.call_args[0]
+        self.assertCountEqual(slugs, [experiment1.slug, experiment2.slug])
+        self.assertEqual(
+            created_after,
+            min(
+                change.changed_on
+                for experiment in (experiment1, experiment2)
+                for change in experiment.changes.all()
+            ),
+        )
+
+    def test_update_recipe_ids_skips_listing_without_ready_experiments(self):
+        tasks.update_recipe_ids_to_experiments()
+        self.mock_normandy_requests_get.assert_not_called()
+
     def test_update_accepted_experiment_task(self):
         experiment = ExperimentFactory.create(
             status=Experiment.STATUS_ACCEPTED,
@@ -90,19 +193,24 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
 
         tasks.update_launched_experiments()
 
-        recipe = self.buildMockSuccessEnabledResponse().json()["approved_revision"]
-
         self.mock_tasks_add_start_date_comment.delay.assert_called_with(experiment.id)
-        self.mock_tasks_set_is_paused_value.delay.assert_called_with(
-            experiment.id, recipe
+
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertTrue(experiment.is_paused)
+        self.assertTrue(
+            experiment.changes.filter(
+                changed_by__email=settings.NORMANDY_DEFAULT_CHANGELOG_USER,
+                message="Enrollment Completed",
+            ).exists()
         )
 
         self.mock_tasks_comp_experiment_update_res.delay.assert_not_called()
 
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(
             mail.outbox[0].recipients(),
-            [experiment.owner.email, experiment.analysis_owner],
+            [experiment.owner.email, experiment.analysis_owner.email],
         )
 
     def test_update_live_experiment_task(self):
@@ -118,10 +226,12 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
 
         self.mock_tasks_comp_experiment_update_res.delay.assert_called_with(experiment.id)
 
-        self.mock_tasks_set_is_paused_value.delay.assert_not_called()
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertFalse(experiment.is_paused)
         self.mock_tasks_add_start_date_comment.delay.assert_not_called()
 
         # No email was sent
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), 0)
 
     def test_ship_experiment_not_updated(self):
@@ -159,7 +269,7 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
 
         self.mock_tasks_add_start_date_comment.delay.assert_not_called()
         self.mock_tasks_comp_experiment_update_res.delay.assert_not_called()
-        self.mock_tasks_set_is_paused_value.delay.assert_called()
+        self.assertTrue(Experiment.objects.get(normandy_id=1234).is_paused)
 
     def test_experiment_with_no_recipe_data(self):
         ExperimentFactory.create_with_status(
@@ -247,6 +357,89 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
             ).exists()
         )
 
+    def test_unchanged_recipe_is_not_synced_again(self):
+        ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1234
+        )
+
+        with mock.patch.object(
+            tasks, "sync_recipe", wraps=tasks.sync_recipe
+        ) as mock_sync_recipe:
+            tasks.update_launched_experiments()
+            tasks.update_launched_experiments()
+
+        self.assertEqual(self.mock_normandy_requests_get.call_count, 2)
+        mock_sync_recipe.assert_called_once()
+
+    def test_changed_recipe_is_synced_again(self):
+        experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1234
+        )
+
+        tasks.update_launched_experiments()
+        self.mock_normandy_requests_get.return_value = (
+            self.buildMockSuccessDisabledResponse()
+        )
+        tasks.update_launched_experiments()
+
+        experiment = Experiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.status, Experiment.STATUS_COMPLETE)
+
+    def test_changed_experiment_is_synced_again(self):
+        experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1234
+        )
+
+        tasks.update_launched_experiments()
+        Experiment.objects.filter(id=experiment.id).update(is_paused=False)
+        tasks.update_launched_experiments()
+
+        self.assertTrue(Experiment.objects.get(id=experiment.id).is_paused)
+        self.assertEqual(
+            experiment.changes.filter(message="Enrollment Completed").count(), 2
+        )
+
+    def test_paused_values_are_saved_in_bulk(self):
+        paused_experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1234, is_paused=False
+        )
+        unpaused_experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1235, is_paused=True
+        )
+        unchanged_experiment = ExperimentFactory.create_with_status(
+            target_status=Experiment.STATUS_LIVE, normandy_id=1236, is_paused=False
+        )
+
+        def determine_response(url, verify=None, params={}):
+            if "1234" in url:
+                return self.buildMockSuccessEnabledResponse()
+            return self.buildMockSucessWithNoPauseEnrollment()
+
+        self.mock_normandy_requests_get.side_effect = determine_response
+
+        tasks.update_launched_experiments()
+
+        paused_experiment = Experiment.objects.get(id=paused_experiment.id)
+        self.assertTrue(paused_experiment.is_paused)
+        self.assertEqual(
+            paused_experiment.changes.latest().message, "Enrollment Completed"
+        )
+        self.assertEqual(
+            paused_experiment.latest_change, paused_experiment.changes.latest().changed_on
+        )
+
+        unpaused_experiment = Experiment.objects.get(id=unpaused_experiment.id)
+        self.assertFalse(unpaused_experiment.is_paused)
+        self.assertEqual(
+            unpaused_experiment.changes.latest().message, "Enrollment Re-enabled"
+        )
+
+        self.assertFalse(
+            unchanged_experiment.changes.filter(
+                message__in=["Enrollment Completed", "Enrollment Re-enabled"]
+            ).exists()
+        )
+
     def test_experiment_without_normandy_ids(self):
         ExperimentFactory.create_with_status(
             target_status=Experiment.STATUS_LIVE, normandy_id=None
@@ -283,6 +476,7 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
 
         tasks.update_launched_experiments()
 
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), 1)
 
     def test_accepted_experiment_becomes_live_if_normandy_enabled(self):
@@ -300,10 +494,11 @@ class TestUpdateExperimentTask(MockNormandyTasksMixin, MockNormandyMixin, TestCa
         tasks.update_launched_experiments()
         experiment = Experiment.objects.get(normandy_id=1234)
 
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(
             mail.outbox[0].recipients(),
-            [experiment.owner.email, experiment.analysis_owner],
+            [experiment.owner.email, experiment.analysis_owner.email],
         )
 
     def test_live_rollout_updates_population_percent(self):
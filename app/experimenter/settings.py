@@ -65,6 +65,7 @@ INSTALLED_APPS = [
     "widget_tweaks",
     # Experimenter
     "experimenter.base",
+    "experimenter.bugzilla",
     "experimenter.experiments",
     "experimenter.kinto",
     "experimenter.normandy",
@@ -72,6 +73,7 @@ INSTALLED_APPS = [
     "experimenter.openidc",
     "experimenter.outcomes",
     "experimenter.projects",
+    "experimenter.visualization",
 ]
 
 MIDDLEWARE = [
@@ -263,6 +265,15 @@ EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 EMAIL_USE_TLS = not DEBUG
 EMAIL_USE_SSL = False
 
+# Emails are queued and sent in batches of EMAIL_OUTBOX_BATCH_SIZE every
+# EMAIL_OUTBOX_INTERVAL seconds, giving up after EMAIL_OUTBOX_MAX_ATTEMPTS, and
+# emails that are being sent are skipped by other runs for
+# EMAIL_OUTBOX_CLAIM_TIMEOUT seconds
+EMAIL_OUTBOX_INTERVAL = config("EMAIL_OUTBOX_INTERVAL", default=60, cast=int)
+EMAIL_OUTBOX_BATCH_SIZE = config("EMAIL_OUTBOX_BATCH_SIZE", default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config("EMAIL_OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+EMAIL_OUTBOX_CLAIM_TIMEOUT = config("EMAIL_OUTBOX_CLAIM_TIMEOUT", default=300, cast=int)
+
 # Email to send to when an experiment is ready for review
 EMAIL_REVIEW = config("EMAIL_REVIEW")
 
@@ -276,6 +287,32 @@ EMAIL_RELEASE_DRIVERS = config("EMAIL_RELEASE_DRIVERS")
 BUGZILLA_HOST = config("BUGZILLA_HOST")
 BUGZILLA_API_KEY = config("BUGZILLA_API_KEY")
 BUGZILLA_CC_LIST = config("BUGZILLA_CC_LIST", default="")
+BUGZILLA_API_TIMEOUT = config("BUGZILLA_API_TIMEOUT", default=10, cast=float)
+BUGZILLA_API_MAX_RETRIES = config("BUGZILLA_API_MAX_RETRIES", default=2, cast=int)
+
+# Bug updates are queued and sent every BUGZILLA_OUTBOX_INTERVAL seconds at no
+# more than BUGZILLA_OUTBOX_RATE requests per second, an update that keeps
+# failing is dropped after BUGZILLA_OUTBOX_MAX_ATTEMPTS attempts, and an update
+# that is being sent is skipped by other runs for BUGZILLA_OUTBOX_CLAIM_TIMEOUT
+# seconds
+BUGZILLA_OUTBOX_INTERVAL = config("BUGZILLA_OUTBOX_INTERVAL", default=60, cast=int)
+BUGZILLA_OUTBOX_RATE = config("BUGZILLA_OUTBOX_RATE", default=1, cast=float)
+BUGZILLA_OUTBOX_MAX_ATTEMPTS = config("BUGZILLA_OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+BUGZILLA_OUTBOX_CLAIM_TIMEOUT = config(
+    "BUGZILLA_OUTBOX_CLAIM_TIMEOUT", default=300, cast=int
+)
+
+# Bugzilla user and bug lookups are cached for BUGZILLA_EXISTS_CACHE_TIMEOUT
+# seconds when found and BUGZILLA_MISSING_CACHE_TIMEOUT seconds when not, and
+# the owners of unsubmitted experiments are looked up ahead of time every
+# BUGZILLA_PREWARM_INTERVAL seconds
+BUGZILLA_EXISTS_CACHE_TIMEOUT = config(
+    "BUGZILLA_EXISTS_CACHE_TIMEOUT", default=86400, cast=int
+)
+BUGZILLA_MISSING_CACHE_TIMEOUT = config(
+    "BUGZILLA_MISSING_CACHE_TIMEOUT", default=300, cast=int
+)
+BUGZILLA_PREWARM_INTERVAL = config("BUGZILLA_PREWARM_INTERVAL", default=3600, cast=int)
 BUGZILLA_CREATE_PATH = "/rest/bug"
 BUGZILLA_CREATE_URL = "{path}?api_key={api_key}".format(
     path=urljoin(BUGZILLA_HOST, BUGZILLA_CREATE_PATH), api_key=BUGZILLA_API_KEY
@@ -303,6 +340,20 @@ REDIS_HOST = config("REDIS_HOST")
 REDIS_PORT = config("REDIS_PORT")
 REDIS_DB = config("REDIS_DB")
 
+# Cache, shared by the web and worker processes through its own Redis database
+REDIS_CACHE_DB = config("REDIS_CACHE_DB", default=1, cast=int)
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django_redis.cache.RedisCache"),
+        "LOCATION": config(
+            "CACHE_LOCATION",
+            default="redis://{host}:{port}/{db}".format(
+                host=REDIS_HOST, port=REDIS_PORT, db=REDIS_CACHE_DB
+            ),
+        ),
+    }
+}
+
 # Celery
 CELERY_BROKER_URL = "redis://{host}:{port}/{db}".format(
     host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB
@@ -336,6 +387,22 @@ CELERY_BEAT_SCHEDULE = {
         "task": "experimenter.kinto.tasks.nimbus_synchronize_preview_experiments_in_kinto",
         "schedule": config("CELERY_SCHEDULE_INTERVAL", default=300, cast=int),
     },
+    "fetch_jetstream_data": {
+        "task": "experimenter.visualization.tasks.fetch_jetstream_data",
+        "schedule": config("CELERY_SCHEDULE_INTERVAL", default=300, cast=int),
+    },
+    "send_bugzilla_updates": {
+        "task": "experimenter.bugzilla.tasks.send_bugzilla_updates",
+        "schedule": BUGZILLA_OUTBOX_INTERVAL,
+    },
+    "prewarm_bugzilla_user_cache": {
+        "task": "experimenter.bugzilla.tasks.prewarm_bugzilla_user_cache",
+        "schedule": BUGZILLA_PREWARM_INTERVAL,
+    },
+    "send_queued_emails": {
+        "task": "experimenter.experiments.tasks.send_queued_emails",
+        "schedule": EMAIL_OUTBOX_INTERVAL,
+    },
 }
 
 # Recipe Configuration
@@ -371,6 +438,14 @@ MARKUS_BACKEND = [
 NORMANDY_API_HOST = config("NORMANDY_API_HOST")
 NORMANDY_API_RECIPE_URL = urljoin(NORMANDY_API_HOST, "/api/v3/recipe/{id}/")
 NORMANDY_API_RECIPES_LIST_URL = urljoin(NORMANDY_API_HOST, "/api/v3/recipe/")
+NORMANDY_API_TIMEOUT = config("NORMANDY_API_TIMEOUT", default=10, cast=float)
+NORMANDY_API_MAX_RETRIES = config("NORMANDY_API_MAX_RETRIES", default=2, cast=int)
+
+# Launched experiments whose recipe and synced fields are unchanged since the
+# last tick skip the recipe sync, for at most NORMANDY_RECIPE_CACHE_TIMEOUT seconds
+NORMANDY_RECIPE_CACHE_TIMEOUT = config(
+    "NORMANDY_RECIPE_CACHE_TIMEOUT", default=3600, cast=int
+)
 
 NORMANDY_DEVTOOLS_HOST = config("NORMANDY_DEVTOOLS_HOST")
 NORMANDY_DEVTOOLS_RECIPE_URL = "{root}{recipe_url}".format(
@@ -414,6 +489,15 @@ DEFAULT_FILE_STORAGE = "storages.backends.gcloud.GoogleCloudStorage"
 GS_PROJECT_ID = "experiments-analysis"
 GS_BUCKET_NAME = "mozanalysis"
 
+# Parsed Jetstream GCS objects are cached for GCS_CACHE_TIMEOUT seconds and
+# revalidated against the object generation after GCS_CACHE_REVALIDATE seconds
+GCS_CACHE_TIMEOUT = config("GCS_CACHE_TIMEOUT", default=86400, cast=int)
+GCS_CACHE_REVALIDATE = config("GCS_CACHE_REVALIDATE", default=300, cast=int)
+
+# Completed experiments keep having their Jetstream results fetched for
+# JETSTREAM_RESULTS_WINDOW days after they end
+JETSTREAM_RESULTS_WINDOW = config("JETSTREAM_RESULTS_WINDOW", default=14, cast=int)
+
 NIMBUS_SCHEMA_VERSION = pkg_resources.get_distribution("mozilla-nimbus-shared").version
 
 
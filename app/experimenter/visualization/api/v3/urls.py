@@ -1,11 +1,19 @@
 from django.conf.urls import url
 
-from experimenter.visualization.api.v3.views import analysis_results_view
+from experimenter.visualization.api.v3.views import (
+    analysis_results_batch_view,
+    analysis_results_view,
+)
 
 urlpatterns = [
+    url(
+        r"^visualization/$",
+        analysis_results_batch_view,
+        name="visualization-analysis-batch",
+    ),
     url(
         r"^visualization/(?P<slug>[\w-]+)/$",
         analysis_results_view,
         name="visualization-analysis-data",
-    )
+    ),
 ]
@@ -1,14 +1,23 @@
+import codecs
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import markus
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import default_storage
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 from experimenter.experiments.models import NimbusExperiment
 
+metrics = markus.get_metrics("visualization.api")
+
 
 class Significance:
     POSITIVE = "positive"
@@ -40,17 +49,254 @@ BRANCH_DATA = "branch_data"
 PRIMARY_METRIC_SUFFIX = "_ever_used"
 STATISTICS_FOLDER = "statistics"
 METADATA_FOLDER = "metadata"
+WINDOWS = ["daily", "weekly", "overall"]
+GCS_CACHE_KEY = "jetstream-gcs:{path}:{row_filter}"
+BATCH_RESULTS_KEYS = [METADATA_FOLDER, "overall", "other_metrics"]
+BATCH_WINDOWS = ["overall"]
+BATCH_MAX_EXPERIMENTS = 50
+BATCH_MAX_WORKERS = 8
+JSON_CHUNK_SIZE = 64 * 1024
+GCS_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+JSON_ITEM_DELIMITERS = frozenset(" \t\n\r,]")
+
+# Statistics that can end up in a results object, rows with any other
+# statistic are dropped while the statistics file is being parsed.
+RESULTS_STATISTICS = set([Statistic.BINOMIAL, Statistic.MEAN, Statistic.COUNT])
+
+
+def is_results_row(row):
+    return (
+        row.get("metric") == Metric.USER_COUNT
+        or row.get("statistic") in RESULTS_STATISTICS
+    )
 
 
-def load_data_from_gcs(path):
-    return (
-        json.loads(default_storage.open(path).read())
-        if default_storage.exists(path)
-        else None
+def iter_json_array(stream, chunk_size=JSON_CHUNK_SIZE):
+    """
+    Yields the items of the top level JSON array in stream one at a time,
+    reading chunk_size characters at a time instead of the whole stream.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    started = False
+    finished = False
+
+    while True:
+        position = JSON_WHITESPACE.match(buffer, position).end()
+
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                position += 1
+                continue
+
+            if buffer[position] == "]":
+                return
+
+            if buffer[position] == ",":
+                position += 1
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if finished:
+                    raise
+            else:
+                # A value is only complete once a delimiter follows it, as
+                # raw_decode also accepts a number cut short by the chunk.
+                if finished or (
+                    end < len(buffer) and buffer[end] in JSON_ITEM_DELIMITERS
+                ):
+                    yield item
+                    position = end
+                    continue
+
+        if finished:
+            raise ValueError("Unexpected end of JSON array")
+
+        chunk = stream.read(chunk_size)
+        finished = not chunk
+        if isinstance(chunk, bytes):
+            chunk = text_decoder.decode(chunk, final=finished)
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+class GCSObjectStream:
+    """
+    A read only stream over a GCS object that downloads it one range at a time,
+    so reading it never holds more than a range of it in memory.
+    """
+
+    def __init__(self, blob):
+        self.blob = blob
+        self.position = 0
+
+    def read(self, size):
+        if self.position >= self.blob.size:
+            return b""
+
+        chunk = self.blob.download_as_bytes(
+            start=self.position, end=min(self.position + size, self.blob.size) - 1
+        )
+        self.position += len(chunk)
+        return chunk
+
+
+def get_gcs_blob(path):
+    # A single metadata request that tells us both whether the object
+    # exists and which version of it is currently published.
+    return default_storage.bucket.get_blob(path)
+
+
+def load_gcs_object(path, row_filter=None):
+    cache_key = GCS_CACHE_KEY.format(
+        path=path, row_filter=row_filter.__name__ if row_filter else "all"
     )
+    cached = cache.get(cache_key)
+    now = time.time()
+
+    if cached is not None and now - cached["checked_on"] < settings.GCS_CACHE_REVALIDATE:
+        return cached["generation"], cached["data"]
+
+    blob = get_gcs_blob(path)
+    generation = blob.generation if blob is not None else None
+    if cached is not None and cached["generation"] == generation:
+        data = cached["data"]
+    elif blob is not None and row_filter is not None:
+        data = list(
+            filter(
+                row_filter,
+                iter_json_array(GCSObjectStream(blob), GCS_DOWNLOAD_CHUNK_SIZE),
+            )
+        )
+    elif blob is not None:
+        data = json.loads(blob.download_as_bytes())
+    else:
+        data = None
+
+    cache.set(
+        cache_key,
+        {"generation": generation, "checked_on": now, "data": data},
+        settings.GCS_CACHE_TIMEOUT,
+    )
+    return generation, data
+
+
+def load_data_from_gcs(path):
+    _, data = load_gcs_object(path)
+    return data
+
+
+class StatisticsColumns:
+    """
+    The rows of a single branch, metric, statistic and comparison stored as
+    parallel columns, so a group is a handful of lists instead of a dict per row.
+    """
+
+    __slots__ = ("lower", "upper", "point", "window_index")
+
+    def __init__(self):
+        self.lower = []
+        self.upper = []
+        self.point = []
+        self.window_index = []
+
+    def __len__(self):
+        return len(self.point)
+
+    def append(self, row):
+        self.lower.append(row.get("lower"))
+        self.upper.append(row.get("upper"))
+        self.point.append(row.get("point"))
+        self.window_index.append(row.get("window_index"))
+
+    def significance(self):
+        # Computed for the whole column at once, None where either bound is
+        # missing or zero.
+        return [
+            compute_significance(lower, upper) if lower and upper else None
+            for lower, upper in zip(self.lower, self.upper)
+        ]
+
+
+class StatisticsIndex:
+    """
+    Groups the rows of a Jetstream statistics file by branch, metric, statistic
+    and comparison in a single pass.  Every section of the results is derived
+    from the index, so the rows are never scanned again.
+    """
+
+    def __init__(self, data=None):
+        # (branch, metric, statistic, comparison) -> (first row number, columns)
+        self.groups = {}
+        # (metric, statistic) -> first row number
+        self.metric_statistics = {}
+        # window_index -> retention rows
+        self.retention = {}
+        self.user_count_total = 0
+        self.user_counts = {}
+        self.size = 0
+
+        if data:
+            self.extend(data)
+
+    def add(self, row):
+        self.extend([row])
+
+    def extend(self, data):
+        # This runs for every row of every statistics file so it sticks to
+        # local names and a single dict lookup per row.
+        groups = self.groups
+        retention = self.retention
+        user_counts = self.user_counts
+        size = self.size
+
+        for row in data:
+            metric = row.get("metric")
+            statistic = row.get("statistic")
+            branch = row.get("branch")
+            key = (
+                branch,
+                metric,
+                statistic,
+                row.get("comparison", BranchComparison.ABSOLUTE),
+            )
+
+            group = groups.get(key)
+            if group is None:
+                columns = StatisticsColumns()
+                groups[key] = (size, columns)
+                self.metric_statistics.setdefault((metric, statistic), size)
+            else:
+                columns = group[1]
+
+            columns.append(row)
+
+            if metric == Metric.USER_COUNT and statistic == Statistic.COUNT:
+                self.user_count_total += row["point"]
+                user_counts[branch] = row["point"]
+            elif metric == Metric.RETENTION:
+                retention.setdefault(row.get("window_index"), []).append(row)
 
+            size += 1
 
-def get_results_metrics_map(data, primary_outcomes, secondary_outcomes):
+        self.size = size
+
+    def ordered_groups(self):
+        return sorted(
+            ((first, key, columns) for key, (first, columns) in self.groups.items()),
+            key=lambda group: group[0],
+        )
+
+
+def get_results_metrics_map(index, primary_outcomes, secondary_outcomes):
     # A mapping of metric label to relevant statistic. This is
     # used to see which statistic will be used for each metric.
     RESULTS_METRICS_MAP = {
@@ -69,38 +315,37 @@ def get_results_metrics_map(data, primary_outcomes, secondary_outcomes):
         RESULTS_METRICS_MAP[outcome_slug] = set([Statistic.MEAN])
 
     other_metrics_map, other_metrics = get_other_metrics_names_and_map(
-        data, RESULTS_METRICS_MAP
+        index, RESULTS_METRICS_MAP
     )
     RESULTS_METRICS_MAP.update(other_metrics_map)
 
     return RESULTS_METRICS_MAP, primary_metrics_set, other_metrics
 
 
-def get_other_metrics_names_and_map(data, RESULTS_METRICS_MAP):
+def get_other_metrics_names_and_map(index, RESULTS_METRICS_MAP):
     # These are metrics sent from Jetstream that are not explicitly chosen
     # by users to be either primary or secondary
     other_metrics_names = {}
     other_metrics_map = {}
 
-    # This is an ordered list of priorities of stats to graph
-    priority_stats = [Statistic.MEAN, Statistic.BINOMIAL]
-    other_data = [
-        data_point
-        for data_point in data
-        if data_point["metric"] not in RESULTS_METRICS_MAP
-    ]
-    for row in other_data:
-        metric = row.get("metric")
-        statistic = row.get("statistic")
-
-        if statistic in priority_stats:
-            metric_title = " ".join([word.title() for word in metric.split("_")])
-            other_metrics_names[metric] = metric_title
+    # This is an ordered mapping of priorities of stats to graph
+    priority_stats = {Statistic.MEAN: 0, Statistic.BINOMIAL: 1}
+    for metric, statistic in sorted(
+        index.metric_statistics, key=index.metric_statistics.get
+    ):
+        if metric in RESULTS_METRICS_MAP or statistic not in priority_stats:
+            continue
+
+        if metric not in other_metrics_names:
+            other_metrics_names[metric] = " ".join(
+                [word.title() for word in metric.split("_")]
+            )
 
-            if metric not in other_metrics_map or priority_stats.index(
-                statistic
-            ) < priority_stats.index(other_metrics_map[metric]):
-                other_metrics_map[metric] = statistic
+        if (
+            metric not in other_metrics_map
+            or priority_stats[statistic] < priority_stats[other_metrics_map[metric]]
+        ):
+            other_metrics_map[metric] = statistic
 
     # Turn other_metrics_map into the format needed
     # by get_result_metrics_map()
@@ -109,16 +354,10 @@ def get_other_metrics_names_and_map(data, RESULTS_METRICS_MAP):
     return other_metrics_map, other_metrics_names
 
 
-def append_population_percentages(data):
-    total_population = 0
-    branches = {}
-    for row in data:
-        if row["metric"] == Metric.USER_COUNT:
-            total_population += row["point"]
-            branches[row["branch"]] = row["point"]
-
-    for branch_name, branch_user_count in sorted(branches.items()):
-        data.append(
+def append_population_percentages(index):
+    total_population = index.user_count_total
+    for branch_name, branch_user_count in sorted(index.user_counts.items()):
+        index.add(
             {
                 "metric": Metric.USER_COUNT,
                 "statistic": Statistic.PERCENT,
@@ -155,133 +394,267 @@ def append_conversion_count(results, primary_metrics_set):
             absolute_primary_metric_vals["first"]["count"] = conversion_count
 
 
-def get_week_x_retention(week_index, weekly_data):
-    weekly_data = weekly_data or []
-    return [
-        row
-        for row in weekly_data
-        if row["window_index"] == str(week_index) and row["metric"] == Metric.RETENTION
-    ]
-
-
-def append_retention_data(overall_data, weekly_data):
+def append_retention_data(overall_index, weekly_index):
     # Try to get the two-week retention data. If it doesn't
     # exist (experiment was too short), settle for 1 week.
-    retention_data = get_week_x_retention(2, weekly_data)
-    if len(retention_data) == 0:
-        retention_data = get_week_x_retention(1, weekly_data)
+    retention_data = weekly_index.retention.get("2") or weekly_index.retention.get(
+        "1", []
+    )
 
-    overall_data.extend(retention_data)
+    overall_index.extend(retention_data)
 
 
-def process_data_for_consumption(overall_data, weekly_data, experiment):
-    append_population_percentages(overall_data)
-    append_retention_data(overall_data, weekly_data)
+def process_data_for_consumption(overall_index, weekly_index, experiment):
+    append_population_percentages(overall_index)
+    append_retention_data(overall_index, weekly_index)
     results, primary_metrics_set, other_metrics = generate_results_object(
-        overall_data, experiment
+        overall_index, experiment
     )
     append_conversion_count(results, primary_metrics_set)
     return results, other_metrics
 
 
-def generate_results_object(data, experiment, window="overall"):
+def generate_results_object(index, experiment, window="overall"):
     results = {}
 
     result_metrics, primary_metrics_set, other_metrics = get_results_metrics_map(
-        data, experiment.primary_outcomes, experiment.secondary_outcomes
+        index, experiment.primary_outcomes, experiment.secondary_outcomes
     )
-    for row in data:
-        branch = row.get("branch")
-        metric = row.get("metric")
-        lower = row.get("lower")
-        upper = row.get("upper")
-        point = row.get("point")
-        statistic = row.get("statistic")
+    for _, (branch, metric, statistic, comparison), columns in index.ordered_groups():
+        if metric not in result_metrics or statistic not in result_metrics[metric]:
+            continue
+
+        if branch not in results:
+            results[branch] = {
+                "is_control": experiment.reference_branch.slug == branch,
+                BRANCH_DATA: {},
+            }
 
-        # For "overall" data, set window_index to 1 for uniformity
-        window_index = 1 if window == "overall" else row.get("window_index")
+        branch_data = results[branch][BRANCH_DATA]
+        if metric not in branch_data:
+            branch_data[metric] = {
+                BranchComparison.ABSOLUTE: {"all": [], "first": {}},
+                BranchComparison.DIFFERENCE: {"all": [], "first": {}},
+                BranchComparison.UPLIFT: {"all": [], "first": {}},
+                "significance": {"overall": {}, "weekly": {}},
+            }
+            branch_data[metric]["significance"].setdefault(window, {})
 
-        if metric in result_metrics and statistic in result_metrics[metric]:
-            results[branch] = results.get(
-                branch,
-                {
-                    "is_control": experiment.reference_branch.slug == branch,
-                    BRANCH_DATA: {},
-                },
-            )
+        if metric == Metric.USER_COUNT and statistic == Statistic.PERCENT:
+            branch_data[Metric.USER_COUNT]["percent"] = columns.point[-1]
+            continue
 
-            results[branch][BRANCH_DATA][metric] = results[branch][BRANCH_DATA].get(
-                metric,
+        # For "overall" data, set window_index to 1 for uniformity
+        if window == "overall":
+            window_indexes = [1] * len(columns)
+        else:
+            window_indexes = columns.window_index
+
+        if comparison == BranchComparison.DIFFERENCE:
+            significance = branch_data[metric]["significance"][window]
+            for window_index, value in zip(window_indexes, columns.significance()):
+                if value is not None:
+                    significance[window_index] = value
+
+        if window == "overall":
+            data_points = [
+                {"lower": lower, "upper": upper, "point": point}
+                for lower, upper, point in zip(
+                    columns.lower, columns.upper, columns.point
+                )
+            ]
+        else:
+            data_points = [
                 {
-                    BranchComparison.ABSOLUTE: {"all": [], "first": {}},
-                    BranchComparison.DIFFERENCE: {"all": [], "first": {}},
-                    BranchComparison.UPLIFT: {"all": [], "first": {}},
-                    "significance": {"overall": {}, "weekly": {}},
-                },
-            )
+                    "lower": lower,
+                    "upper": upper,
+                    "point": point,
+                    "window_index": window_index,
+                }
+                for lower, upper, point, window_index in zip(
+                    columns.lower, columns.upper, columns.point, window_indexes
+                )
+            ]
 
-            if metric == Metric.USER_COUNT and statistic == Statistic.PERCENT:
-                results[branch][BRANCH_DATA][Metric.USER_COUNT]["percent"] = point
-                continue
+        results_at_comparison = branch_data[metric][comparison]
+        if len(results_at_comparison["all"]) == 0:
+            results_at_comparison["first"] = data_points[0]
+        results_at_comparison["all"].extend(data_points)
 
-            comparison = row.get("comparison", BranchComparison.ABSOLUTE)
-            if comparison == BranchComparison.DIFFERENCE and lower and upper:
-                results[branch][BRANCH_DATA][metric]["significance"][window][
-                    window_index
-                ] = compute_significance(lower, upper)
+    return results, primary_metrics_set, other_metrics
 
-            data_point = {
-                "lower": lower,
-                "upper": upper,
-                "point": point,
-            }
-            if window == "weekly":
-                data_point["window_index"] = window_index
 
-            results_at_comparison = results[branch][BRANCH_DATA][metric][comparison]
-            if len(results_at_comparison["all"]) == 0:
-                results_at_comparison["first"] = data_point
+def get_data_path(slug, window):
+    filename = f"statistics_{slug}_{window}.json"
+    return os.path.join(STATISTICS_FOLDER, filename)
 
-            results[branch][BRANCH_DATA][metric][comparison]["all"].append(data_point)
 
-    return results, primary_metrics_set, other_metrics
+def get_metadata_path(slug):
+    filename = f"metadata_{slug}.json"
+    return os.path.join(METADATA_FOLDER, filename)
 
 
-def get_data(slug, window):
-    filename = f"statistics_{slug}_{window}.json"
-    path = os.path.join(STATISTICS_FOLDER, filename)
-    return load_data_from_gcs(path)
+def get_recipe_slug(experiment):
+    return experiment.slug.replace("-", "_")
 
 
-def get_metadata(slug):
-    filename = f"metadata_{slug}.json"
-    path = os.path.join(METADATA_FOLDER, filename)
-    return load_data_from_gcs(path)
+def get_experiment_paths(experiment, windows=WINDOWS):
+    recipe_slug = get_recipe_slug(experiment)
+    paths = {METADATA_FOLDER: get_metadata_path(recipe_slug)}
+    for window in windows:
+        paths[window] = get_data_path(recipe_slug, window)
+    return paths
 
 
-@api_view()
-def analysis_results_view(request, slug):
-    windows = ["daily", "weekly", "overall"]
-    experiment = get_object_or_404(NimbusExperiment.objects.filter(slug=slug))
-    raw_data = {}
+def load_timed_gcs_object(name, path):
+    with metrics.timer("load_gcs_object.timing", tags=[f"object:{name}"]):
+        return load_gcs_object(path, is_results_row if name in WINDOWS else None)
+
+
+def load_gcs_objects(paths):
+    # The objects are independent of each other so they are fetched in
+    # parallel, which bounds the latency by the slowest object.
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        futures = {
+            name: executor.submit(load_timed_gcs_object, name, path)
+            for name, path in paths.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def get_experiment_generations(experiment):
+    paths = get_experiment_paths(experiment)
+    objects = load_gcs_objects(paths)
+    return {paths[name]: generation for name, (generation, _) in objects.items()}
+
+
+def get_experiment_data(experiment, windows=WINDOWS):
+    # The overall results carry the retention from the weekly data, so it is
+    # loaded whenever they are built.
+    loaded_windows = [
+        window
+        for window in WINDOWS
+        if window in windows or (window == "weekly" and "overall" in windows)
+    ]
+    with metrics.timer("get_experiment_data.timing"):
+        raw_data = {
+            name: data
+            for name, (_, data) in load_gcs_objects(
+                get_experiment_paths(experiment, loaded_windows)
+            ).items()
+        }
 
-    recipe_slug = experiment.slug.replace("-", "_")
     experiment_data = {
-        "show_analysis": settings.FEATURE_ANALYSIS,
-        "metadata": get_metadata(recipe_slug),
+        "metadata": raw_data[METADATA_FOLDER],
     }
 
+    weekly_index = StatisticsIndex(raw_data.get("weekly"))
     for window in windows:
-        data = raw_data[window] = get_data(recipe_slug, window)
+        data = raw_data[window]
 
         if data and window == "overall":
             data, other_metrics = process_data_for_consumption(
-                data, raw_data["weekly"], experiment
+                StatisticsIndex(data), weekly_index, experiment
             )
             experiment_data["other_metrics"] = other_metrics
         elif data and window == "weekly":
-            data, _, _ = generate_results_object(data, experiment, window)
+            data, _, _ = generate_results_object(weekly_index, experiment, window)
+        elif data:
+            data, _, _ = generate_results_object(
+                StatisticsIndex(data), experiment, window
+            )
 
         experiment_data[window] = data
 
-    return Response(experiment_data)
+    return experiment_data
+
+
+def get_results_slice(experiment_data, window=None, metric=None):
+    if window is not None:
+        experiment_data = {
+            key: value
+            for key, value in experiment_data.items()
+            if key == window or key not in WINDOWS
+        }
+
+    if metric is not None:
+        experiment_data = {**experiment_data}
+        for key in WINDOWS:
+            if experiment_data.get(key):
+                experiment_data[key] = {
+                    branch: {
+                        **branch_results,
+                        BRANCH_DATA: {
+                            branch_metric: metric_results
+                            for branch_metric, metric_results in branch_results[
+                                BRANCH_DATA
+                            ].items()
+                            if branch_metric == metric
+                        },
+                    }
+                    for branch, branch_results in experiment_data[key].items()
+                }
+
+    return experiment_data
+
+
+@api_view()
+def analysis_results_view(request, slug):
+    window = request.query_params.get("window")
+    metric = request.query_params.get("metric")
+    if window is not None and window not in WINDOWS:
+        raise ValidationError({"window": [f"Must be one of {', '.join(WINDOWS)}."]})
+
+    experiment = get_object_or_404(NimbusExperiment.objects.filter(slug=slug))
+
+    # Results are precomputed by the fetch_jetstream_data task, experiments
+    # it has not reached yet are computed on demand.
+    experiment_data = experiment.results_data
+    if experiment_data is None:
+        experiment_data = get_experiment_data(experiment)
+
+    return Response(
+        {
+            "show_analysis": settings.FEATURE_ANALYSIS,
+            **get_results_slice(experiment_data, window, metric),
+        }
+    )
+
+
+def get_experiment_batch_results(experiment):
+    experiment_data = experiment.results_data
+    if experiment_data is None:
+        experiment_data = get_experiment_data(experiment, BATCH_WINDOWS)
+
+    return {key: experiment_data.get(key) for key in BATCH_RESULTS_KEYS}
+
+
+@api_view()
+def analysis_results_batch_view(request):
+    slugs = [slug for slug in request.query_params.get("slugs", "").split(",") if slug]
+    if not slugs:
+        raise ValidationError({"slugs": ["At least one experiment slug is required."]})
+    if len(slugs) > BATCH_MAX_EXPERIMENTS:
+        raise ValidationError(
+            {"slugs": [f"At most {BATCH_MAX_EXPERIMENTS} experiments can be requested."]}
+        )
+
+    experiments = NimbusExperiment.objects.filter(slug__in=slugs).select_related(
+        "reference_branch"
+    )
+
+    # Experiments without precomputed results are built from Jetstream data in
+    # parallel so the request is bounded by the slowest experiment.
+    with ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS) as executor:
+        futures = {
+            experiment.slug: executor.submit(get_experiment_batch_results, experiment)
+            for experiment in experiments
+        }
+        results = {slug: future.result() for slug, future in futures.items()}
+
+    return Response(
+        {
+            "show_analysis": settings.FEATURE_ANALYSIS,
+            "experiments": {slug: results.get(slug) for slug in slugs},
+        }
+    )
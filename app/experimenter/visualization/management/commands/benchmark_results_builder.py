@@ -0,0 +1,109 @@
+import logging
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from experimenter.experiments.models import NimbusBranch, NimbusExperiment
+from experimenter.visualization.api.v3.views import (
+    BranchComparison,
+    Metric,
+    Statistic,
+    StatisticsIndex,
+    generate_results_object,
+    process_data_for_consumption,
+)
+
+logger = logging.getLogger()
+
+CONTROL_BRANCH = "control"
+DECILES = 10
+
+
+def generate_statistics(branches, metrics, windows):
+    """
+    Generates rows shaped like a Jetstream statistics file: every metric has a
+    mean or binomial statistic plus deciles, compared in absolute terms for every
+    branch and as difference and relative uplift for treatment branches.
+    """
+    rows = []
+    metric_statistics = [(Metric.USER_COUNT, Statistic.COUNT)] + [
+        (f"metric_{i}", random.choice([Statistic.MEAN, Statistic.BINOMIAL]))
+        for i in range(metrics)
+    ]
+    metric_statistics.append((Metric.RETENTION, Statistic.BINOMIAL))
+
+    for window_index in range(1, windows + 1):
+        for branch in branches:
+            comparisons = [BranchComparison.ABSOLUTE]
+            if branch != CONTROL_BRANCH:
+                comparisons += [BranchComparison.DIFFERENCE, BranchComparison.UPLIFT]
+
+            for metric, statistic in metric_statistics:
+                for comparison in comparisons:
+                    point = random.uniform(-1, 1)
+                    row = {
+                        "metric": metric,
+                        "statistic": statistic,
+                        "branch": branch,
+                        "comparison": comparison,
+                        "window_index": str(window_index),
+                        "point": point,
+                        "lower": point - random.random(),
+                        "upper": point + random.random(),
+                    }
+                    if metric == Metric.USER_COUNT:
+                        row["point"] = random.randint(1000, 100000)
+                    rows.append(row)
+
+                    for decile in range(DECILES):
+                        rows.append(
+                            {
+                                **row,
+                                "statistic": "deciles",
+                                "parameter": str(decile / DECILES),
+                            }
+                        )
+
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Benchmarks building analysis results from large Jetstream outputs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--branches", default=3, type=int)
+        parser.add_argument("--metrics", default=100, type=int)
+        parser.add_argument("--weeks", default=12, type=int)
+        parser.add_argument("--repeat", default=5, type=int)
+
+    def handle(self, *args, **options):
+        branches = [CONTROL_BRANCH] + [
+            f"treatment-{i}" for i in range(1, options["branches"])
+        ]
+        weekly_data = generate_statistics(branches, options["metrics"], options["weeks"])
+        overall_data = generate_statistics(branches, options["metrics"], 1)
+
+        experiment = NimbusExperiment(primary_outcomes=[], secondary_outcomes=[])
+        experiment.reference_branch = NimbusBranch(slug=CONTROL_BRANCH)
+
+        timings = []
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            weekly_index = StatisticsIndex(weekly_data)
+            generate_results_object(weekly_index, experiment, "weekly")
+            process_data_for_consumption(
+                StatisticsIndex(overall_data), weekly_index, experiment
+            )
+            timings.append(time.perf_counter() - started)
+
+        logger.info(
+            "Built results from {weekly} weekly and {overall} overall rows: "
+            "best {best:.1f}ms, mean {mean:.1f}ms over {repeat} runs".format(
+                weekly=len(weekly_data),
+                overall=len(overall_data),
+                best=min(timings) * 1000,
+                mean=sum(timings) / len(timings) * 1000,
+                repeat=options["repeat"],
+            )
+        )
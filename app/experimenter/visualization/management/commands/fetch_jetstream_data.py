@@ -0,0 +1,32 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from experimenter.experiments.models import NimbusExperiment
+from experimenter.visualization.tasks import fetch_experiment_data
+
+logger = logging.getLogger()
+
+
+class Command(BaseCommand):
+    help = "Precomputes Jetstream analysis results for experiments"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "slugs", nargs="*", help="Experiment slugs, defaults to all experiments"
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            default=False,
+            help="Rebuild results even if the Jetstream objects have not changed",
+        )
+
+    def handle(self, *args, **options):
+        experiments = NimbusExperiment.objects.all()
+        if options["slugs"]:
+            experiments = experiments.filter(slug__in=options["slugs"])
+
+        for experiment in experiments:
+            fetch_experiment_data(experiment.id, force=options["force"])
+            logger.info("Fetched analysis results for {}".format(experiment))
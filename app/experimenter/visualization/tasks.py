@@ -0,0 +1,101 @@
+import datetime
+import hashlib
+import json
+
+import markus
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from experimenter.celery import app
+from experimenter.experiments.models import NimbusExperiment
+from experimenter.visualization.api.v3.views import (
+    get_experiment_data,
+    get_experiment_generations,
+)
+
+logger = get_task_logger(__name__)
+metrics = markus.get_metrics("visualization.tasks")
+
+
+@app.task
+@metrics.timer_decorator("fetch_jetstream_data")
+def fetch_jetstream_data():
+    """
+    A scheduled task that precomputes the analysis results of every experiment
+    that Jetstream may still publish results for, the live experiments and the
+    ones that ended in the last JETSTREAM_RESULTS_WINDOW days.
+    """
+    metrics.incr("fetch_jetstream_data.started")
+
+    ended_after = timezone.now() - datetime.timedelta(
+        days=settings.JETSTREAM_RESULTS_WINDOW
+    )
+    experiment_ids = (
+        NimbusExperiment.objects.filter(
+            Q(status=NimbusExperiment.Status.LIVE)
+            | Q(
+                status=NimbusExperiment.Status.COMPLETE,
+                changes__old_status=NimbusExperiment.Status.LIVE,
+                changes__new_status=NimbusExperiment.Status.COMPLETE,
+                changes__changed_on__gte=ended_after,
+            )
+        )
+        .values_list("id", flat=True)
+        .distinct()
+    )
+    for experiment_id in experiment_ids:
+        fetch_experiment_data.delay(experiment_id)
+
+    metrics.incr("fetch_jetstream_data.completed")
+
+
+@app.task
+@metrics.timer_decorator("fetch_experiment_data")
+def fetch_experiment_data(experiment_id, force=False):
+    """
+    Checks the generations of an experiment's Jetstream objects and, when any of
+    them has been published or replaced or the experiment's outcomes changed
+    since the last run, rebuilds and stores the analysis results document served
+    by the results API.
+    """
+    metrics.incr("fetch_experiment_data.started")
+    experiment = NimbusExperiment.objects.get(id=experiment_id)
+
+    fingerprint = get_results_fingerprint(
+        experiment, get_experiment_generations(experiment)
+    )
+    if (
+        not force
+        and experiment.results_data is not None
+        and experiment.results_fingerprint == fingerprint
+    ):
+        metrics.incr("fetch_experiment_data.unchanged")
+        return
+
+    # Only the results are written, the experiment may have been edited while
+    # the Jetstream objects were being read
+    NimbusExperiment.objects.filter(id=experiment.id).update(
+        results_data=get_experiment_data(experiment),
+        results_fingerprint=fingerprint,
+    )
+
+    logger.info(f"{experiment} analysis results updated")
+    metrics.incr("fetch_experiment_data.updated")
+
+
+def get_results_fingerprint(experiment, generations):
+    # Covers the Jetstream objects and the experiment fields the results are
+    # built from, so a change to either rebuilds them.
+    content = json.dumps(
+        [
+            generations,
+            experiment.primary_outcomes,
+            experiment.secondary_outcomes,
+            experiment.reference_branch and experiment.reference_branch.slug,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
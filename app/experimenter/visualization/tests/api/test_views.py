@@ -1,31 +1,61 @@
+import copy
+import io
 import json
+from unittest import mock
 from unittest.mock import patch
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from parameterized import parameterized
 
 from experimenter.experiments.models import NimbusExperiment
 from experimenter.experiments.tests.factories import NimbusExperimentFactory
+from experimenter.visualization.api.v3.views import (
+    GCSObjectStream,
+    Significance,
+    StatisticsColumns,
+    StatisticsIndex,
+    get_experiment_data,
+    get_experiment_generations,
+    get_gcs_blob,
+    is_results_row,
+    iter_json_array,
+    load_data_from_gcs,
+    load_gcs_object,
+    load_gcs_objects,
+)
 from experimenter.visualization.tests.api.constants import TestConstants
 
 
+def build_mock_blob(content, generation=1):
+    content = content.encode() if isinstance(content, str) else content
+    mock_blob = mock.Mock(generation=generation, size=len(content))
+    mock_blob.download_as_bytes.side_effect = lambda start=0, end=None: content[
+        start : None if end is None else end + 1
+    ]
+    return mock_blob
+
+
 @override_settings(FEATURE_ANALYSIS=False)
 class TestVisualizationView(TestCase):
     maxDiff = None
 
+    def setUp(self):
+        cache.clear()
+
     @parameterized.expand(
         [
             NimbusExperiment.Status.ACCEPTED,
             NimbusExperiment.Status.COMPLETE,
         ]
     )
-    @patch("django.core.files.storage.default_storage.exists")
-    def test_analysis_results_view_no_data(self, status, mock_exists):
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_analysis_results_view_no_data(self, status, mock_get_blob):
         user_email = "user@example.com"
 
-        mock_exists.return_value = False
+        mock_get_blob.return_value = None
         primary_outcome = "outcome"
         experiment = NimbusExperimentFactory.create_with_status(
             target_status=status, primary_outcomes=[primary_outcome]
@@ -91,6 +121,15 @@ class TestVisualizationView(TestCase):
                 }
             )
 
+    def as_daily_results(self, weekly_results):
+        daily_results = copy.deepcopy(weekly_results)
+        for branch_results in daily_results.values():
+            for metric_results in branch_results["branch_data"].values():
+                significance = metric_results["significance"]
+                significance["daily"] = significance["weekly"]
+                significance["weekly"] = {}
+        return daily_results
+
     def add_all_outcome_data(
         self,
         data,
@@ -109,9 +148,8 @@ class TestVisualizationView(TestCase):
             NimbusExperiment.Status.COMPLETE,
         ]
     )
-    @patch("django.core.files.storage.default_storage.open")
-    @patch("django.core.files.storage.default_storage.exists")
-    def test_analysis_results_view_data(self, status, mock_exists, mock_open):
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_analysis_results_view_data(self, status, mock_get_blob):
         user_email = "user@example.com"
 
         (
@@ -120,32 +158,12 @@ class TestVisualizationView(TestCase):
             FORMATTED_DATA_WITH_POPULATION_PERCENTAGE,
         ) = TestConstants.get_test_data()
 
-        FULL_DATA = {
-            "daily": DATA_WITHOUT_POPULATION_PERCENTAGE,
-            "weekly": FORMATTED_DATA_WITHOUT_POPULATION_PERCENTAGE,
-            "overall": FORMATTED_DATA_WITH_POPULATION_PERCENTAGE,
-            "other_metrics": {
-                "some_count": "Some Count",
-                "another_count": "Another Count",
-            },
-            "metadata": {},
-            "show_analysis": False,
-        }
-
-        class File:
-            def __init__(self, filename):
-                self.name = filename
+        def get_blob(path):
+            if "metadata" in path:
+                return build_mock_blob("{}")
+            return build_mock_blob(json.dumps(DATA_WITHOUT_POPULATION_PERCENTAGE))
 
-            def read(self):
-                if "metadata" in self.name:
-                    return "{}"
-                return json.dumps(DATA_WITHOUT_POPULATION_PERCENTAGE)
-
-        def open_file(filename):
-            return File(filename)
-
-        mock_open.side_effect = open_file
-        mock_exists.return_value = True
+        mock_get_blob.side_effect = get_blob
         primary_outcome = "primary_outcome"
         secondary_outcome = "secondary_outcome"
         experiment = NimbusExperimentFactory.create_with_status(
@@ -161,6 +179,18 @@ class TestVisualizationView(TestCase):
             experiment.primary_outcomes,
         )
 
+        FULL_DATA = {
+            "daily": self.as_daily_results(FORMATTED_DATA_WITHOUT_POPULATION_PERCENTAGE),
+            "weekly": FORMATTED_DATA_WITHOUT_POPULATION_PERCENTAGE,
+            "overall": FORMATTED_DATA_WITH_POPULATION_PERCENTAGE,
+            "other_metrics": {
+                "some_count": "Some Count",
+                "another_count": "Another Count",
+            },
+            "metadata": {},
+            "show_analysis": False,
+        }
+
         response = self.client.get(
             reverse("visualization-analysis-data", kwargs={"slug": experiment.slug}),
             **{settings.OPENIDC_EMAIL_HEADER: user_email},
@@ -170,6 +200,83 @@ class TestVisualizationView(TestCase):
         json_data = json.loads(response.content)
         self.assertEqual(FULL_DATA, json_data)
 
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_analysis_results_view_returns_precomputed_results(self, mock_get_blob):
+        user_email = "user@example.com"
+        results_data = {
+            "daily": None,
+            "weekly": None,
+            "overall": {"control": {}},
+            "metadata": {},
+        }
+        experiment = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.COMPLETE, results_data=results_data
+        )
+
+        response = self.client.get(
+            reverse("visualization-analysis-data", kwargs={"slug": experiment.slug}),
+            **{settings.OPENIDC_EMAIL_HEADER: user_email},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        json_data = json.loads(response.content)
+        self.assertEqual({**results_data, "show_analysis": False}, json_data)
+        mock_get_blob.assert_not_called()
+
+    def get_sliced_results(self, **params):
+        metric_results = {"absolute": {"all": [], "first": {}}}
+        branch_results = {
+            "is_control": True,
+            "branch_data": {"retained": metric_results, "search_count": metric_results},
+        }
+        results_data = {
+            "daily": {"control": branch_results},
+            "weekly": {"control": branch_results},
+            "overall": {"control": branch_results},
+            "other_metrics": {},
+            "metadata": {},
+        }
+        experiment = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.COMPLETE, results_data=results_data
+        )
+
+        return self.client.get(
+            reverse("visualization-analysis-data", kwargs={"slug": experiment.slug}),
+            params,
+            **{settings.OPENIDC_EMAIL_HEADER: "user@example.com"},
+        )
+
+    def test_analysis_results_view_filters_by_window(self):
+        response = self.get_sliced_results(window="daily")
+        self.assertEqual(response.status_code, 200)
+
+        json_data = json.loads(response.content)
+        self.assertEqual(
+            set(json_data.keys()),
+            {"daily", "other_metrics", "metadata", "show_analysis"},
+        )
+
+    def test_analysis_results_view_filters_by_metric(self):
+        response = self.get_sliced_results(metric="retained")
+        self.assertEqual(response.status_code, 200)
+
+        json_data = json.loads(response.content)
+        for window in ("daily", "weekly", "overall"):
+            self.assertEqual(
+                json_data[window]["control"],
+                {
+                    "is_control": True,
+                    "branch_data": {"retained": {"absolute": {"all": [], "first": {}}}},
+                },
+            )
+
+    def test_analysis_results_view_rejects_unknown_window(self):
+        response = self.get_sliced_results(window="hourly")
+        self.assertEqual(response.status_code, 400)
+
+        json_data = json.loads(response.content)
+        self.assertIn("window", json_data)
+
     @parameterized.expand([NimbusExperiment.Status.ACCEPTED])
     def test_analysis_results_view_no_experiment(self, status):
         user_email = "user@example.com"
@@ -181,3 +288,407 @@ class TestVisualizationView(TestCase):
 
         json_data = json.loads(response.content)
         self.assertEqual({"detail": "Not found."}, json_data)
+
+
+@override_settings(FEATURE_ANALYSIS=False)
+class TestVisualizationBatchView(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def get_batch(self, slugs):
+        return self.client.get(
+            reverse("visualization-analysis-batch"),
+            {"slugs": slugs},
+            **{settings.OPENIDC_EMAIL_HEADER: "user@example.com"},
+        )
+
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_batch_returns_overall_results_for_every_experiment(self, mock_get_blob):
+        mock_get_blob.return_value = None
+        precomputed = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.COMPLETE,
+            results_data={
+                "daily": {"control": {}},
+                "weekly": {"control": {}},
+                "overall": {"control": {}},
+                "other_metrics": {"some_count": "Some Count"},
+                "metadata": {},
+            },
+        )
+        not_computed = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.COMPLETE, results_data=None
+        )
+
+        response = self.get_batch(f"{precomputed.slug},{not_computed.slug},unknown")
+        self.assertEqual(response.status_code, 200)
+
+        json_data = json.loads(response.content)
+        self.assertEqual(
+            json_data,
+            {
+                "show_analysis": False,
+                "experiments": {
+                    precomputed.slug: {
+                        "metadata": {},
+                        "overall": {"control": {}},
+                        "other_metrics": {"some_count": "Some Count"},
+                    },
+                    not_computed.slug: {
+                        "metadata": None,
+                        "overall": None,
+                        "other_metrics": None,
+                    },
+                    "unknown": None,
+                },
+            },
+        )
+
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_batch_only_loads_the_windows_it_returns(self, mock_get_blob):
+        data, _, _ = TestConstants.get_test_data()
+        requested_paths = []
+
+        def get_blob(path):
+            requested_paths.append(path)
+            if "metadata" in path:
+                return build_mock_blob("{}")
+            return build_mock_blob(json.dumps(data))
+
+        mock_get_blob.side_effect = get_blob
+        experiment = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.COMPLETE,
+            results_data=None,
+            primary_outcomes=[],
+            secondary_outcomes=[],
+        )
+
+        response = self.get_batch(experiment.slug)
+
+        self.assertCountEqual(
+            requested_paths,
+            [
+                f"metadata/metadata_{experiment.slug.replace('-', '_')}.json",
+                f"statistics/statistics_{experiment.slug.replace('-', '_')}_weekly.json",
+                f"statistics/statistics_{experiment.slug.replace('-', '_')}_overall.json",
+            ],
+        )
+        experiment_data = json.loads(json.dumps(get_experiment_data(experiment)))
+        self.assertEqual(
+            json.loads(response.content)["experiments"][experiment.slug],
+            {
+                "metadata": {},
+                "overall": experiment_data["overall"],
+                "other_metrics": experiment_data["other_metrics"],
+            },
+        )
+
+    def test_batch_requires_slugs(self):
+        response = self.get_batch("")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("slugs", json.loads(response.content))
+
+    def test_batch_rejects_too_many_slugs(self):
+        slugs = ",".join(f"experiment-{i}" for i in range(51))
+        response = self.get_batch(slugs)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("slugs", json.loads(response.content))
+
+
+@override_settings(GCS_CACHE_REVALIDATE=300)
+class TestLoadDataFromGCS(TestCase):
+    path = "statistics/statistics_slug_overall.json"
+
+    def setUp(self):
+        cache.clear()
+
+    @patch("experimenter.visualization.api.v3.views.time.time")
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_fresh_cache_is_served_without_gcs_requests(self, mock_get_blob, mock_time):
+        mock_time.return_value = 1000
+        mock_blob = build_mock_blob("[1]")
+        mock_get_blob.return_value = mock_blob
+
+        self.assertEqual(load_data_from_gcs(self.path), [1])
+        mock_time.return_value = 1299
+        self.assertEqual(load_data_from_gcs(self.path), [1])
+
+        mock_get_blob.assert_called_once_with(self.path)
+        mock_blob.download_as_bytes.assert_called_once_with()
+
+    @patch("experimenter.visualization.api.v3.views.time.time")
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_stale_cache_with_same_generation_is_not_downloaded_again(
+        self, mock_get_blob, mock_time
+    ):
+        mock_time.return_value = 1000
+        mock_blob = build_mock_blob("[1]")
+        mock_get_blob.return_value = mock_blob
+
+        self.assertEqual(load_data_from_gcs(self.path), [1])
+        mock_time.return_value = 1300
+        self.assertEqual(load_data_from_gcs(self.path), [1])
+
+        self.assertEqual(mock_get_blob.call_count, 2)
+        mock_blob.download_as_bytes.assert_called_once_with()
+
+    @patch("experimenter.visualization.api.v3.views.time.time")
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_stale_cache_with_new_generation_is_downloaded_again(
+        self, mock_get_blob, mock_time
+    ):
+        mock_time.return_value = 1000
+        mock_get_blob.return_value = build_mock_blob("[1]", generation=1)
+
+        self.assertEqual(load_data_from_gcs(self.path), [1])
+        mock_time.return_value = 1300
+        mock_get_blob.return_value = build_mock_blob("[2]", generation=2)
+        self.assertEqual(load_data_from_gcs(self.path), [2])
+
+    @patch("experimenter.visualization.api.v3.views.time.time")
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_missing_object_is_cached(self, mock_get_blob, mock_time):
+        mock_time.return_value = 1000
+        mock_get_blob.return_value = None
+
+        self.assertIsNone(load_data_from_gcs(self.path))
+        self.assertIsNone(load_data_from_gcs(self.path))
+
+        mock_get_blob.assert_called_once_with(self.path)
+
+    @patch("experimenter.visualization.api.v3.views.default_storage")
+    def test_get_gcs_blob_returns_bucket_blob(self, mock_storage):
+        self.assertEqual(
+            get_gcs_blob(self.path), mock_storage.bucket.get_blob.return_value
+        )
+        mock_storage.bucket.get_blob.assert_called_once_with(self.path)
+
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_load_gcs_objects_loads_every_object(self, mock_get_blob):
+        mock_get_blob.side_effect = lambda path: build_mock_blob(
+            json.dumps(path), generation=len(path)
+        )
+
+        objects = load_gcs_objects({"first": "a", "second": "bb"})
+
+        self.assertEqual(objects, {"first": (1, "a"), "second": (2, "bb")})
+
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_get_experiment_generations(self, mock_get_blob):
+        mock_get_blob.side_effect = lambda path: build_mock_blob("[]", generation=3)
+        experiment = NimbusExperimentFactory.create(slug="my-experiment")
+
+        self.assertEqual(
+            get_experiment_generations(experiment),
+            {
+                "metadata/metadata_my_experiment.json": 3,
+                "statistics/statistics_my_experiment_daily.json": 3,
+                "statistics/statistics_my_experiment_weekly.json": 3,
+                "statistics/statistics_my_experiment_overall.json": 3,
+            },
+        )
+
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_row_filter_drops_rows_while_parsing(self, mock_get_blob):
+        mock_get_blob.return_value = build_mock_blob(
+            json.dumps(
+                [
+                    {"metric": "identity", "statistic": "count"},
+                    {"metric": "search_count", "statistic": "mean"},
+                    {"metric": "search_count", "statistic": "deciles"},
+                ]
+            )
+        )
+
+        _, data = load_gcs_object(self.path, is_results_row)
+
+        self.assertEqual(
+            data,
+            [
+                {"metric": "identity", "statistic": "count"},
+                {"metric": "search_count", "statistic": "mean"},
+            ],
+        )
+
+    @patch("experimenter.visualization.api.v3.views.get_gcs_blob")
+    def test_filtered_and_unfiltered_reads_are_cached_separately(self, mock_get_blob):
+        rows = [
+            {"metric": "identity", "statistic": "count"},
+            {"metric": "search_count", "statistic": "deciles"},
+        ]
+        mock_get_blob.return_value = build_mock_blob(json.dumps(rows))
+
+        _, filtered = load_gcs_object(self.path, is_results_row)
+        _, unfiltered = load_gcs_object(self.path)
+
+        self.assertEqual(filtered, rows[:1])
+        self.assertEqual(unfiltered, rows)
+
+
+class TestGCSObjectStream(TestCase):
+    def test_reads_the_object_one_range_at_a_time(self):
+        mock_blob = build_mock_blob(b"[1, 2, 3]")
+        stream = GCSObjectStream(mock_blob)
+
+        self.assertEqual(stream.read(4), b"[1, ")
+        self.assertEqual(stream.read(4), b"2, 3")
+        self.assertEqual(stream.read(4), b"]")
+        self.assertEqual(stream.read(4), b"")
+        self.assertEqual(
+            mock_blob.download_as_bytes.call_args_list,
+            [
+                mock.call(start=0, end=3),
+                mock.call(start=4, end=7),
+                mock.call(start=8, end=8),
+            ],
+        )
+
+    def test_parses_the_object_in_ranges(self):
+        stream = GCSObjectStream(build_mock_blob(json.dumps([{"a": 1}, [2], 3])))
+
+        self.assertEqual(list(iter_json_array(stream, 3)), [{"a": 1}, [2], 3])
+
+
+class TestIterJSONArray(TestCase):
+    data = [
+        {"metric": "identity", "point": 12.5, "branch": "contrôle"},
+        {"metric": "retained", "point": -3, "lower": None},
+        [1, 2, {"nested": [3]}],
+        1234567,
+    ]
+
+    @parameterized.expand([[1], [2], [7], [1024]])
+    def test_yields_items_for_any_chunk_size(self, chunk_size):
+        text = json.dumps(self.data, indent=2)
+        self.assertEqual(
+            list(iter_json_array(io.BytesIO(text.encode()), chunk_size)), self.data
+        )
+        self.assertEqual(list(iter_json_array(io.StringIO(text), chunk_size)), self.data)
+
+    @parameterized.expand([[chunk_size] for chunk_size in range(1, 12)])
+    def test_numbers_split_across_chunks(self, chunk_size):
+        text = "[1.5,-20, 3e2 ,123456]"
+        self.assertEqual(
+            list(iter_json_array(io.StringIO(text), chunk_size)),
+            [1.5, -20, 300.0, 123456],
+        )
+        self.assertEqual(list(iter_json_array(io.StringIO("[1.5]"), chunk_size)), [1.5])
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "))), [])
+
+    @parameterized.expand([[""], ["{}"], ["[1, 2"], ["[{]"], ["[1x]"]])
+    def test_invalid_json_raises(self, text):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO(text), 2))
+
+
+class TestStatisticsIndex(TestCase):
+    def test_groups_rows_in_a_single_pass(self):
+        rows = [
+            {
+                "metric": "identity",
+                "statistic": "count",
+                "branch": "control",
+                "point": 10,
+            },
+            {"metric": "retained", "statistic": "binomial", "branch": "control"},
+            {
+                "metric": "retained",
+                "statistic": "binomial",
+                "branch": "control",
+                "comparison": "difference",
+                "window_index": "2",
+            },
+            {
+                "metric": "identity",
+                "statistic": "count",
+                "branch": "variant",
+                "point": 30,
+            },
+            {"metric": "retained", "statistic": "binomial", "branch": "control"},
+        ]
+
+        index = StatisticsIndex(rows)
+
+        self.assertEqual(index.size, 5)
+        self.assertEqual(
+            [
+                (first, key, len(columns))
+                for first, key, columns in index.ordered_groups()
+            ],
+            [
+                (0, ("control", "identity", "count", "absolute"), 1),
+                (1, ("control", "retained", "binomial", "absolute"), 2),
+                (2, ("control", "retained", "binomial", "difference"), 1),
+                (3, ("variant", "identity", "count", "absolute"), 1),
+            ],
+        )
+        columns = index.groups[("control", "identity", "count", "absolute")][1]
+        self.assertEqual(columns.point, [10])
+        self.assertEqual(columns.window_index, [None])
+        self.assertEqual(
+            index.metric_statistics,
+            {("identity", "count"): 0, ("retained", "binomial"): 1},
+        )
+        self.assertEqual(index.user_count_total, 40)
+        self.assertEqual(index.user_counts, {"control": 10, "variant": 30})
+        self.assertEqual(index.retention, {None: [rows[1], rows[4]], "2": [rows[2]]})
+
+    def test_user_counts_ignore_population_percentages(self):
+        index = StatisticsIndex(
+            [
+                {"metric": "identity", "statistic": "count", "branch": "a", "point": 10},
+                {"metric": "identity", "statistic": "count", "branch": "b", "point": 30},
+            ]
+        )
+        for _ in range(2):
+            index.extend(
+                [
+                    {
+                        "metric": "identity",
+                        "statistic": "percentage",
+                        "branch": branch,
+                        "point": 50.0,
+                    }
+                    for branch in ("a", "b")
+                ]
+            )
+
+        self.assertEqual(index.user_count_total, 40)
+        self.assertEqual(index.user_counts, {"a": 10, "b": 30})
+
+    def test_add_continues_row_numbers(self):
+        index = StatisticsIndex([{"metric": "identity", "branch": "a", "point": 1}])
+        index.add({"metric": "search_count", "branch": "a"})
+
+        self.assertEqual(index.size, 2)
+        self.assertEqual(index.ordered_groups()[1][0], 1)
+
+
+class TestStatisticsColumns(TestCase):
+    def test_appends_rows_as_columns(self):
+        columns = StatisticsColumns()
+        columns.append({"lower": 1, "upper": 3, "point": 2, "window_index": "1"})
+        columns.append({"point": 5, "window_index": "2"})
+
+        self.assertEqual(len(columns), 2)
+        self.assertEqual(columns.lower, [1, None])
+        self.assertEqual(columns.upper, [3, None])
+        self.assertEqual(columns.point, [2, 5])
+        self.assertEqual(columns.window_index, ["1", "2"])
+
+    def test_significance_is_computed_for_the_whole_column(self):
+        columns = StatisticsColumns()
+        for lower, upper in [(1, 2), (-2, -1), (-1, 1), (None, 1), (0, 1)]:
+            columns.append({"lower": lower, "upper": upper})
+
+        self.assertEqual(
+            columns.significance(),
+            [
+                Significance.POSITIVE,
+                Significance.NEGATIVE,
+                Significance.NEUTRAL,
+                None,
+                None,
+            ],
+        )
@@ -0,0 +1,32 @@
+from django.core.management import call_command
+from django.test import TestCase
+
+from experimenter.visualization.api.v3.views import BranchComparison
+from experimenter.visualization.management.commands.benchmark_results_builder import (
+    generate_statistics,
+)
+
+
+class TestBenchmarkResultsBuilder(TestCase):
+    def test_generate_statistics(self):
+        rows = generate_statistics(["control", "treatment"], 2, 3)
+
+        # 4 metrics with 1 comparison for control and 3 for treatment, each row
+        # followed by 10 deciles, for 3 windows
+        self.assertEqual(len(rows), 4 * 4 * 11 * 3)
+        self.assertFalse(
+            any(
+                row["branch"] == "control"
+                and row["comparison"] != BranchComparison.ABSOLUTE
+                for row in rows
+            )
+        )
+
+    def test_benchmark_runs(self):
+        call_command(
+            "benchmark_results_builder",
+            "--branches=2",
+            "--metrics=2",
+            "--weeks=2",
+            "--repeat=1",
+        )
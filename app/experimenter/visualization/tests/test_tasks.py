@@ -0,0 +1,156 @@
+import datetime
+
+import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from experimenter.experiments.models import NimbusExperiment
+from experimenter.experiments.tests.factories import NimbusExperimentFactory
+from experimenter.visualization import tasks
+
+
+@override_settings(JETSTREAM_RESULTS_WINDOW=14)
+class TestFetchJetstreamDataTask(TestCase):
+    def setUp(self):
+        mock_generations_patcher = mock.patch(
+            "experimenter.visualization.tasks.get_experiment_generations"
+        )
+        self.mock_generations = mock_generations_patcher.start()
+        self.mock_generations.return_value = {"path": 1}
+        self.addCleanup(mock_generations_patcher.stop)
+
+        mock_data_patcher = mock.patch(
+            "experimenter.visualization.tasks.get_experiment_data"
+        )
+        self.mock_data = mock_data_patcher.start()
+        self.mock_data.return_value = {"metadata": {}, "overall": None}
+        self.addCleanup(mock_data_patcher.stop)
+
+    def test_fetch_jetstream_data_queues_live_and_recently_complete_experiments(self):
+        live_experiment = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.LIVE
+        )
+        complete_experiment = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.COMPLETE
+        )
+        old_experiment = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.COMPLETE
+        )
+        old_experiment.changes.filter(
+            old_status=NimbusExperiment.Status.LIVE,
+            new_status=NimbusExperiment.Status.COMPLETE,
+        ).update(changed_on=timezone.now() - datetime.timedelta(days=15))
+        NimbusExperimentFactory.create_with_status(NimbusExperiment.Status.DRAFT)
+
+        with mock.patch(
+            "experimenter.visualization.tasks.fetch_experiment_data.delay"
+        ) as mock_delay:
+            tasks.fetch_jetstream_data()
+
+        self.assertCountEqual(
+            [call.args[0] for call in mock_delay.call_args_list],
+            [live_experiment.id, complete_experiment.id],
+        )
+
+    def test_fetch_experiment_data_stores_results(self):
+        experiment = NimbusExperimentFactory.create(status=NimbusExperiment.Status.LIVE)
+
+        tasks.fetch_experiment_data(experiment.id)
+
+        experiment = NimbusExperiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.results_data, {"metadata": {}, "overall": None})
+
+    def test_fetch_experiment_data_skips_unchanged_generations(self):
+        experiment = NimbusExperimentFactory.create(status=NimbusExperiment.Status.LIVE)
+
+        tasks.fetch_experiment_data(experiment.id)
+        tasks.fetch_experiment_data(experiment.id)
+
+        self.mock_data.assert_called_once()
+
+    def test_fetch_experiment_data_rebuilds_changed_generations(self):
+        experiment = NimbusExperimentFactory.create(status=NimbusExperiment.Status.LIVE)
+
+        tasks.fetch_experiment_data(experiment.id)
+        self.mock_generations.return_value = {"path": 2}
+        self.mock_data.return_value = {"metadata": {}, "overall": {}}
+        tasks.fetch_experiment_data(experiment.id)
+
+        experiment = NimbusExperiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.results_data, {"metadata": {}, "overall": {}})
+
+    def test_fetch_experiment_data_rebuilds_changed_outcomes(self):
+        experiment = NimbusExperimentFactory.create(
+            status=NimbusExperiment.Status.LIVE, primary_outcomes=["outcome"]
+        )
+
+        tasks.fetch_experiment_data(experiment.id)
+        NimbusExperiment.objects.filter(id=experiment.id).update(
+            primary_outcomes=["other_outcome"]
+        )
+        tasks.fetch_experiment_data(experiment.id)
+
+        self.assertEqual(self.mock_data.call_count, 2)
+
+    def test_fetch_experiment_data_rebuilds_changed_reference_branch(self):
+        experiment = NimbusExperimentFactory.create_with_status(
+            NimbusExperiment.Status.LIVE
+        )
+        other_branch = experiment.treatment_branches[0]
+
+        tasks.fetch_experiment_data(experiment.id)
+        NimbusExperiment.objects.filter(id=experiment.id).update(
+            reference_branch=other_branch
+        )
+        tasks.fetch_experiment_data(experiment.id)
+
+        self.assertEqual(self.mock_data.call_count, 2)
+
+    def test_fetch_experiment_data_stores_fingerprint_with_results(self):
+        experiment = NimbusExperimentFactory.create(status=NimbusExperiment.Status.LIVE)
+
+        tasks.fetch_experiment_data(experiment.id)
+
+        experiment = NimbusExperiment.objects.get(id=experiment.id)
+        self.assertEqual(
+            experiment.results_fingerprint,
+            tasks.get_results_fingerprint(experiment, {"path": 1}),
+        )
+
+    def test_fetch_experiment_data_does_not_revert_concurrent_changes(self):
+        experiment = NimbusExperimentFactory.create(status=NimbusExperiment.Status.LIVE)
+
+        def complete_experiment(experiment):
+            NimbusExperiment.objects.filter(id=experiment.id).update(
+                status=NimbusExperiment.Status.COMPLETE
+            )
+            return {"metadata": {}, "overall": None}
+
+        self.mock_data.side_effect = complete_experiment
+        tasks.fetch_experiment_data(experiment.id)
+
+        experiment = NimbusExperiment.objects.get(id=experiment.id)
+        self.assertEqual(experiment.status, NimbusExperiment.Status.COMPLETE)
+        self.assertEqual(experiment.results_data, {"metadata": {}, "overall": None})
+
+    def test_fetch_experiment_data_force_rebuilds_unchanged_generations(self):
+        experiment = NimbusExperimentFactory.create(status=NimbusExperiment.Status.LIVE)
+
+        tasks.fetch_experiment_data(experiment.id)
+        tasks.fetch_experiment_data(experiment.id, force=True)
+
+        self.assertEqual(self.mock_data.call_count, 2)
+
+    def test_command_fetches_requested_experiments(self):
+        experiment = NimbusExperimentFactory.create(status=NimbusExperiment.Status.LIVE)
+        other_experiment = NimbusExperimentFactory.create(
+            status=NimbusExperiment.Status.LIVE
+        )
+
+        call_command("fetch_jetstream_data", experiment.slug)
+
+        experiment = NimbusExperiment.objects.get(id=experiment.id)
+        other_experiment = NimbusExperiment.objects.get(id=other_experiment.id)
+        self.assertEqual(experiment.results_data, {"metadata": {}, "overall": None})
+        self.assertIsNone(other_experiment.results_data)